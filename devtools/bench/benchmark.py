@@ -1,13 +1,67 @@
-"""Benchmark the new parser against the old parser."""
+"""Benchmark the xor cipher implementations and the parsers.
+
+Compares the kasa_crypt extension, the pure python fallback in
+XorEncryption and the original per byte implementation.
+"""
 
 import json
+import struct
 import timeit
+from collections.abc import Callable
+from typing import Any, cast
 
 import orjson
-from kasa_crypt import decrypt, encrypt
 
-from devtools.bench.utils.data import REQUEST, WIRE_RESPONSE
+from devtools.bench.utils.data import REQUEST, RESPONSE, WIRE_RESPONSE
 from devtools.bench.utils.original import OriginalTPLinkSmartHomeProtocol
+from kasa.transports.xortransport import XorEncryption
+
+try:
+    import kasa_crypt
+except ImportError:
+    kasa_crypt = None
+
+
+def fallback_encrypt(request: str) -> bytes:
+    """Encrypt with the pure python fallback even if kasa_crypt is installed."""
+    plainbytes = request.encode()
+    return struct.pack(">I", len(plainbytes)) + XorEncryption._xor_payload(plainbytes)
+
+
+def fallback_decrypt(ciphertext: bytes) -> str:
+    """Decrypt with the pure python fallback even if kasa_crypt is installed."""
+    return XorEncryption._xor_encrypted_payload(ciphertext).decode()
+
+
+TIERS: dict[str, tuple[Callable[[str], bytes], Callable[[bytes], str]]] = {
+    "original": (
+        OriginalTPLinkSmartHomeProtocol.encrypt,
+        OriginalTPLinkSmartHomeProtocol.decrypt,
+    ),
+    "fallback": (fallback_encrypt, fallback_decrypt),
+}
+if kasa_crypt:
+    TIERS["kasa_crypt"] = (kasa_crypt.encrypt, kasa_crypt.decrypt)
+
+
+def _strip_response(children: int) -> str:
+    """Return a sysinfo response of a strip with the number of children."""
+    sysinfo = cast(dict[str, Any], RESPONSE)["system"]["get_sysinfo"]
+    child = sysinfo["children"][0]
+    children_list = [{**child, "alias": f"Plug {i}"} for i in range(children)]
+    response = {
+        **RESPONSE,
+        "system": {"get_sysinfo": {**sysinfo, "children": children_list}},
+    }
+    return json.dumps(response)
+
+
+PAYLOADS: dict[str, str | bytes] = {
+    "request": json.dumps(REQUEST),
+    "response": WIRE_RESPONSE[4:],
+    "strip 32 children": _strip_response(32),
+    "strip 256 children": _strip_response(256),
+}
 
 
 def original_request_response() -> None:
@@ -18,8 +72,8 @@ def original_request_response() -> None:
 
 def new_request_response() -> None:
     """Benchmark the new parser."""
-    encrypt(orjson.dumps(REQUEST).decode())
-    orjson.loads(decrypt(WIRE_RESPONSE[4:]))
+    XorEncryption.encrypt(orjson.dumps(REQUEST).decode())
+    orjson.loads(XorEncryption.decrypt(WIRE_RESPONSE[4:]))
 
 
 count = 100000
@@ -29,3 +83,18 @@ print(f"New parser, parsing {count} messages took {time} seconds")
 
 time = timeit.Timer(original_request_response).timeit(count)
 print(f"Old parser, parsing {count} messages took {time} seconds")
+
+count = 1000
+for name, payload in PAYLOADS.items():
+    if isinstance(payload, bytes):
+        ciphertext = payload
+    else:
+        ciphertext = OriginalTPLinkSmartHomeProtocol.encrypt(payload)[4:]
+    plaintext = OriginalTPLinkSmartHomeProtocol.decrypt(ciphertext)
+    for tier, (encrypt, decrypt) in TIERS.items():
+        encrypt_time = timeit.Timer(lambda: encrypt(plaintext)).timeit(count)  # noqa: B023
+        decrypt_time = timeit.Timer(lambda: decrypt(ciphertext)).timeit(count)  # noqa: B023
+        print(
+            f"{tier}, {name} ({len(ciphertext)} bytes), {count} messages: "
+            f"encrypt {encrypt_time:.4f} seconds, decrypt {decrypt_time:.4f} seconds"
+        )
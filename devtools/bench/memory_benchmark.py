@@ -0,0 +1,143 @@
+"""Benchmark the memory held by the devices of the fixture corpus.
+
+Every fixture in tests/fixtures is loaded and updated once with the fake
+protocols used by the test suite. The memory retained by the devices is
+measured with tracemalloc, and the size of the feature and module objects
+of the devices and their children is reported separately.
+
+    python -m devtools.bench.memory_benchmark --json memory.json
+"""
+
+from __future__ import annotations
+
+import asyncio
+import gc
+import json
+import logging
+import sys
+import tracemalloc
+import warnings
+from dataclasses import asdict, dataclass
+
+import asyncclick as click
+import pytest
+
+from kasa import Device, Feature, KasaException, Module
+from tests.device_fixtures import get_device_for_fixture
+from tests.fixtureinfo import FIXTURE_DATA, FixtureInfo
+
+
+@dataclass
+class MemoryResult:
+    """Results of the benchmark for the fixtures of a protocol."""
+
+    protocol: str
+    devices: int
+    features: int
+    modules: int
+    retained_kib_per_device: float
+    bytes_per_feature: float
+    bytes_per_module: float
+
+
+def _object_size(obj: object) -> int:
+    """Return the size of the object and its instance dict, if any."""
+    size = sys.getsizeof(obj)
+    if (instance_dict := getattr(obj, "__dict__", None)) is not None:
+        size += sys.getsizeof(instance_dict)
+    return size
+
+
+def _collect(devices: list[Device]) -> tuple[list[Feature], list[Module]]:
+    """Return the distinct features and modules of the devices and children."""
+    features: dict[int, Feature] = {}
+    modules: dict[int, Module] = {}
+    pending = list(devices)
+    while pending:
+        dev = pending.pop()
+        pending.extend(dev.children)
+        for feature in dev.features.values():
+            features[id(feature)] = feature
+        for module in dev.modules.values():
+            modules[id(module)] = module
+            for feature in module._all_features.values():
+                features[id(feature)] = feature
+    return list(features.values()), list(modules.values())
+
+
+async def _create_device(fixture: FixtureInfo) -> Device | None:
+    try:
+        dev = await get_device_for_fixture(fixture)
+        await dev.update()
+    except KasaException as ex:
+        click.echo(f"Skipping {fixture.name}: {ex}")
+        return None
+    return dev
+
+
+async def benchmark_protocol(
+    protocol: str, fixtures: list[FixtureInfo]
+) -> MemoryResult | None:
+    """Benchmark the memory held by the devices created from the fixtures.
+
+    Returns None if none of the fixtures could be used.
+    """
+    gc.collect()
+    tracemalloc.start()
+    baseline, _ = tracemalloc.get_traced_memory()
+    devices = [dev for fixture in fixtures if (dev := await _create_device(fixture))]
+    gc.collect()
+    retained, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    if not devices:
+        return None
+
+    features, modules = _collect(devices)
+    return MemoryResult(
+        protocol=protocol,
+        devices=len(devices),
+        features=len(features),
+        modules=len(modules),
+        retained_kib_per_device=(retained - baseline) / len(devices) / 1024,
+        bytes_per_feature=sum(map(_object_size, features)) / max(len(features), 1),
+        bytes_per_module=sum(map(_object_size, modules)) / max(len(modules), 1),
+    )
+
+
+@click.command()
+@click.option(
+    "--protocol",
+    "protocols",
+    multiple=True,
+    type=click.Choice(sorted({fi.protocol for fi in FIXTURE_DATA})),
+    help="Fixture protocols to benchmark, defaults to all.",
+)
+@click.option("--json", "json_file", type=click.File("w"), help="Save results.")
+async def main(protocols, json_file):
+    """Benchmark the memory held by the devices of the test fixtures."""
+    # The fixtures are incomplete so silence the warnings of the fakes
+    warnings.simplefilter("ignore")
+    logging.getLogger("kasa").setLevel(logging.CRITICAL)
+    # The fake protocols record the methods missing from the fixtures here
+    pytest.fixtures_missing_methods = {}  # type: ignore[attr-defined]
+    results = []
+    for protocol in protocols or sorted({fi.protocol for fi in FIXTURE_DATA}):
+        fixtures = [fi for fi in FIXTURE_DATA if fi.protocol == protocol]
+        result = await benchmark_protocol(protocol, fixtures)
+        if result is None:
+            click.echo(f"{protocol}: no usable fixtures")
+            continue
+        results.append(result)
+        click.echo(
+            f"{result.protocol}: {result.devices} devices, "
+            f"retained {result.retained_kib_per_device:.1f} KiB/device, "
+            f"{result.features} features of {result.bytes_per_feature:.0f} bytes, "
+            f"{result.modules} modules of {result.bytes_per_module:.0f} bytes"
+        )
+
+    if json_file:
+        json.dump([asdict(result) for result in results], json_file, indent=2)
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,124 @@
+"""Benchmarks for the encryption and framing hot paths.
+
+Requires pytest-benchmark and runs offline on payloads from tests/fixtures.
+Benchmarks are disabled under xdist so run them with ``--dist=no``.
+Results can be saved as json and compared between runs:
+
+    pytest devtools/bench --dist=no --benchmark-autosave
+    pytest devtools/bench --dist=no --benchmark-compare \
+        --benchmark-compare-fail=mean:10%
+    pytest devtools/bench --dist=no --benchmark-json=results.json
+"""
+
+from __future__ import annotations
+
+from pathlib import Path
+from typing import Any
+
+import pytest
+
+from kasa.deviceconfig import DeviceConfig
+from kasa.json import dumps as json_dumps
+from kasa.json import loads as json_loads
+from kasa.protocols.protocol import redact_data
+from kasa.protocols.smartprotocol import REDACTORS, SmartProtocol
+from kasa.transports.aestransport import AesEncyptionSession
+from kasa.transports.klaptransport import KlapEncryptionSession, KlapTransport
+from kasa.transports.sslaestransport import SslAesTransport
+from kasa.transports.xortransport import XorEncryption
+
+FIXTURES_DIR = Path(__file__).parents[2] / "tests" / "fixtures"
+
+FIXTURES = {
+    "iot-strip": "iot/HS300(US)_2.0_1.0.12.json",
+    "smart-strip": "smart/P304M(UK)_1.0_1.0.3.json",
+    "smartcam": "smartcam/C225(US)_2.0_1.0.11.json",
+}
+
+
+def _load_fixture(name: str) -> dict[str, Any]:
+    return json_loads((FIXTURES_DIR / FIXTURES[name]).read_text())
+
+
+@pytest.fixture(params=list(FIXTURES))
+def fixture_data(request: pytest.FixtureRequest) -> dict[str, Any]:
+    """Return the fixture data as the device would respond."""
+    return _load_fixture(request.param)
+
+
+@pytest.fixture
+def payload(fixture_data: dict[str, Any]) -> str:
+    """Return the fixture data serialized as sent over the wire."""
+    return json_dumps(fixture_data)
+
+
+@pytest.fixture
+def klap_session() -> KlapEncryptionSession:
+    """Return a klap session with fixed seeds."""
+    return KlapEncryptionSession(b"l" * 16, b"r" * 16, b"u" * 32)
+
+
+def test_json_loads(benchmark, payload: str) -> None:
+    """Benchmark json parsing of a device response."""
+    benchmark(json_loads, payload)
+
+
+def test_json_dumps(benchmark, fixture_data: dict[str, Any]) -> None:
+    """Benchmark json serialization of a device response."""
+    benchmark(json_dumps, fixture_data)
+
+
+def test_redact_data(benchmark, fixture_data: dict[str, Any]) -> None:
+    """Benchmark redacting a device response for logging."""
+    benchmark(redact_data, fixture_data, REDACTORS)
+
+
+def test_get_smart_request(benchmark, fixture_data: dict[str, Any]) -> None:
+    """Benchmark creating a multipleRequest for all fixture methods."""
+    protocol = SmartProtocol(transport=KlapTransport(config=DeviceConfig("127.0.0.1")))
+    requests = [{"method": method} for method in fixture_data]
+    benchmark(protocol.get_smart_request, "multipleRequest", {"requests": requests})
+
+
+def test_xor_encrypt(benchmark, payload: str) -> None:
+    """Benchmark the legacy xor encryption."""
+    benchmark(XorEncryption.encrypt, payload)
+
+
+def test_xor_decrypt(benchmark, payload: str) -> None:
+    """Benchmark the legacy xor decryption."""
+    ciphertext = XorEncryption.encrypt(payload)[4:]
+    benchmark(XorEncryption.decrypt, ciphertext)
+
+
+def test_klap_encrypt(
+    benchmark, klap_session: KlapEncryptionSession, payload: str
+) -> None:
+    """Benchmark the klap encryption."""
+    benchmark(klap_session.encrypt, payload)
+
+
+def test_klap_decrypt(
+    benchmark, klap_session: KlapEncryptionSession, payload: str
+) -> None:
+    """Benchmark the klap decryption."""
+    ciphertext, _ = klap_session.encrypt(payload)
+    benchmark(klap_session.decrypt, ciphertext)
+
+
+def test_aes_encrypt(benchmark, payload: str) -> None:
+    """Benchmark the aes encryption."""
+    session = AesEncyptionSession(b"k" * 16, b"i" * 16)
+    benchmark(session.encrypt, payload.encode())
+
+
+def test_aes_decrypt(benchmark, payload: str) -> None:
+    """Benchmark the aes decryption."""
+    session = AesEncyptionSession(b"k" * 16, b"i" * 16)
+    ciphertext = session.encrypt(payload.encode())
+    benchmark(session.decrypt, ciphertext)
+
+
+def test_sslaes_generate_tag(benchmark, payload: str) -> None:
+    """Benchmark the sslaes tag header generation."""
+    benchmark(SslAesTransport.generate_tag, payload, "nonce", "pwd_hash", 1)
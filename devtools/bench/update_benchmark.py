@@ -0,0 +1,191 @@
+"""Benchmark the overhead of Device.update() against the fake transports.
+
+Devices are created from the fixtures in tests/fixtures and updated with the
+fake protocols used by the test suite, so the results measure the library
+without any network latency.
+
+    python -m devtools.bench.update_benchmark --devices 50 --rounds 10
+"""
+
+from __future__ import annotations
+
+import asyncio
+import json
+import logging
+import time
+import tracemalloc
+import warnings
+from dataclasses import asdict, dataclass
+
+import asyncclick as click
+
+from kasa import Device, KasaException
+from tests.device_fixtures import get_device_for_fixture
+from tests.fixtureinfo import FIXTURE_DATA, FixtureInfo
+
+#: Fixture protocol of each benchmarked group and whether the group consists
+#: of hubs, whose children are updated through their parent
+GROUPS = {
+    "IotDevice": ("IOT", False),
+    "SmartDevice": ("SMART", False),
+    "SmartCamDevice": ("SMARTCAM", False),
+    "SmartDevice hub children": ("SMART", True),
+    "SmartCamDevice hub children": ("SMARTCAM", True),
+}
+
+
+@dataclass
+class UpdateResult:
+    """Results of the benchmark for a group of devices."""
+
+    group: str
+    devices: int
+    children: int
+    updates: int
+    updates_per_second: float
+    mean_update_ms: float
+    peak_kib_per_update: float
+    retained_kib_per_device: float
+    allocated_kib_per_update: float
+
+
+async def _create_devices(
+    fixtures: list[FixtureInfo], count: int, *, hubs: bool = False
+) -> list[Device]:
+    """Create count devices cycling through the fixtures.
+
+    Fixtures which the fake protocols cannot update repeatedly are skipped,
+    as are fixtures of devices without children if *hubs* is set.
+    """
+    devices: list[Device] = []
+    usable = list(fixtures)
+    while usable and len(devices) < count:
+        fixture = usable[len(devices) % len(usable)]
+        try:
+            dev = await get_device_for_fixture(fixture)
+            await dev.update()
+        except KasaException as ex:
+            click.echo(f"Skipping {fixture.name}: {ex}")
+            usable.remove(fixture)
+            continue
+        if hubs and not dev.children:
+            usable.remove(fixture)
+            continue
+        devices.append(dev)
+    return devices
+
+
+async def _update_all(devices: list[Device]) -> None:
+    for dev in devices:
+        await dev.update()
+
+
+async def _allocated_per_update(devices: list[Device], rounds: int) -> float:
+    """Return the mean memory allocated by an update while tracing.
+
+    The allocations of each update are measured as the peak of the traced
+    memory above the memory traced before the update.
+    """
+    total = 0
+    for _ in range(rounds):
+        for dev in devices:
+            current, _ = tracemalloc.get_traced_memory()
+            tracemalloc.reset_peak()
+            await dev.update()
+            _, peak = tracemalloc.get_traced_memory()
+            total += peak - current
+    return total / (len(devices) * rounds)
+
+
+async def benchmark_group(
+    group: str,
+    fixtures: list[FixtureInfo],
+    *,
+    count: int,
+    rounds: int,
+    hubs: bool = False,
+) -> UpdateResult | None:
+    """Benchmark updating count devices created from the fixtures.
+
+    The timed rounds run without tracing, the allocations are measured
+    in separate traced rounds.
+    Returns None if none of the fixtures could be used.
+    """
+    tracemalloc.start()
+    baseline, _ = tracemalloc.get_traced_memory()
+    devices = await _create_devices(fixtures, count, hubs=hubs)
+    retained, _ = tracemalloc.get_traced_memory()
+    if not (count := len(devices)):
+        tracemalloc.stop()
+        return None
+
+    # Peak memory of a single update round above the memory held by the devices
+    current, _ = tracemalloc.get_traced_memory()
+    tracemalloc.reset_peak()
+    await _update_all(devices)
+    _, peak = tracemalloc.get_traced_memory()
+    allocated = await _allocated_per_update(devices, rounds)
+    tracemalloc.stop()
+
+    start = time.perf_counter()
+    for _ in range(rounds):
+        await _update_all(devices)
+    took = time.perf_counter() - start
+
+    updates = count * rounds
+    return UpdateResult(
+        group=group,
+        devices=count,
+        children=sum(len(dev.children) for dev in devices),
+        updates=updates,
+        updates_per_second=updates / took,
+        mean_update_ms=took / updates * 1000,
+        peak_kib_per_update=(peak - current) / count / 1024,
+        retained_kib_per_device=(retained - baseline) / count / 1024,
+        allocated_kib_per_update=allocated / 1024,
+    )
+
+
+@click.command()
+@click.option("--devices", default=20, help="Number of devices per group.")
+@click.option("--rounds", default=5, help="Number of updates of every device.")
+@click.option(
+    "--group",
+    "groups",
+    multiple=True,
+    type=click.Choice(list(GROUPS)),
+    help="Groups to benchmark, defaults to all.",
+)
+@click.option("--json", "json_file", type=click.File("w"), help="Save results.")
+async def main(devices, rounds, groups, json_file):
+    """Benchmark Device.update() on devices created from the test fixtures."""
+    # The fixtures are incomplete so silence the warnings of the fakes
+    warnings.simplefilter("ignore")
+    logging.getLogger("kasa").setLevel(logging.CRITICAL)
+    results = []
+    for group in groups or GROUPS:
+        protocol, hubs = GROUPS[group]
+        fixtures = [fi for fi in FIXTURE_DATA if fi.protocol == protocol]
+        result = await benchmark_group(
+            group, fixtures, count=devices, rounds=rounds, hubs=hubs
+        )
+        if result is None:
+            click.echo(f"{group}: no usable fixtures")
+            continue
+        results.append(result)
+        click.echo(
+            f"{result.group}: {result.devices} devices, "
+            f"{result.children} children, "
+            f"{result.updates_per_second:.1f} updates/s, "
+            f"{result.mean_update_ms:.3f} ms/update, "
+            f"peak {result.peak_kib_per_update:.1f} KiB/update, "
+            f"retained {result.retained_kib_per_device:.1f} KiB/device, "
+            f"allocated {result.allocated_kib_per_update:.1f} KiB/update"
+        )
+
+    if json_file:
+        json.dump([asdict(result) for result in results], json_file, indent=2)
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
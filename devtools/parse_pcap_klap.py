@@ -16,7 +16,6 @@ from threading import Thread
 
 import asyncclick as click
 import pyshark
-from cryptography.hazmat.primitives import padding
 
 from kasa.credentials import DEFAULT_CREDENTIALS, Credentials, get_default_credentials
 from kasa.deviceconfig import (
@@ -58,12 +57,9 @@ def _is_http_response_for_packet(response, packet):
 class MyEncryptionSession(KlapEncryptionSession):
     """A custom KlapEncryptionSession class that allows for decryption."""
 
-    def decrypt(self, msg):
+    def decrypt(self, msg, seq=None):
         """Decrypt the data."""
-        decryptor = self._cipher.decryptor()
-        dp = decryptor.update(msg[32:]) + decryptor.finalize()
-        unpadder = padding.PKCS7(128).unpadder()
-        plaintextbytes = unpadder.update(dp) + unpadder.finalize()
+        plaintextbytes = self._decrypt(msg, self._seq if seq is None else seq)
 
         return plaintextbytes.decode("utf-8", "bad_chars_replacement")
 
@@ -132,7 +128,6 @@ class Operator:
                     self._local_seed, self._remote_seed, auth_hash
                 )
                 self._session._seq = self._seq
-                self._session._generate_cipher()
 
     @property
     def seq(self) -> int:
@@ -27,6 +27,8 @@ from kasa.deviceconfig import (
 )
 from kasa.discover import Discover
 from kasa.emeterstatus import EmeterStatus
+from kasa.energyrecorder import EnergyRecorder, EnergySeries
+from kasa.energystats import EnergyRollup, EnergyStats, get_energy_stats
 from kasa.exceptions import (
     AuthenticationError,
     DeviceError,
@@ -34,7 +36,8 @@ from kasa.exceptions import (
     TimeoutError,
     UnsupportedDeviceError,
 )
-from kasa.feature import Feature
+from kasa.feature import Feature, FeatureChange
+from kasa.fleet import Fleet, FleetCycle, FleetUpdateResult
 from kasa.interfaces.light import HSV, ColorTempRange, Light, LightState
 from kasa.interfaces.thermostat import Thermostat, ThermostatState
 from kasa.module import Module
@@ -58,6 +61,15 @@ __all__ = [
     "TurnOnBehavior",
     "DeviceType",
     "Feature",
+    "FeatureChange",
+    "EnergyRecorder",
+    "EnergySeries",
+    "EnergyStats",
+    "EnergyRollup",
+    "get_energy_stats",
+    "Fleet",
+    "FleetCycle",
+    "FleetUpdateResult",
     "EmeterStatus",
     "Device",
     "Light",
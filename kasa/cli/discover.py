@@ -239,8 +239,14 @@ async def _discover(
 
 
 @discover.command()
+@click.option(
+    "--concurrency",
+    default=1,
+    type=int,
+    help="Number of connection attempts to race at once.",
+)
 @click.pass_context
-async def config(ctx: click.Context) -> DeviceDict:
+async def config(ctx: click.Context, concurrency: int) -> DeviceDict:
     """Bypass udp discovery and try to show connection config for a device.
 
     Bypasses udp discovery and shows the parameters required to connect
@@ -260,6 +266,8 @@ async def config(ctx: click.Context) -> DeviceDict:
 
     host_port = host + (f":{port}" if port else "")
 
+    attempt_times: dict[ConnectAttempt, float] = {}
+
     def on_attempt(connect_attempt: ConnectAttempt, success: bool) -> None:
         prot, tran, dev, https = connect_attempt
         key_str = (
@@ -268,10 +276,16 @@ async def config(ctx: click.Context) -> DeviceDict:
         )
         result = "succeeded" if success else "failed"
         msg = f"Attempt to connect to {host_port} with {key_str} {result}"
-        echo(msg)
+        echo(f"{msg} in {attempt_times[connect_attempt]:.2f}s")
 
     dev = await Discover.try_connect_all(
-        host, credentials=credentials, timeout=timeout, port=port, on_attempt=on_attempt
+        host,
+        credentials=credentials,
+        timeout=timeout,
+        port=port,
+        on_attempt=on_attempt,
+        max_concurrent_attempts=concurrency,
+        attempt_times=attempt_times,
     )
     if dev:
         cparams = dev.config.connection_type
@@ -107,11 +107,13 @@ False
 
 from __future__ import annotations
 
+import asyncio
 import logging
 from abc import ABC, abstractmethod
-from collections.abc import Callable, Mapping, Sequence
+from collections.abc import Awaitable, Callable, Iterable, Mapping, Sequence
 from dataclasses import dataclass
 from datetime import datetime, tzinfo
+from types import MappingProxyType
 from typing import TYPE_CHECKING, Any, TypeAlias
 from warnings import warn
 
@@ -124,12 +126,13 @@ from .deviceconfig import (
     DeviceFamily,
 )
 from .exceptions import KasaException
-from .feature import Feature
-from .module import Module
+from .feature import Feature, FeatureChange, FeatureChangeCallable
+from .module import Module, _memoize_module_data
 from .protocols import BaseProtocol, IotProtocol
 from .transports import XorTransport
 
 if TYPE_CHECKING:
+    from .deviceregistry import DeviceRegistry
     from .modulemapping import ModuleMapping, ModuleName
 
 
@@ -195,6 +198,9 @@ class Device(ABC):
     #: The connection type for the device.
     ConnectionParameters: TypeAlias = DeviceConnectionParameters
 
+    #: Maximum number of child devices updated at once
+    MAX_CONCURRENT_CHILD_UPDATES = 10
+
     def __init__(
         self,
         host: str,
@@ -222,6 +228,11 @@ class Device(ABC):
         self._discovery_info: dict[str, Any] | None = None
 
         self._features: dict[str, Feature] = {}
+        # Responses of the queries initializing the device, kept for the registry
+        self._initialization_responses: dict[str, Any] = {}
+        self._restored_initialization = False
+        self._feature_subscribers: dict[str | None, list[FeatureChangeCallable]] = {}
+        self._feature_values: dict[str, Any] = {}
         self._parent: Device | None = None
         self._children: Mapping[str, Device] = {}
 
@@ -230,6 +241,7 @@ class Device(ABC):
         *,
         host: str | None = None,
         config: DeviceConfig | None = None,
+        registry: DeviceRegistry | None = None,
     ) -> Device:
         """Connect to a single device by the given hostname or device configuration.
 
@@ -241,15 +253,20 @@ class Device(ABC):
         the WiFi network is congested or the device is not responding
         to discovery requests.
 
+        If a *registry* is given and contains the device, the device is
+        recreated from the stored connection parameters and initialization
+        responses, otherwise the connected device is added to the registry.
+
         :param host: Hostname of device to query
         :param config: Connection parameters to ensure the correct protocol
             and connection options are used.
+        :param registry: Registry of previously connected devices
         :rtype: SmartDevice
         :return: Object for querying/controlling found device.
         """
         from .device_factory import connect  # pylint: disable=import-outside-toplevel
 
-        return await connect(host=host, config=config)  # type: ignore[arg-type]
+        return await connect(host=host, config=config, registry=registry)  # type: ignore[arg-type]
 
     @abstractmethod
     async def update(self, update_children: bool = True) -> None:
@@ -259,6 +276,33 @@ class Device(ABC):
         """Disconnect and close any underlying connection resources."""
         await self.protocol.close()
 
+    async def _query_initialization(self, request: dict[str, Any]) -> dict[str, Any]:
+        """Query the responses needed to initialize the device.
+
+        The responses are kept so that a :class:`~kasa.deviceregistry.DeviceRegistry`
+        can store them, and are returned without a query if the device was
+        restored from a registry.
+        """
+        if self._restored_initialization and all(
+            method in self._initialization_responses for method in request
+        ):
+            return {
+                method: self._initialization_responses[method] for method in request
+            }
+        resp = await self.protocol.query(request)
+        self._initialization_responses.update(resp)
+        return resp
+
+    @property
+    def _initialization_state(self) -> dict[str, Any]:
+        """Return the initialization responses to store in a registry."""
+        return self._initialization_responses
+
+    def _restore_initialization(self, responses: dict[str, Any]) -> None:
+        """Restore the initialization responses stored in a registry."""
+        self._initialization_responses = dict(responses)
+        self._restored_initialization = True
+
     @property
     @abstractmethod
     def modules(self) -> ModuleMapping[Module]:
@@ -448,13 +492,155 @@ class Device(ABC):
     @property
     def state_information(self) -> dict[str, Any]:
         """Return available features and their values."""
-        return {feat.name: feat.value for feat in self._features.values()}
+        with _memoize_module_data():
+            return {feat.name: feat.value for feat in self._features.values()}
 
     @property
     def features(self) -> dict[str, Feature]:
         """Return the list of supported features."""
         return self._features
 
+    def snapshot(self) -> Mapping[str, Any]:
+        """Return the current values of the features keyed by feature id.
+
+        The features are read in one pass with the data of each module
+        derived from the last update only once.
+        Actions and features whose value cannot be read are left out.
+        The returned mapping is read-only, use ``dict(snapshot)`` to serialize it.
+        """
+        values: dict[str, Any] = {}
+        with _memoize_module_data():
+            for feature in self._features.values():
+                if feature.type is Feature.Type.Action:
+                    continue
+                try:
+                    values[feature.id] = feature.value
+                except Exception as ex:
+                    _LOGGER.debug("Unable to read value of %s: %s", feature.id, ex)
+        return MappingProxyType(values)
+
+    def subscribe(
+        self, callback: FeatureChangeCallable, feature_id: str | None = None
+    ) -> Callable[[], None]:
+        """Subscribe to changes of the feature values.
+
+        At the end of :meth:`update` the callback is called, or awaited if it
+        returns a coroutine, with a :class:`FeatureChange` for every feature
+        whose value changed since the previous update.
+        If *feature_id* is given only the changes of that feature are reported,
+        and only subscribed features are read to detect the changes.
+
+        :param callback: Callable receiving the changes
+        :param feature_id: Id of the feature, None to subscribe to all features
+        :return: Function which removes the subscription
+        """
+        callbacks = self._feature_subscribers.setdefault(feature_id, [])
+        callbacks.append(callback)
+        # Start from the current values so only later changes are reported
+        for feature in self._subscribed_features():
+            if feature.id not in self._feature_values:
+                self._read_feature_value(feature)
+
+        def _unsubscribe() -> None:
+            callbacks.remove(callback)
+            if not callbacks and self._feature_subscribers.get(feature_id) is callbacks:
+                del self._feature_subscribers[feature_id]
+                # Forget the values of features without subscribers so that a
+                # later subscription starts from their current value
+                subscribed = {feature.id for feature in self._subscribed_features()}
+                self._feature_values = {
+                    known_id: value
+                    for known_id, value in self._feature_values.items()
+                    if known_id in subscribed
+                }
+
+        return _unsubscribe
+
+    def _subscribed_features(self) -> list[Feature]:
+        """Return the features with subscribers."""
+        if None in self._feature_subscribers:
+            return list(self._features.values())
+        return [
+            feature
+            for feature_id in self._feature_subscribers
+            if feature_id is not None
+            and (feature := self._features.get(feature_id)) is not None
+        ]
+
+    def _read_feature_value(self, feature: Feature) -> FeatureChange | None:
+        """Store the value of the feature and return the change if any."""
+        if feature.type is Feature.Type.Action:
+            return None
+        try:
+            value = feature.value
+        except Exception as ex:
+            _LOGGER.debug("Unable to read value of %s: %s", feature.id, ex)
+            return None
+        known = feature.id in self._feature_values
+        old_value = self._feature_values.get(feature.id)
+        if known and old_value == value:
+            return None
+        self._feature_values[feature.id] = value
+        return FeatureChange(feature, old_value, value)
+
+    async def _run_child_updates(
+        self, updates: Iterable[Callable[[], Awaitable[None]]]
+    ) -> None:
+        """Run the updates of the children concurrently.
+
+        At most :attr:`MAX_CONCURRENT_CHILD_UPDATES` updates run at once.
+        If an update fails the remaining updates are cancelled and the error raised.
+        """
+        updates = list(updates)
+        if self.MAX_CONCURRENT_CHILD_UPDATES <= 1 or len(updates) < 2:
+            for update in updates:
+                await update()
+            return
+
+        semaphore = asyncio.Semaphore(self.MAX_CONCURRENT_CHILD_UPDATES)
+
+        async def _run(update: Callable[[], Awaitable[None]]) -> None:
+            async with semaphore:
+                await update()
+
+        tasks = [asyncio.create_task(_run(update)) for update in updates]
+        try:
+            await asyncio.gather(*tasks)
+        except BaseException:
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+            raise
+
+    async def _notify_feature_changes(self) -> None:
+        """Notify the subscribers of the features changed by the update.
+
+        The children of the device notify their own subscribers.
+        """
+        if self._feature_subscribers:
+            with _memoize_module_data():
+                changes = [
+                    change
+                    for feature in self._subscribed_features()
+                    if (change := self._read_feature_value(feature))
+                ]
+            all_callbacks = self._feature_subscribers.get(None, [])
+            for change in changes:
+                callbacks = self._feature_subscribers.get(change.feature.id, [])
+                for callback in [*callbacks, *all_callbacks]:
+                    try:
+                        if (coro := callback(change)) is not None:
+                            await coro
+                    except Exception:
+                        _LOGGER.exception(
+                            "Error notifying change of %s for %s",
+                            change.feature.id,
+                            self.host,
+                        )
+
+        for child in self._children.values():
+            await child._notify_feature_changes()
+
     def _add_feature(self, feature: Feature) -> None:
         """Add a new feature to the device."""
         if feature.id in self._features:
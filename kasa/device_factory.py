@@ -9,6 +9,7 @@ from typing import Any
 from .device import Device
 from .device_type import DeviceType
 from .deviceconfig import DeviceConfig, DeviceEncryptionType, DeviceFamily
+from .deviceregistry import DeviceRegistry, _restore_config
 from .exceptions import KasaException, UnsupportedDeviceError
 from .iot import (
     IotBulb,
@@ -45,7 +46,12 @@ GET_SYSINFO_QUERY: dict[str, dict[str, dict]] = {
 }
 
 
-async def connect(*, host: str | None = None, config: DeviceConfig) -> Device:
+async def connect(
+    *,
+    host: str | None = None,
+    config: DeviceConfig,
+    registry: DeviceRegistry | None = None,
+) -> Device:
     """Connect to a single device by the given hostname or device configuration.
 
     This method avoids the UDP based discovery process and
@@ -61,6 +67,7 @@ async def connect(*, host: str | None = None, config: DeviceConfig) -> Device:
     :param host: Hostname of device to query
     :param config: Connection parameters to ensure the correct protocol
         and connection options are used.
+    :param registry: Registry to restore the device from and to add it to.
     :rtype: SmartDevice
     :return: Object for querying/controlling found device.
     """
@@ -69,18 +76,94 @@ async def connect(*, host: str | None = None, config: DeviceConfig) -> Device:
     if host:
         config = DeviceConfig(host=host)
 
+    protocol: BaseProtocol | None = None
+    if registry and (entry := await registry.load(config.host)):
+        restored_config = _restore_config(config, entry)
+        protocol = _get_protocol_or_raise(restored_config)
+        try:
+            if device := await _connect_restored(restored_config, protocol, entry):
+                return device
+        except KasaException as ex:
+            _LOGGER.debug(
+                "Unable to connect to %s with the registry entry, "
+                "negotiating again: %s",
+                config.host,
+                ex,
+            )
+            await protocol.close()
+            await registry.delete(config.host)
+            protocol = None
+        except:
+            await protocol.close()
+            raise
+        else:
+            # Only the firmware changed so the connection parameters are valid
+            config = restored_config
+
+    if protocol is None:
+        protocol = _get_protocol_or_raise(config)
+    try:
+        device = await _connect(config, protocol)
+    except:
+        await protocol.close()
+        raise
+
+    if registry:
+        try:
+            await registry.save(device)
+        except:
+            await device.disconnect()
+            raise
+    return device
+
+
+def _get_protocol_or_raise(config: DeviceConfig) -> BaseProtocol:
+    """Return the protocol for the config or raise if the device is unsupported."""
     if (protocol := get_protocol(config=config)) is None:
         raise UnsupportedDeviceError(
             f"Unsupported device for {config.host}: "
             + f"{config.connection_type.device_family.value}",
             host=config.host,
         )
+    return protocol
 
-    try:
-        return await _connect(config, protocol)
-    except:
-        await protocol.close()
-        raise
+
+async def _connect_restored(
+    config: DeviceConfig, protocol: BaseProtocol, entry: dict[str, Any]
+) -> Device | None:
+    """Recreate the device from a registry entry and update it.
+
+    Return None if the firmware of the device changed since it was stored.
+    """
+    initialization = DeviceRegistry._initialization(entry)
+    device_class: type[Device] | None
+    if isinstance(protocol, IotProtocol) and isinstance(
+        protocol._transport, XorTransport
+    ):
+        device_class = get_device_class_from_sys_info(initialization)
+    else:
+        device_class = get_device_class_from_family(
+            config.connection_type.device_family.value,
+            https=config.connection_type.https,
+        )
+    if device_class is None:
+        return None
+
+    device = device_class(config.host, protocol=protocol)
+    if discovery_info := entry.get("discovery_info"):
+        device.update_from_discover_info(discovery_info)
+    device._restore_initialization(initialization)
+    await device.update()
+
+    if device.device_info.firmware_version != entry["firmware"]:
+        _LOGGER.debug(
+            "Firmware of %s changed from %s to %s, initializing again",
+            config.host,
+            entry["firmware"],
+            device.device_info.firmware_version,
+        )
+        return None
+    return device
 
 
 async def _connect(config: DeviceConfig, protocol: BaseProtocol) -> Device:
@@ -42,6 +42,7 @@ from mashumaro.config import BaseConfig
 from .credentials import Credentials
 from .exceptions import KasaException
 from .json import DataClassJSONMixin
+from .sessionstore import SessionStore
 
 if TYPE_CHECKING:
     from aiohttp import ClientSession
@@ -170,6 +171,25 @@ class DeviceConfig(_DeviceConfigBaseMixin):
 
     aes_keys: KeyPairDict | None = None
 
+    #: Maximum number of requests protocols supporting multiple request batches
+    #: may have in flight at once. Defaults to sending requests sequentially.
+    max_concurrent_requests: int | None = None
+
+    #: Adapt the batch size of protocols supporting multiple request batches
+    #: to the device. Ignored if *batch_size* is set.
+    adaptive_batch_size: bool | None = None
+
+    #: Create the children of hubs as stubs holding only their info.
+    #: Their modules and features are initialized once the child is first used.
+    lazy_children: bool | None = None
+
+    #: Opt-in store to persist transport sessions across restarts.
+    session_store: SessionStore | None = field(
+        default=None,
+        compare=False,
+        metadata=field_options(serialize="omit", deserialize=pass_through),
+    )
+
     def __post_init__(self) -> None:
         if self.connection_type is None:
             self.connection_type = DeviceConnectionParameters(
@@ -0,0 +1,114 @@
+"""Persistent registry of previously connected devices.
+
+Connecting to a device for the first time requires finding out how to talk
+to it and which components it supports before it can be updated.
+A :class:`DeviceRegistry` stores the connection parameters, the discovery
+info and the responses of the initialization queries of connected devices
+in a :class:`~kasa.sessionstore.SessionStore`, so that a later process can
+recreate the devices with a single update:
+
+>>> from kasa import Device
+>>> from kasa.deviceregistry import DeviceRegistry
+>>> from kasa.sessionstore import FileSessionStore
+>>> registry = DeviceRegistry(FileSessionStore("/tmp/kasa_devices.json"))
+>>> dev = await Device.connect(host="127.0.0.3", registry=registry)
+
+Entries are revalidated with the data of the first update of the recreated
+device and are replaced if the firmware of the device changed.
+The stored entries contain the credentials hash of the device so the same
+precautions as for session stores apply.
+"""
+
+from __future__ import annotations
+
+import logging
+from dataclasses import replace
+from typing import TYPE_CHECKING, Any
+
+from .deviceconfig import DeviceConfig
+from .exceptions import SmartErrorCode
+
+if TYPE_CHECKING:
+    from .device import Device
+    from .sessionstore import SessionStore
+
+_LOGGER = logging.getLogger(__name__)
+
+#: Version of the stored entries, entries of other versions are ignored
+REGISTRY_VERSION = 1
+
+
+class DeviceRegistry:
+    """Registry of devices kept in a session store."""
+
+    def __init__(self, store: SessionStore) -> None:
+        self._store = store
+
+    @staticmethod
+    def _key(host: str) -> str:
+        return f"device:{host}"
+
+    async def save(self, device: Device) -> None:
+        """Store the device, replacing any previous entry for its host."""
+        config = device.config.to_dict_control_credentials(
+            credentials_hash=device.credentials_hash, exclude_credentials=True
+        )
+        initialization: dict[str, Any] = {}
+        errors: dict[str, int] = {}
+        for method, response in device._initialization_state.items():
+            if isinstance(response, SmartErrorCode):
+                errors[method] = response.value
+            else:
+                initialization[method] = response
+        entry = {
+            "version": REGISTRY_VERSION,
+            "firmware": device.device_info.firmware_version,
+            "config": config,
+            "discovery_info": device._discovery_info,
+            "initialization": initialization,
+            "errors": errors,
+        }
+        await self._store.save(self._key(device.host), entry)
+
+    async def load(self, host: str) -> dict[str, Any] | None:
+        """Return the stored entry for the host or None."""
+        entry = await self._store.load(self._key(host))
+        if entry is None:
+            return None
+        if entry.get("version") != REGISTRY_VERSION:
+            _LOGGER.debug("Ignoring registry entry for %s with old version", host)
+            return None
+        return entry
+
+    @staticmethod
+    def _initialization(entry: dict[str, Any]) -> dict[str, Any]:
+        """Return the initialization responses of the entry."""
+        errors = {
+            method: SmartErrorCode(code) for method, code in entry["errors"].items()
+        }
+        return {**entry["initialization"], **errors}
+
+    async def delete(self, host: str) -> None:
+        """Remove the entry for the host."""
+        await self._store.delete(self._key(host))
+
+
+def _restore_config(config: DeviceConfig, entry: dict[str, Any]) -> DeviceConfig:
+    """Return the config with the connection parameters of the registry entry.
+
+    Credentials given in the config take precedence over the stored hash and
+    the stored connection type is only used if the config has the default one.
+    """
+    stored = DeviceConfig.from_dict(entry["config"])
+    credentials_hash = config.credentials_hash
+    if not config.credentials and not credentials_hash:
+        credentials_hash = stored.credentials_hash
+    connection_type = config.connection_type
+    if connection_type == DeviceConfig(host=config.host).connection_type:
+        connection_type = stored.connection_type
+    return replace(
+        config,
+        connection_type=connection_type,
+        port_override=config.port_override or stored.port_override,
+        credentials_hash=credentials_hash,
+    )
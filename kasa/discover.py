@@ -72,6 +72,16 @@ Discovered Bedroom Lightstrip (model: KL430)
 Discovered Living Room Dimmer Switch (model: HS220)
 Discovered Tapo Hub (model: H200)
 
+Devices can also be iterated as they respond, optionally updating them
+and stopping once enough devices were found:
+
+>>> async for dev in Discover.iter_discover(
+...     credentials=creds, update=True, max_devices=2
+... ):
+...     print(f"Discovered {dev.alias} (model: {dev.model})")
+Discovered ...
+Discovered ...
+
 Discovering a single device returns a kasa.Device object.
 
 >>> device = await Discover.discover_single("127.0.0.1", credentials=creds)
@@ -85,15 +95,20 @@ from __future__ import annotations
 import asyncio
 import base64
 import binascii
+import contextlib
+import hashlib
 import ipaddress
 import logging
 import secrets
 import socket
 import struct
+import time
 from asyncio import timeout as asyncio_timeout
 from asyncio.transports import DatagramTransport
-from collections.abc import Callable, Coroutine
-from dataclasses import dataclass
+from collections.abc import AsyncIterator, Callable, Coroutine, Iterable
+from dataclasses import dataclass, field
+from functools import partial
+from itertools import product
 from pprint import pformat as pf
 from typing import (
     TYPE_CHECKING,
@@ -131,7 +146,7 @@ from kasa.json import dumps as json_dumps
 from kasa.json import loads as json_loads
 from kasa.protocols.iotprotocol import REDACTORS as IOT_REDACTORS
 from kasa.protocols.protocol import mask_mac, redact_data
-from kasa.transports.aestransport import AesEncyptionSession, KeyPair
+from kasa.transports.aestransport import AesEncyptionSession, KeyPair, KeyPairPool
 from kasa.transports.xortransport import XorEncryption
 
 _LOGGER = logging.getLogger(__name__)
@@ -190,13 +205,19 @@ NEW_DISCOVERY_REDACTORS: dict[str, Callable[[Any], Any] | None] = {
 }
 
 
+def _normalize_mac(mac: str) -> str:
+    """Return the mac address in upper case separated with colons."""
+    return mac.replace("-", ":").upper()
+
+
 class _AesDiscoveryQuery:
     keypair: KeyPair | None = None
+    key_pair_pool = KeyPairPool(key_size=2048, size=0)
 
     @classmethod
-    def generate_query(cls) -> bytearray:
+    async def generate_query(cls) -> bytearray:
         if not cls.keypair:
-            cls.keypair = KeyPair.create_key_pair(key_size=2048)
+            cls.keypair = await cls.key_pair_pool.get()
         secret = secrets.token_bytes(4)
 
         key_payload = {"params": {"rsa_key": cls.keypair.get_public_pem().decode()}}
@@ -230,6 +251,163 @@ class _AesDiscoveryQuery:
         return query
 
 
+@dataclass
+class DiscoveryDelta:
+    """Changes found by a discovery scan using a :class:`DiscoveryCache`."""
+
+    #: Devices not seen before keyed by ip
+    new: DeviceDict = field(default_factory=dict)
+    #: Devices whose discovery response or ip changed keyed by ip
+    changed: DeviceDict = field(default_factory=dict)
+    #: Devices not seen within the ttl keyed by ip
+    gone: DeviceDict = field(default_factory=dict)
+
+
+@dataclass
+class _DiscoveryCacheEntry:
+    digest: str
+    device: Device
+    mac: str | None
+    seen: float
+
+
+class DiscoveryCache:
+    """Cache of discovered devices shared between discovery scans.
+
+    Devices are cached by ip and mac address. Responses identical to the
+    cached response of a host return the cached device without decrypting
+    the response or creating a new device instance.
+    Devices not seen for *ttl* seconds are removed at the end of a scan.
+    The changes of the last complete scan are available in :attr:`delta`.
+    """
+
+    def __init__(self, ttl: float = 300) -> None:
+        self.ttl = ttl
+        self.delta = DiscoveryDelta()
+        self._entries: dict[str, _DiscoveryCacheEntry] = {}
+        self._scan: DiscoveryDelta | None = None
+        self._scan_started = 0.0
+
+    @property
+    def devices(self) -> DeviceDict:
+        """Return the cached devices keyed by ip."""
+        return {ip: entry.device for ip, entry in self._entries.items()}
+
+    #: Sysinfo keys of legacy responses identifying the device and its firmware
+    LEGACY_DIGEST_KEYS = (
+        "deviceId",
+        "mac",
+        "mic_mac",
+        "ethernet_mac",
+        "model",
+        "sw_ver",
+        "hw_ver",
+        "alias",
+    )
+
+    @staticmethod
+    def _digest(data: bytes, info: dict) -> str:
+        """Return the digest of a discovery response.
+
+        The encrypted part of new discovery responses and the header echoing
+        the query serial differ for every response so only the plain result
+        is hashed. The sysinfo of legacy responses contains readings like the
+        rssi and the on time so only the :attr:`LEGACY_DIGEST_KEYS` are hashed.
+        """
+        if (result := info.get("result")) is not None:
+            result = {k: v for k, v in result.items() if k != "encrypt_info"}
+            data = json_dumps(result).encode()
+        elif isinstance(system := info.get("system"), dict) and isinstance(
+            sys_info := system.get("get_sysinfo"), dict
+        ):
+            stable = {
+                key: sys_info[key]
+                for key in DiscoveryCache.LEGACY_DIGEST_KEYS
+                if key in sys_info
+            }
+            data = json_dumps(stable).encode()
+        return hashlib.sha1(data, usedforsecurity=False).hexdigest()
+
+    def _get(self, ip: str, digest: str) -> Device | None:
+        """Return the cached device if the response is unchanged."""
+        if (entry := self._entries.get(ip)) is None or entry.digest != digest:
+            return None
+        entry.seen = time.monotonic()
+        return entry.device
+
+    def _add(self, ip: str, digest: str, device: Device) -> None:
+        """Add a new or changed device to the cache."""
+        try:
+            mac: str | None = _normalize_mac(device.mac)
+        except KasaException:
+            mac = None
+        changed = ip in self._entries
+        if mac is not None:
+            for other_ip, entry in list(self._entries.items()):
+                if entry.mac == mac and other_ip != ip:
+                    _LOGGER.debug("Device %s moved from %s to %s", mac, other_ip, ip)
+                    del self._entries[other_ip]
+                    changed = True
+        self._entries[ip] = _DiscoveryCacheEntry(digest, device, mac, time.monotonic())
+        if self._scan is not None:
+            if changed:
+                self._scan.changed[ip] = device
+            else:
+                self._scan.new[ip] = device
+
+    def _start_scan(self) -> None:
+        self._scan = DiscoveryDelta()
+        self._scan_started = time.monotonic()
+
+    def _finish_scan(self) -> DiscoveryDelta:
+        """Remove the expired devices and return the changes of the scan."""
+        delta = self._scan or DiscoveryDelta()
+        now = time.monotonic()
+        for ip, entry in list(self._entries.items()):
+            if entry.seen < self._scan_started and now - entry.seen >= self.ttl:
+                delta.gone[ip] = entry.device
+                del self._entries[ip]
+        self._scan = None
+        self.delta = delta
+        return delta
+
+
+@dataclass
+class DiscoveryStats:
+    """Statistics of the discovery on a single target and interface."""
+
+    #: Broadcast address the discovery queries were sent to
+    target: str
+    #: Interface the discovery was bound to
+    interface: str | None
+    #: Number of responses received
+    responses: int = 0
+    #: Number of responses from hosts which had already responded
+    duplicates: int = 0
+    #: Number of supported devices found
+    devices: int = 0
+    #: Number of unsupported devices found
+    unsupported: int = 0
+    #: Number of invalid responses
+    invalid: int = 0
+
+
+OnDiscoveryStatsCallable = Callable[[DiscoveryStats], None]
+
+
+def _broadcast_address(target: str) -> str:
+    """Return the broadcast address of a subnet or the target address."""
+    if "/" in target:
+        return str(ipaddress.ip_network(target, strict=False).broadcast_address)
+    return target
+
+
+def _broadcast_targets(target: str | Iterable[str]) -> list[str]:
+    """Return the broadcast addresses of the target or targets."""
+    targets = [target] if isinstance(target, str) else target
+    return [_broadcast_address(target) for target in targets]
+
+
 class _DiscoverProtocol(asyncio.DatagramProtocol):
     """Implementation of the discovery protocol handler.
 
@@ -253,6 +431,8 @@ class _DiscoverProtocol(asyncio.DatagramProtocol):
         port: int | None = None,
         credentials: Credentials | None = None,
         timeout: int | None = None,
+        cache: DiscoveryCache | None = None,
+        seen_hosts: set[str] | None = None,
     ) -> None:
         self.transport: DatagramTransport | None = None
         self.discovery_packets = discovery_packets
@@ -274,7 +454,10 @@ class _DiscoverProtocol(asyncio.DatagramProtocol):
         self.credentials = credentials
         self.timeout = timeout
         self.discovery_timeout = discovery_timeout
-        self.seen_hosts: set[str] = set()
+        self.cache = cache
+        # Shared between the protocols of a multi target discovery
+        self.seen_hosts: set[str] = seen_hosts if seen_hosts is not None else set()
+        self.stats = DiscoveryStats(target, interface)
         self.discover_task: asyncio.Task | None = None
         self.callback_tasks: list[asyncio.Task] = []
         self.target_discovered: bool = False
@@ -328,7 +511,7 @@ class _DiscoverProtocol(asyncio.DatagramProtocol):
         encrypted_req = XorEncryption.encrypt(req)
         sleep_between_packets = self.discovery_timeout / self.discovery_packets
 
-        aes_discovery_query = _AesDiscoveryQuery.generate_query()
+        aes_discovery_query = await _AesDiscoveryQuery.generate_query()
         for _ in range(self.discovery_packets):
             if self.target in self.seen_hosts:  # Stop sending for discover_single
                 break
@@ -347,8 +530,10 @@ class _DiscoverProtocol(asyncio.DatagramProtocol):
             assert _AesDiscoveryQuery.keypair
 
         ip, port = addr
+        self.stats.responses += 1
         # Prevent multiple entries due multiple broadcasts
         if ip in self.seen_hosts:
+            self.stats.duplicates += 1
             return
         self.seen_hosts.add(ip)
 
@@ -376,10 +561,17 @@ class _DiscoverProtocol(asyncio.DatagramProtocol):
                         "meta": {"ip": ip, "port": port},
                     }
                 )
-            device = device_func(info, config)
+            if self.cache is None:
+                device = device_func(info, config)
+            else:
+                digest = self.cache._digest(data, info)
+                if (device := self.cache._get(ip, digest)) is None:
+                    device = device_func(info, config)
+                    self.cache._add(ip, digest, device)
         except UnsupportedDeviceError as udex:
             _LOGGER.debug("Unsupported device found at %s << %s", ip, udex)
             self.unsupported_device_exceptions[ip] = udex
+            self.stats.unsupported += 1
             if self.on_unsupported is not None:
                 self._run_callback_task(self.on_unsupported(udex))
             self._handle_discovered_event()
@@ -387,10 +579,12 @@ class _DiscoverProtocol(asyncio.DatagramProtocol):
         except KasaException as ex:
             _LOGGER.debug("[DISCOVERY] Unable to find device type for %s: %s", ip, ex)
             self.invalid_device_exceptions[ip] = ex
+            self.stats.invalid += 1
             self._handle_discovered_event()
             return
 
         self.discovered_devices[ip] = device
+        self.stats.devices += 1
 
         if self.on_discovered is not None:
             self._run_callback_task(self.on_discovered(device))
@@ -414,6 +608,55 @@ class _DiscoverProtocol(asyncio.DatagramProtocol):
             self.discover_task.cancel()
 
 
+class _SweepDiscoverProtocol(_DiscoverProtocol):
+    """Discovery protocol sending unicast queries to every host of a network.
+
+    This is internal class, use :func:`Discover.sweep`: instead.
+    """
+
+    def __init__(
+        self,
+        *,
+        target: str,
+        packets_per_second: float,
+        **kwargs: Any,
+    ) -> None:
+        super().__init__(target=target, **kwargs)
+        self.hosts = [
+            str(host) for host in ipaddress.ip_network(target, strict=False).hosts()
+        ]
+        self.packets_per_second = packets_per_second
+
+    async def do_discover(self) -> None:
+        """Send the discovery queries to every host at the configured rate."""
+        if TYPE_CHECKING:
+            assert self.transport
+
+        req = json_dumps(Discover.DISCOVERY_QUERY)
+        _LOGGER.debug("[DISCOVERY] %s >> %s", self.target, Discover.DISCOVERY_QUERY)
+        encrypted_req = XorEncryption.encrypt(req)[4:]
+        aes_discovery_query = await _AesDiscoveryQuery.generate_query()
+        loop = asyncio.get_running_loop()
+        start = loop.time()
+        sent = 0
+        for _ in range(self.discovery_packets):
+            for host in self.hosts:
+                if host in self.seen_hosts:
+                    continue
+                self.transport.sendto(encrypted_req, (host, self.discovery_port))
+                self.transport.sendto(
+                    aes_discovery_query, (host, Discover.DISCOVERY_PORT_2)
+                )
+                self.transport.sendto(
+                    aes_discovery_query, (host, Discover.DISCOVERY_PORT_3)
+                )
+                sent += 3
+                delay = start + sent / self.packets_per_second - loop.time()
+                if delay > 0:
+                    await asyncio.sleep(delay)
+        await asyncio.sleep(self.discovery_timeout)
+
+
 class Discover:
     """Class for discovering devices."""
 
@@ -427,23 +670,28 @@ class Discover:
     DISCOVERY_PORT_3 = 20004
     DISCOVERY_QUERY_2 = binascii.unhexlify("020000010000000000000000463cb5d3")
 
+    #: Seconds to wait for a port to accept a connection when probing ports
+    PORT_PROBE_TIMEOUT = 2
+
     _redact_data = True
 
     @staticmethod
     async def discover(
         *,
-        target: str = "255.255.255.255",
+        target: str | Iterable[str] = "255.255.255.255",
         on_discovered: OnDiscoveredCallable | None = None,
         on_discovered_raw: OnDiscoveredRawCallable | None = None,
         discovery_timeout: int = 5,
         discovery_packets: int = 3,
-        interface: str | None = None,
+        interface: str | Iterable[str] | None = None,
         on_unsupported: OnUnsupportedCallable | None = None,
         credentials: Credentials | None = None,
         username: str | None = None,
         password: str | None = None,
         port: int | None = None,
         timeout: int | None = None,
+        cache: DiscoveryCache | None = None,
+        on_stats: OnDiscoveryStatsCallable | None = None,
     ) -> DeviceDict:
         """Discover supported devices.
 
@@ -454,6 +702,12 @@ class Discover:
         If you have multiple interfaces,
         you can use *target* parameter to specify the network for discovery.
 
+        Both *target* and *interface* accept a list to discover on several
+        networks concurrently, targets can also be given as subnets
+        (e.g. 192.168.1.0/24).
+        The results are merged and devices responding on several networks
+        are only returned once.
+
         If given, `on_discovered` coroutine will get awaited with
         a :class:`Device`-derived object as parameter.
 
@@ -462,14 +716,14 @@ class Discover:
         The devices are already initialized and all but emeter-related properties
         can be accessed directly.
 
-        :param target: The target address where to send the broadcast discovery
-         queries if multi-homing (e.g. 192.168.xxx.255).
+        :param target: The target address or list of addresses where to send
+         the broadcast discovery queries if multi-homing (e.g. 192.168.xxx.255).
         :param on_discovered: coroutine to execute on discovery
         :param on_discovered_raw: Optional callback once discovered json is loaded
             before any attempt to deserialize it and create devices
         :param discovery_timeout: Seconds to wait for responses, defaults to 5
         :param discovery_packets: Number of discovery packets to broadcast
-        :param interface: Bind to specific interface
+        :param interface: Bind to specific interface or list of interfaces
         :param on_unsupported: Optional callback when unsupported devices are discovered
         :param credentials: Credentials for devices that require authentication.
             username and password are ignored if provided.
@@ -477,41 +731,327 @@ class Discover:
         :param password: Password for devices that require authentication
         :param port: Override the discovery port for devices listening on 9999
         :param timeout: Query timeout in seconds for devices returned by discovery
+        :param cache: Optional cache to reuse the devices of previous scans
+            and track the changes between scans
+        :param on_stats: Optional callback with the statistics of each target
+            and interface once discovery is complete
         :return: dictionary with discovered devices
         """
         if not credentials and username and password:
             credentials = Credentials(username, password)
-        loop = asyncio.get_event_loop()
-        transport, protocol = await loop.create_datagram_endpoint(
-            lambda: _DiscoverProtocol(
-                target=target,
-                on_discovered=on_discovered,
-                discovery_packets=discovery_packets,
-                interface=interface,
-                on_unsupported=on_unsupported,
-                on_discovered_raw=on_discovered_raw,
-                credentials=credentials,
-                timeout=timeout,
-                discovery_timeout=discovery_timeout,
-                port=port,
-            ),
-            local_addr=("0.0.0.0", 0),  # noqa: S104
+        if cache:
+            cache._start_scan()
+        endpoints = await Discover._create_endpoints(
+            _broadcast_targets(target),
+            interface,
+            on_discovered=on_discovered,
+            discovery_packets=discovery_packets,
+            on_unsupported=on_unsupported,
+            on_discovered_raw=on_discovered_raw,
+            credentials=credentials,
+            timeout=timeout,
+            discovery_timeout=discovery_timeout,
+            port=port,
+            cache=cache,
         )
-        protocol = cast(_DiscoverProtocol, protocol)
+        protocols = [protocol for _, protocol in endpoints]
+        tasks = [
+            asyncio.create_task(protocol.wait_for_discovery_to_complete())
+            for protocol in protocols
+        ]
 
         try:
             _LOGGER.debug("Waiting %s seconds for responses...", discovery_timeout)
-            await protocol.wait_for_discovery_to_complete()
+            await asyncio.gather(*tasks)
         except (KasaException, asyncio.CancelledError) as ex:
-            for device in protocol.discovered_devices.values():
-                await device.protocol.close()
+            for task in tasks:
+                task.cancel()
+            for protocol in protocols:
+                for device in protocol.discovered_devices.values():
+                    await device.protocol.close()
             raise ex
         finally:
-            transport.close()
+            for transport, _ in endpoints:
+                transport.close()
+
+        discovered_devices = {
+            ip: device
+            for protocol in protocols
+            for ip, device in protocol.discovered_devices.items()
+        }
+        _LOGGER.debug("Discovered %s devices", len(discovered_devices))
+        if cache:
+            cache._finish_scan()
+        if on_stats:
+            for protocol in protocols:
+                on_stats(protocol.stats)
+
+        return discovered_devices
 
-        _LOGGER.debug("Discovered %s devices", len(protocol.discovered_devices))
+    @staticmethod
+    async def _create_endpoints(
+        targets: list[str],
+        interface: str | Iterable[str] | None,
+        protocol_class: type[_DiscoverProtocol] = _DiscoverProtocol,
+        **kwargs: Any,
+    ) -> list[tuple[DatagramTransport, _DiscoverProtocol]]:
+        """Create a discovery endpoint for each target and interface."""
+        interfaces = (
+            [interface]
+            if interface is None or isinstance(interface, str)
+            else list(interface)
+        )
+        seen_hosts: set[str] = set()
+        loop = asyncio.get_event_loop()
+        endpoints = await asyncio.gather(
+            *(
+                loop.create_datagram_endpoint(
+                    partial(
+                        protocol_class,
+                        target=target,
+                        interface=interface,
+                        seen_hosts=seen_hosts,
+                        **kwargs,
+                    ),
+                    local_addr=("0.0.0.0", 0),  # noqa: S104
+                )
+                for target, interface in product(targets, interfaces)
+            ),
+            return_exceptions=True,
+        )
+        if errors := [ex for ex in endpoints if isinstance(ex, BaseException)]:
+            for endpoint in endpoints:
+                if not isinstance(endpoint, BaseException):
+                    endpoint[0].close()
+            raise errors[0]
+        return [
+            (transport, cast(_DiscoverProtocol, protocol))
+            for transport, protocol in cast(
+                list[tuple[DatagramTransport, asyncio.DatagramProtocol]], endpoints
+            )
+        ]
 
-        return protocol.discovered_devices
+    @staticmethod
+    def iter_discover(
+        *,
+        target: str | Iterable[str] = "255.255.255.255",
+        on_discovered_raw: OnDiscoveredRawCallable | None = None,
+        discovery_timeout: int = 5,
+        discovery_packets: int = 3,
+        interface: str | Iterable[str] | None = None,
+        on_unsupported: OnUnsupportedCallable | None = None,
+        credentials: Credentials | None = None,
+        username: str | None = None,
+        password: str | None = None,
+        port: int | None = None,
+        timeout: int | None = None,
+        update: bool = False,
+        max_concurrent_updates: int = 10,
+        max_devices: int | None = None,
+        macs: Iterable[str] | None = None,
+        cache: DiscoveryCache | None = None,
+    ) -> AsyncIterator[Device]:
+        """Discover supported devices and yield them as they respond.
+
+        Takes the same discovery parameters as :meth:`discover`, but yields
+        each :class:`Device` as soon as its discovery response arrives
+        instead of waiting for *discovery_timeout* to elapse.
+
+        If *update* is set, the devices are updated before they are yielded
+        and devices failing to update are skipped.
+        At most *max_concurrent_updates* devices are updated at once,
+        and no new updates are started while the consumer holds the iterator.
+
+        Discovery stops early once *max_devices* devices were yielded or
+        the devices with all the given *macs* were yielded.
+        When breaking out of the loop use :func:`contextlib.aclosing`
+        to stop discovery immediately.
+
+        :param update: Update the devices before yielding them
+        :param max_concurrent_updates: Maximum number of concurrent updates
+        :param max_devices: Stop after yielding this many devices
+        :param macs: Stop after yielding the devices with these mac addresses
+        :param cache: Optional cache to reuse the devices of previous scans,
+            the changes are only tracked if the discovery is not stopped early
+        :return: async iterator of the discovered devices
+        """
+        if not credentials and username and password:
+            credentials = Credentials(username, password)
+        return Discover._iter_discovered(
+            _broadcast_targets(target),
+            interface,
+            update=update,
+            max_concurrent_updates=max_concurrent_updates,
+            max_devices=max_devices,
+            macs=macs,
+            cache=cache,
+            discovery_packets=discovery_packets,
+            on_unsupported=on_unsupported,
+            on_discovered_raw=on_discovered_raw,
+            credentials=credentials,
+            timeout=timeout,
+            discovery_timeout=discovery_timeout,
+            port=port,
+        )
+
+    @staticmethod
+    def sweep(
+        network: str,
+        *,
+        packets_per_second: float = 1000,
+        on_discovered_raw: OnDiscoveredRawCallable | None = None,
+        discovery_timeout: int = 1,
+        discovery_packets: int = 1,
+        interface: str | None = None,
+        on_unsupported: OnUnsupportedCallable | None = None,
+        credentials: Credentials | None = None,
+        username: str | None = None,
+        password: str | None = None,
+        port: int | None = None,
+        timeout: int | None = None,
+        update: bool = False,
+        max_concurrent_updates: int = 10,
+        max_devices: int | None = None,
+        macs: Iterable[str] | None = None,
+        cache: DiscoveryCache | None = None,
+    ) -> AsyncIterator[Device]:
+        """Discover devices by sending unicast queries to every host of a network.
+
+        This can be used on networks filtering broadcast traffic.
+        The queries are sent from a single socket at a rate of
+        *packets_per_second* and the devices are yielded as they respond,
+        taking the same parameters as :meth:`iter_discover`.
+
+        :param network: The network to sweep (e.g. 192.168.1.0/24)
+        :param packets_per_second: Maximum number of queries sent per second
+        :param discovery_timeout: Seconds to wait for responses after
+            the last query, defaults to 1
+        :param discovery_packets: Number of times to query hosts
+            which have not responded
+        :return: async iterator of the discovered devices
+        """
+        if not credentials and username and password:
+            credentials = Credentials(username, password)
+        return Discover._iter_discovered(
+            [network],
+            interface,
+            protocol_class=_SweepDiscoverProtocol,
+            packets_per_second=packets_per_second,
+            update=update,
+            max_concurrent_updates=max_concurrent_updates,
+            max_devices=max_devices,
+            macs=macs,
+            cache=cache,
+            discovery_packets=discovery_packets,
+            on_unsupported=on_unsupported,
+            on_discovered_raw=on_discovered_raw,
+            credentials=credentials,
+            timeout=timeout,
+            discovery_timeout=discovery_timeout,
+            port=port,
+        )
+
+    @staticmethod
+    async def _iter_discovered(
+        targets: list[str],
+        interface: str | Iterable[str] | None,
+        *,
+        update: bool,
+        max_concurrent_updates: int,
+        max_devices: int | None,
+        macs: Iterable[str] | None,
+        cache: DiscoveryCache | None,
+        **kwargs: Any,
+    ) -> AsyncIterator[Device]:
+        """Yield the devices discovered by the endpoints of the targets."""
+        if cache:
+            cache._start_scan()
+        wanted_macs = {_normalize_mac(mac) for mac in macs} if macs else None
+        discovered: asyncio.Queue[Device | None] = asyncio.Queue()
+
+        async def _on_discovered(device: Device) -> None:
+            discovered.put_nowait(device)
+
+        endpoints = await Discover._create_endpoints(
+            targets, interface, on_discovered=_on_discovered, cache=cache, **kwargs
+        )
+        discovery = asyncio.gather(
+            *(protocol.wait_for_discovery_to_complete() for _, protocol in endpoints)
+        )
+        discovery.add_done_callback(lambda _: discovered.put_nowait(None))
+
+        updates: dict[asyncio.Task, Device] = {}
+        getter: asyncio.Task | None = None
+        ready: list[Device] = []
+        finished = False
+        yielded = 0
+        try:
+            while not finished or updates:
+                if (
+                    not finished
+                    and getter is None
+                    and len(updates) < max_concurrent_updates
+                ):
+                    getter = asyncio.create_task(discovered.get())
+                waiting = {*updates, getter} if getter else set(updates)
+                done, _ = await asyncio.wait(
+                    waiting, return_when=asyncio.FIRST_COMPLETED
+                )
+                if getter in done:
+                    device = getter.result()
+                    getter = None
+                    if device is None:
+                        finished = True
+                        if not discovery.cancelled():
+                            discovery.result()
+                        if cache:
+                            cache._finish_scan()
+                    elif update:
+                        task = asyncio.create_task(Discover._update_discovered(device))
+                        updates[task] = device
+                    else:
+                        ready.append(device)
+                for task in done & updates.keys():
+                    device = updates.pop(task)
+                    if task.result():
+                        ready.append(device)
+                while ready:
+                    device = ready.pop(0)
+                    yield device
+                    yielded += 1
+                    if wanted_macs is not None:
+                        wanted_macs.discard(_normalize_mac(device.mac))
+                    if (max_devices is not None and yielded >= max_devices) or (
+                        wanted_macs is not None and not wanted_macs
+                    ):
+                        return
+        finally:
+            discovery.cancel()
+            for transport, protocol in endpoints:
+                transport.close()
+                for callback_task in protocol.callback_tasks:
+                    callback_task.cancel()
+            if getter:
+                getter.cancel()
+            for task in updates:
+                task.cancel()
+            unyielded = [*ready, *updates.values()]
+            while not discovered.empty():
+                if device := discovered.get_nowait():
+                    unyielded.append(device)
+            for device in unyielded:
+                await device.protocol.close()
+
+    @staticmethod
+    async def _update_discovered(device: Device) -> bool:
+        """Update a discovered device and return whether it succeeded."""
+        try:
+            await device.update()
+        except KasaException as ex:
+            _LOGGER.debug("Unable to update discovered device %s: %s", device.host, ex)
+            await device.protocol.close()
+            return False
+        return True
 
     @staticmethod
     async def discover_single(
@@ -618,6 +1158,8 @@ class Discover:
         credentials: Credentials | None = None,
         http_client: ClientSession | None = None,
         on_attempt: OnConnectAttemptCallable | None = None,
+        max_concurrent_attempts: int = 1,
+        attempt_times: dict[ConnectAttempt, float] | None = None,
     ) -> Device | None:
         """Try to connect directly to a device with all possible parameters.
 
@@ -625,12 +1167,22 @@ class Discover:
         After succesfully connecting use the device config and
         :meth:`Device.connect()` for future connections.
 
+        By default the candidates are tried one after another.
+        With *max_concurrent_attempts* greater than one the ports used by
+        the candidates are probed first, candidates using open ports are tried
+        first and up to *max_concurrent_attempts* candidates are raced at once.
+        The remaining attempts are cancelled as soon as one succeeds.
+
         :param host: Hostname of device to query
         :param port: Optionally set a different port for legacy devices using port 9999
         :param timeout: Timeout in seconds device for devices queries
         :param credentials: Credentials for devices that require authentication.
         :param http_client: Optional client session for devices that use http.
             username and password are ignored if provided.
+        :param on_attempt: Optional callback with the result of each attempt
+        :param max_concurrent_attempts: Maximum number of concurrent attempts
+        :param attempt_times: Optional mapping filled with the seconds each
+            attempt took before *on_attempt* is called
         """
         from .device_factory import _connect
 
@@ -678,30 +1230,81 @@ class Discover:
                 )
             )
         }
-        for key, val in candidates.items():
-            try:
-                prot, config = val
-                _LOGGER.debug("Trying to connect with %s", prot.__class__.__name__)
-                dev = await _connect(config, prot)
-            except Exception as ex:
-                _LOGGER.debug(
-                    "Unable to connect with %s: %s",
-                    prot.__class__.__name__,
-                    ex,
-                )
-                if on_attempt:
-                    ca = tuple.__new__(ConnectAttempt, key)
-                    on_attempt(ca, False)
-            else:
-                if on_attempt:
-                    ca = tuple.__new__(ConnectAttempt, key)
-                    on_attempt(ca, True)
-                _LOGGER.debug("Found working protocol %s", prot.__class__.__name__)
-                return dev
-            finally:
-                await prot.close()
+        attempts = list(candidates.items())
+        if max_concurrent_attempts > 1:
+            open_ports = await Discover._probe_ports(
+                host, {prot._transport._port for prot, _ in candidates.values()}
+            )
+            _LOGGER.debug("Open ports on %s: %s", host, open_ports)
+            attempts.sort(
+                key=lambda item: item[1][0]._transport._port not in open_ports
+            )
+        semaphore = asyncio.Semaphore(max_concurrent_attempts)
+
+        async def _attempt(
+            key: tuple[type[BaseProtocol], type[BaseTransport], type[Device], bool],
+            prot: BaseProtocol,
+            config: DeviceConfig,
+        ) -> Device | None:
+            async with semaphore:
+                attempt = ConnectAttempt(*key)
+                start = time.monotonic()
+                try:
+                    _LOGGER.debug("Trying to connect with %s", prot.__class__.__name__)
+                    dev = await _connect(config, prot)
+                except Exception as ex:
+                    _LOGGER.debug(
+                        "Unable to connect with %s: %s",
+                        prot.__class__.__name__,
+                        ex,
+                    )
+                    if attempt_times is not None:
+                        attempt_times[attempt] = time.monotonic() - start
+                    if on_attempt:
+                        on_attempt(attempt, False)
+                    return None
+                else:
+                    if attempt_times is not None:
+                        attempt_times[attempt] = time.monotonic() - start
+                    if on_attempt:
+                        on_attempt(attempt, True)
+                    _LOGGER.debug("Found working protocol %s", prot.__class__.__name__)
+                    return dev
+                finally:
+                    await prot.close()
+
+        tasks = [
+            asyncio.create_task(_attempt(key, prot, config))
+            for key, (prot, config) in attempts
+        ]
+        try:
+            for next_done in asyncio.as_completed(tasks):
+                if dev := await next_done:
+                    return dev
+        finally:
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
         return None
 
+    @staticmethod
+    async def _probe_ports(host: str, ports: Iterable[int]) -> set[int]:
+        """Return the ports accepting tcp connections on the host."""
+
+        async def _probe(port: int) -> int | None:
+            try:
+                async with asyncio_timeout(Discover.PORT_PROBE_TIMEOUT):
+                    _, writer = await asyncio.open_connection(host, port)
+            except OSError:  # includes timeouts
+                return None
+            writer.close()
+            with contextlib.suppress(OSError):
+                await writer.wait_closed()
+            return port
+
+        results = await asyncio.gather(*(_probe(port) for port in ports))
+        return {port for port in results if port is not None}
+
     @staticmethod
     def _get_device_class(info: dict) -> type[Device]:
         """Find SmartDevice subclass for device described by passed data."""
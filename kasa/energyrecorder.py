@@ -0,0 +1,341 @@
+"""Record the energy readings of devices into compact time series.
+
+:class:`EnergyRecorder` samples the current power, voltage and current
+reported by the energy module of each device and keeps them in fixed size
+ring buffers made of :mod:`array` columns.
+Sampling only reads the values cached by the last update,
+so it combines with :meth:`Fleet.poll() <kasa.Fleet.poll>` to record
+the devices at a fixed cadence::
+
+    recorder = EnergyRecorder(fleet.devices, capacity=8640, path="energy")
+    await fleet.poll(10, on_cycle=recorder.record_cycle)
+
+If a *path* is given, the samples are also appended to a file per device
+in blocks of columns, which can be read back with :func:`load_series`.
+Errors writing a block are logged and its samples are written with the next
+block while they are still buffered.
+Range queries and downsampling are available on the returned
+:class:`EnergySeries`::
+
+    series = recorder.query(device, start=time.time() - 3600)
+    per_minute = series.downsample(60)
+"""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+import math
+import struct
+import sys
+import time
+from array import array
+from bisect import bisect_left
+from collections.abc import Iterable, Iterator
+from dataclasses import dataclass, field
+from pathlib import Path
+
+from .device import Device
+from .fleet import FleetCycle
+from .module import Module
+
+_LOGGER = logging.getLogger(__name__)
+
+_BLOCK_HEADER = struct.Struct("<I")
+_FILE_SUFFIX = ".energy"
+
+
+def _column(typecode: str, values: Iterable[float] = ()) -> array:
+    return array(typecode, values)
+
+
+@dataclass
+class EnergySeries:
+    """Energy samples of a single device ordered by time.
+
+    Missing readings are stored as NaN.
+    """
+
+    #: Wall-clock timestamps of the samples
+    timestamps: array = field(default_factory=lambda: _column("d"))
+    #: Current consumption in W
+    power: array = field(default_factory=lambda: _column("f"))
+    #: Voltage in V
+    voltage: array = field(default_factory=lambda: _column("f"))
+    #: Current in A
+    current: array = field(default_factory=lambda: _column("f"))
+
+    def __len__(self) -> int:
+        return len(self.timestamps)
+
+    def _columns(self) -> tuple[array, array, array, array]:
+        return self.timestamps, self.power, self.voltage, self.current
+
+    def extend(self, other: EnergySeries) -> None:
+        """Append the samples of another series."""
+        for column, values in zip(self._columns(), other._columns(), strict=True):
+            column.extend(values)
+
+    def between(
+        self, start: float | None = None, end: float | None = None
+    ) -> EnergySeries:
+        """Return the samples taken from *start* up to, excluding, *end*."""
+        first = 0 if start is None else bisect_left(self.timestamps, start)
+        last = len(self) if end is None else bisect_left(self.timestamps, end)
+        return EnergySeries(*(column[first:last] for column in self._columns()))
+
+    def downsample(self, step: float) -> EnergySeries:
+        """Return the mean of the samples in buckets of *step* seconds.
+
+        The buckets are aligned to multiples of *step* and the timestamp
+        of each returned sample is the start of its bucket.
+        """
+        if step <= 0:
+            raise ValueError(f"Step must be positive, got {step}")
+        result = EnergySeries()
+        first = 0
+        while first < len(self):
+            bucket = math.floor(self.timestamps[first] / step) * step
+            last = bisect_left(self.timestamps, bucket + step, first)
+            result.timestamps.append(bucket)
+            for column, values in zip(
+                result._columns()[1:], self._columns()[1:], strict=True
+            ):
+                column.append(_mean(values[first:last]))
+            first = last
+        return result
+
+
+def _mean(values: array) -> float:
+    """Return the mean of the values ignoring NaN."""
+    total = 0.0
+    count = 0
+    for value in values:
+        if not math.isnan(value):
+            total += value
+            count += 1
+    return total / count if count else math.nan
+
+
+def _value(value: float | None) -> float:
+    return math.nan if value is None else value
+
+
+class _RingBuffer:
+    """Fixed size columns of samples overwriting the oldest sample."""
+
+    def __init__(self, capacity: int) -> None:
+        self.capacity = capacity
+        self.timestamps = _column("d", [0.0]) * capacity
+        self.power = _column("f", [0.0]) * capacity
+        self.voltage = _column("f", [0.0]) * capacity
+        self.current = _column("f", [0.0]) * capacity
+        self.start = 0
+        self.size = 0
+
+    def append(
+        self, timestamp: float, power: float, voltage: float, current: float
+    ) -> None:
+        index = (self.start + self.size) % self.capacity
+        self.timestamps[index] = timestamp
+        self.power[index] = power
+        self.voltage[index] = voltage
+        self.current[index] = current
+        if self.size < self.capacity:
+            self.size += 1
+        else:
+            self.start = (self.start + 1) % self.capacity
+
+    def series(self, last: int | None = None) -> EnergySeries:
+        """Return the buffered or the *last* samples in time order."""
+        count = self.size if last is None else min(last, self.size)
+        first = (self.start + self.size - count) % self.capacity
+        end = first + count
+        columns = (self.timestamps, self.power, self.voltage, self.current)
+        if end <= self.capacity:
+            return EnergySeries(*(column[first:end] for column in columns))
+        end -= self.capacity
+        return EnergySeries(*(column[first:] + column[:end] for column in columns))
+
+
+def _write_block(path: Path, series: EnergySeries) -> None:
+    """Append the series to the file as a block of columns."""
+    with path.open("ab") as file:
+        file.write(_BLOCK_HEADER.pack(len(series)))
+        for column in series._columns():
+            if sys.byteorder == "big":  # pragma: no cover
+                column = array(column.typecode, column)
+                column.byteswap()
+            file.write(column.tobytes())
+
+
+def load_series(path: str | Path) -> EnergySeries:
+    """Load the samples written by an :class:`EnergyRecorder` to a file."""
+    series = EnergySeries()
+    data = Path(path).read_bytes()
+    offset = 0
+    while offset < len(data):
+        (count,) = _BLOCK_HEADER.unpack_from(data, offset)
+        offset += _BLOCK_HEADER.size
+        for column in series._columns():
+            size = count * column.itemsize
+            values = array(column.typecode, data[offset : offset + size])
+            if sys.byteorder == "big":  # pragma: no cover
+                values.byteswap()
+            column.extend(values)
+            offset += size
+    return series
+
+
+class EnergyRecorder:
+    """Record the energy readings of devices in memory and on disk."""
+
+    DEFAULT_CAPACITY = 3600
+    DEFAULT_BLOCK_SIZE = 256
+
+    def __init__(
+        self,
+        devices: Iterable[Device] = (),
+        *,
+        capacity: int = DEFAULT_CAPACITY,
+        path: str | Path | None = None,
+        block_size: int | None = None,
+    ) -> None:
+        """Create a new recorder.
+
+        :param devices: Devices to record, devices without an energy module
+            are ignored when recording
+        :param capacity: Number of samples kept in memory per device
+        :param path: Optional directory to append the samples to,
+            one file per device id
+        :param block_size: Number of samples written to the file at once,
+            defaults to :attr:`DEFAULT_BLOCK_SIZE` or the capacity if smaller
+        """
+        if capacity < 1:
+            raise ValueError(f"Capacity must be at least 1, got {capacity}")
+        if block_size is None:
+            block_size = min(self.DEFAULT_BLOCK_SIZE, capacity)
+        if not 1 <= block_size <= capacity:
+            raise ValueError(
+                f"Block size must be between 1 and the capacity, got {block_size}"
+            )
+        self._devices: dict[str, Device] = {}
+        self._buffers: dict[str, _RingBuffer] = {}
+        self._unwritten: dict[str, int] = {}
+        self._capacity = capacity
+        self._block_size = block_size
+        self._path = Path(path) if path is not None else None
+        if self._path is not None:
+            self._path.mkdir(parents=True, exist_ok=True)
+        for device in devices:
+            self.add(device)
+
+    def add(self, device: Device) -> None:
+        """Add a device to record, replacing any device with the same id."""
+        self._devices[device.device_id] = device
+
+    async def remove(self, device: Device) -> None:
+        """Stop recording the device and write its pending samples."""
+        if self._devices.pop(device.device_id, None) is not None:
+            await self._write(device.device_id)
+
+    @property
+    def devices(self) -> list[Device]:
+        """Return the recorded devices."""
+        return list(self._devices.values())
+
+    def __len__(self) -> int:
+        return len(self._devices)
+
+    def __iter__(self) -> Iterator[Device]:
+        return iter(self.devices)
+
+    def file_path(self, device: Device | str) -> Path | None:
+        """Return the file the samples of the device are written to."""
+        if self._path is None:
+            return None
+        device_id = device if isinstance(device, str) else device.device_id
+        return self._path / f"{device_id}{_FILE_SUFFIX}"
+
+    async def record(
+        self, devices: Iterable[Device] | None = None, timestamp: float | None = None
+    ) -> int:
+        """Sample the cached readings of the devices and return the sample count.
+
+        :param devices: Devices to sample, defaults to all recorded devices
+        :param timestamp: Timestamp of the samples, defaults to the current time
+        """
+        if timestamp is None:
+            timestamp = time.time()
+        recorded = 0
+        full: list[str] = []
+        for device in self._devices.values() if devices is None else devices:
+            if (energy := device.modules.get(Module.Energy)) is None:
+                continue
+            device_id = device.device_id
+            if (buffer := self._buffers.get(device_id)) is None:
+                buffer = self._buffers[device_id] = _RingBuffer(self._capacity)
+            buffer.append(
+                timestamp,
+                _value(energy.current_consumption),
+                _value(energy.voltage),
+                _value(energy.current),
+            )
+            recorded += 1
+            if self._path is not None:
+                self._unwritten[device_id] = self._unwritten.get(device_id, 0) + 1
+                if self._unwritten[device_id] >= self._block_size:
+                    full.append(device_id)
+        for device_id in full:
+            await self._write(device_id)
+        return recorded
+
+    async def record_cycle(self, cycle: FleetCycle) -> None:
+        """Sample the devices updated successfully in a fleet cycle."""
+        await self.record(
+            (
+                result.device
+                for result in cycle.results
+                if result.success and result.device.device_id in self._devices
+            ),
+            timestamp=cycle.started_at,
+        )
+
+    async def _write(self, device_id: str) -> None:
+        count = self._unwritten.pop(device_id, 0)
+        if count and (path := self.file_path(device_id)):
+            series = self._buffers[device_id].series(count)
+            loop = asyncio.get_running_loop()
+            try:
+                await loop.run_in_executor(None, _write_block, path, series)
+            except OSError as ex:
+                _LOGGER.warning("Unable to write energy samples to %s: %s", path, ex)
+                # Retry with the next block as long as the samples are buffered
+                self._unwritten[device_id] = min(
+                    self._capacity, count + self._unwritten.get(device_id, 0)
+                )
+
+    async def flush(self) -> None:
+        """Write the pending samples of all devices to their files."""
+        for device_id in list(self._unwritten):
+            await self._write(device_id)
+
+    def query(
+        self,
+        device: Device | str,
+        start: float | None = None,
+        end: float | None = None,
+        step: float | None = None,
+    ) -> EnergySeries:
+        """Return the samples of the device kept in memory.
+
+        :param device: The device or its device id
+        :param start: Timestamp of the first sample to return
+        :param end: Timestamp to return the samples before
+        :param step: Optional seconds to downsample the samples to
+        """
+        device_id = device if isinstance(device, str) else device.device_id
+        if (buffer := self._buffers.get(device_id)) is None:
+            return EnergySeries()
+        series = buffer.series().between(start, end)
+        return series.downsample(step) if step else series
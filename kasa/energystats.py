@@ -0,0 +1,204 @@
+"""Collect the historical energy statistics of many devices at once.
+
+:func:`get_energy_stats` queries the daily or monthly statistics of the
+energy module of each device concurrently and returns them as a single
+:class:`EnergyStats` table made of :mod:`array` columns
+with the energy normalized to kWh::
+
+    stats = await get_energy_stats(fleet.devices, years=[2024], months=range(1, 13))
+    for device_id, error in stats.errors.items():
+        print(f"{device_id} failed: {error}")
+
+    rollup = stats.rollup(percentiles=(50, 95))
+    for year, month, day, total, median in zip(
+        rollup.year, rollup.month, rollup.day, rollup.total, rollup.percentiles[50]
+    ):
+        print(f"{year}-{month:02}-{day:02}: {total:.2f} kWh, median {median:.2f}")
+
+Without *months* the monthly statistics of the *years* are returned
+and the ``day`` column is 0.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import math
+from array import array
+from collections.abc import Iterable, Sequence
+from dataclasses import dataclass, field
+from datetime import datetime
+
+from .device import Device
+from .interfaces.energy import Energy
+from .module import Module
+
+
+@dataclass
+class EnergyStats:
+    """Energy statistics of several devices, one row per device and period."""
+
+    #: Device id of each row
+    device_id: list[str] = field(default_factory=list)
+    #: Year of each row
+    year: array = field(default_factory=lambda: array("H"))
+    #: Month of each row
+    month: array = field(default_factory=lambda: array("B"))
+    #: Day of each row, 0 for monthly statistics
+    day: array = field(default_factory=lambda: array("B"))
+    #: Energy in kWh
+    energy: array = field(default_factory=lambda: array("d"))
+    #: Exceptions raised while querying the devices by device id
+    errors: dict[str, BaseException] = field(default_factory=dict)
+
+    def __len__(self) -> int:
+        return len(self.energy)
+
+    def _append(
+        self, device_id: str, year: int, month: int, day: int, energy: float
+    ) -> None:
+        self.device_id.append(device_id)
+        self.year.append(year)
+        self.month.append(month)
+        self.day.append(day)
+        self.energy.append(energy)
+
+    def totals(self) -> dict[str, float]:
+        """Return the total energy in kWh of each device."""
+        totals: dict[str, float] = dict.fromkeys(self.device_id, 0.0)
+        for device_id, energy in zip(self.device_id, self.energy, strict=True):
+            totals[device_id] += energy
+        return totals
+
+    def rollup(self, percentiles: Iterable[float] = (50,)) -> EnergyRollup:
+        """Return the sum and the percentiles over the devices per period.
+
+        The percentiles are linearly interpolated between the closest values
+        like :func:`numpy.percentile` does by default.
+        """
+        percentiles = list(percentiles)
+        for q in percentiles:
+            if not 0 <= q <= 100:
+                raise ValueError(f"Percentile must be between 0 and 100, got {q}")
+        periods: dict[tuple[int, int, int], list[float]] = {}
+        for period, energy in zip(
+            zip(self.year, self.month, self.day, strict=True), self.energy, strict=True
+        ):
+            periods.setdefault(period, []).append(energy)
+
+        rollup = EnergyRollup(percentiles={q: array("d") for q in percentiles})
+        for (year, month, day), values in sorted(periods.items()):
+            values.sort()
+            rollup.year.append(year)
+            rollup.month.append(month)
+            rollup.day.append(day)
+            rollup.devices.append(len(values))
+            rollup.total.append(math.fsum(values))
+            for q, column in rollup.percentiles.items():
+                column.append(_percentile(values, q))
+        return rollup
+
+
+@dataclass
+class EnergyRollup:
+    """Energy statistics summed over the devices, one row per period."""
+
+    #: Year of each row
+    year: array = field(default_factory=lambda: array("H"))
+    #: Month of each row
+    month: array = field(default_factory=lambda: array("B"))
+    #: Day of each row, 0 for monthly statistics
+    day: array = field(default_factory=lambda: array("B"))
+    #: Number of devices reporting the period
+    devices: array = field(default_factory=lambda: array("I"))
+    #: Sum of the energy of the devices in kWh
+    total: array = field(default_factory=lambda: array("d"))
+    #: Energy in kWh at each requested percentile over the devices
+    percentiles: dict[float, array] = field(default_factory=dict)
+
+    def __len__(self) -> int:
+        return len(self.total)
+
+
+def _percentile(values: Sequence[float], q: float) -> float:
+    """Return the q-th percentile of sorted values."""
+    position = (len(values) - 1) * q / 100
+    lower = math.floor(position)
+    upper = min(lower + 1, len(values) - 1)
+    return values[lower] + (values[upper] - values[lower]) * (position - lower)
+
+
+async def _get_device_stats(
+    device: Device,
+    energy: Energy,
+    periods: list[tuple[int, int | None]],
+    semaphore: asyncio.Semaphore,
+) -> EnergyStats:
+    stats = EnergyStats()
+    for year, month in periods:
+        async with semaphore:
+            try:
+                if month is None:
+                    data = await energy.get_monthly_stats(year=year, kwh=True)
+                else:
+                    data = await energy.get_daily_stats(
+                        year=year, month=month, kwh=True
+                    )
+            except Exception as ex:
+                stats.errors[device.device_id] = ex
+                break
+        for key, value in sorted(data.items()):
+            if month is None:
+                stats._append(device.device_id, year, key, 0, value)
+            else:
+                stats._append(device.device_id, year, month, key, value)
+    return stats
+
+
+async def get_energy_stats(
+    devices: Iterable[Device],
+    *,
+    years: Iterable[int] | None = None,
+    months: Iterable[int] | None = None,
+    concurrency: int = 10,
+) -> EnergyStats:
+    """Query the energy statistics of the devices concurrently.
+
+    Devices without an energy module supporting periodic statistics are skipped.
+    Devices failing a query are listed in :attr:`EnergyStats.errors`
+    with the rows of their earlier queries kept.
+
+    :param devices: Devices to query
+    :param years: Years to query, defaults to the current year
+    :param months: Months of each year to query the daily statistics of,
+        the monthly statistics are queried if not given
+    :param concurrency: Maximum number of queries running at once
+    """
+    if concurrency < 1:
+        raise ValueError(f"Concurrency must be at least 1, got {concurrency}")
+    years = [datetime.now().year] if years is None else list(years)
+    periods: list[tuple[int, int | None]]
+    if months is None:
+        periods = [(year, None) for year in years]
+    else:
+        months = list(months)
+        periods = [(year, month) for year in years for month in months]
+
+    semaphore = asyncio.Semaphore(concurrency)
+    device_stats = await asyncio.gather(
+        *(
+            _get_device_stats(device, energy, periods, semaphore)
+            for device in devices
+            if (energy := device.modules.get(Module.Energy)) is not None
+            and energy.supports(Energy.ModuleFeature.PERIODIC_STATS)
+        )
+    )
+
+    stats = EnergyStats()
+    for result in device_stats:
+        stats.device_id.extend(result.device_id)
+        stats.year.extend(result.year)
+        stats.month.extend(result.month)
+        stats.day.extend(result.day)
+        stats.energy.extend(result.energy)
+        stats.errors.update(result.errors)
+    return stats
@@ -69,9 +69,8 @@ from __future__ import annotations
 
 import logging
 from collections.abc import Callable, Coroutine
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 from enum import Enum, auto
-from functools import cached_property
 from typing import TYPE_CHECKING, Any
 
 if TYPE_CHECKING:
@@ -80,10 +79,15 @@ if TYPE_CHECKING:
 
 _LOGGER = logging.getLogger(__name__)
 
+_UNSET: Any = object()
 
-@dataclass
+
+@dataclass(slots=True)
 class Feature:
-    """Feature defines a generic interface for device features."""
+    """Feature defines a generic interface for device features.
+
+    The features are slotted as every device creates dozens of them.
+    """
 
     class Type(Enum):
         """Type to help decide how to present the feature."""
@@ -164,6 +168,11 @@ class Feature:
     #: If set, this property will be used to get *choices*.
     choices_getter: str | Callable[[], list[str]] | None = None
 
+    _container: Device | Module = field(init=False, repr=False, compare=False)
+    _range: tuple[int, int] | None = field(
+        default=_UNSET, init=False, repr=False, compare=False
+    )
+
     def __post_init__(self) -> None:
         """Handle late-binding of members."""
         # Populate minimum & maximum values, if range_getter is given
@@ -209,10 +218,12 @@ class Feature:
         """Unit if applicable."""
         return self._get_property_value(self.unit_getter)
 
-    @cached_property
+    @property
     def range(self) -> tuple[int, int] | None:
         """Range of values if applicable."""
-        return self._get_property_value(self.range_getter)
+        if self._range is _UNSET:
+            self._range = self._get_property_value(self.range_getter)
+        return self._range
 
     @property
     def maximum_value(self) -> int:
@@ -325,3 +336,18 @@ class Feature:
             s += f" (range: {self.minimum_value}-{self.maximum_value})"
 
         return s
+
+
+@dataclass(slots=True)
+class FeatureChange:
+    """Change of a feature value detected by an update."""
+
+    #: The changed feature
+    feature: Feature
+    #: Value before the update, None if the feature had no previous value
+    old_value: Any
+    #: Value after the update
+    new_value: Any
+
+
+FeatureChangeCallable = Callable[[FeatureChange], Coroutine[Any, Any, None] | None]
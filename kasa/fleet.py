@@ -0,0 +1,280 @@
+"""Poll a large number of devices with bounded parallelism.
+
+:class:`Fleet` owns a collection of :class:`~kasa.Device` objects and runs
+:meth:`~kasa.Device.update` on all of them in update cycles.
+Each cycle limits the number of concurrently running updates,
+optionally spreads the start of the updates over a jitter window,
+enforces a per-device deadline and rate limits the updates per device family::
+
+    fleet = Fleet(devices, concurrency=50, jitter=2, deadline=10)
+    cycle = await fleet.update()
+    print(f"{cycle.succeeded}/{len(cycle.results)} took {cycle.duration:.2f}s")
+    for result in cycle.failures:
+        print(f"{result.host} failed: {result.error}")
+
+For continuous polling use :meth:`Fleet.poll`, which starts a new cycle
+every *interval* seconds until cancelled.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+import random
+import time
+from collections.abc import Callable, Coroutine, Iterable, Iterator, Mapping
+from dataclasses import dataclass, field
+from typing import Any
+
+from .device import Device
+from .deviceconfig import DeviceFamily
+
+_LOGGER = logging.getLogger(__name__)
+
+OnCycleCallable = Callable[["FleetCycle"], Coroutine[Any, Any, None] | None]
+
+
+@dataclass
+class FleetUpdateResult:
+    """Result of updating a single device in a cycle."""
+
+    #: Host of the updated device
+    host: str
+    #: The updated device
+    device: Device
+    #: Seconds spent in the update, excluding the jitter and queue time
+    duration: float
+    #: Exception raised by the update, None if successful
+    error: BaseException | None = None
+
+    @property
+    def success(self) -> bool:
+        """Return True if the device was updated successfully."""
+        return self.error is None
+
+
+@dataclass
+class FleetCycle:
+    """Summary of a single fleet update cycle."""
+
+    #: Wall-clock timestamp of the start of the cycle
+    started_at: float
+    #: Seconds taken by the whole cycle
+    duration: float = 0.0
+    #: Results for each updated device in completion order
+    results: list[FleetUpdateResult] = field(default_factory=list)
+
+    @property
+    def succeeded(self) -> int:
+        """Return the number of successfully updated devices."""
+        return sum(1 for result in self.results if result.success)
+
+    @property
+    def failures(self) -> list[FleetUpdateResult]:
+        """Return the results for devices that failed to update."""
+        return [result for result in self.results if not result.success]
+
+    @property
+    def latencies(self) -> list[float]:
+        """Return update durations of the successful updates."""
+        return [result.duration for result in self.results if result.success]
+
+    @property
+    def max_latency(self) -> float | None:
+        """Return the slowest successful update duration."""
+        return max(latencies) if (latencies := self.latencies) else None
+
+    @property
+    def mean_latency(self) -> float | None:
+        """Return the mean successful update duration."""
+        if not (latencies := self.latencies):
+            return None
+        return sum(latencies) / len(latencies)
+
+
+class _RateLimiter:
+    """Space out acquisitions to at most *rate* per second."""
+
+    def __init__(self, rate: float) -> None:
+        if rate <= 0:
+            raise ValueError(f"Rate limit must be positive, got {rate}")
+        self._interval = 1 / rate
+        self._next_slot = 0.0
+        self._lock = asyncio.Lock()
+
+    async def acquire(self) -> None:
+        async with self._lock:
+            now = time.monotonic()
+            if (wait := self._next_slot - now) > 0:
+                await asyncio.sleep(wait)
+                now = self._next_slot
+            self._next_slot = now + self._interval
+
+
+class Fleet:
+    """Update many devices concurrently with bounded parallelism."""
+
+    DEFAULT_CONCURRENCY = 20
+
+    def __init__(
+        self,
+        devices: Iterable[Device] = (),
+        *,
+        concurrency: int = DEFAULT_CONCURRENCY,
+        jitter: float = 0.0,
+        deadline: float | None = None,
+        family_rate_limits: Mapping[DeviceFamily, float] | None = None,
+    ) -> None:
+        """Create a new fleet.
+
+        :param devices: Devices owned by the fleet
+        :param concurrency: Maximum number of devices updating at the same time
+        :param jitter: Maximum random delay in seconds before each device update,
+            used to spread the load over a polling window
+        :param deadline: Maximum seconds a single device update may take
+        :param family_rate_limits: Maximum device updates started per second
+            for the given device families
+        """
+        if concurrency < 1:
+            raise ValueError(f"Concurrency must be at least 1, got {concurrency}")
+        if jitter < 0:
+            raise ValueError(f"Jitter must not be negative, got {jitter}")
+        self._devices: dict[str, Device] = {}
+        self._concurrency = concurrency
+        self._jitter = jitter
+        self._deadline = deadline
+        self._family_rate_limits = dict(family_rate_limits or {})
+        self._rate_limiters: dict[DeviceFamily, _RateLimiter] = {}
+        self._last_cycle: FleetCycle | None = None
+        for device in devices:
+            self.add(device)
+
+    def add(self, device: Device) -> None:
+        """Add a device to the fleet, replacing any device with the same host."""
+        self._devices[device.host] = device
+
+    def remove(self, device_or_host: Device | str) -> Device | None:
+        """Remove a device from the fleet and return it."""
+        host = (
+            device_or_host.host
+            if isinstance(device_or_host, Device)
+            else device_or_host
+        )
+        return self._devices.pop(host, None)
+
+    @property
+    def devices(self) -> list[Device]:
+        """Return the devices owned by the fleet."""
+        return list(self._devices.values())
+
+    def get(self, host: str) -> Device | None:
+        """Return the device for the given host."""
+        return self._devices.get(host)
+
+    @property
+    def last_cycle(self) -> FleetCycle | None:
+        """Return the summary of the last completed update cycle."""
+        return self._last_cycle
+
+    def __len__(self) -> int:
+        return len(self._devices)
+
+    def __iter__(self) -> Iterator[Device]:
+        return iter(self.devices)
+
+    def __contains__(self, device_or_host: object) -> bool:
+        if isinstance(device_or_host, Device):
+            return self._devices.get(device_or_host.host) is device_or_host
+        return device_or_host in self._devices
+
+    def _get_rate_limiter(self, device: Device) -> _RateLimiter | None:
+        family = device.config.connection_type.device_family
+        if (rate := self._family_rate_limits.get(family)) is None:
+            return None
+        if (limiter := self._rate_limiters.get(family)) is None:
+            limiter = self._rate_limiters[family] = _RateLimiter(rate)
+        return limiter
+
+    async def _update_device(
+        self,
+        device: Device,
+        semaphore: asyncio.Semaphore,
+        update_children: bool,
+    ) -> FleetUpdateResult:
+        if self._jitter:
+            await asyncio.sleep(random.uniform(0, self._jitter))  # noqa: S311
+        # Wait for the family rate limit before taking a slot so that a
+        # limited family does not hold the slots needed by the others
+        if limiter := self._get_rate_limiter(device):
+            await limiter.acquire()
+        async with semaphore:
+            start = time.monotonic()
+            try:
+                async with asyncio.timeout(self._deadline):
+                    await device.update(update_children=update_children)
+            except Exception as ex:
+                _LOGGER.debug("Unable to update %s: %s", device.host, ex)
+                return FleetUpdateResult(
+                    device.host, device, time.monotonic() - start, ex
+                )
+            return FleetUpdateResult(device.host, device, time.monotonic() - start)
+
+    async def update(self, update_children: bool = True) -> FleetCycle:
+        """Run a single update cycle over all devices.
+
+        Errors raised by individual devices are reported in the returned
+        :class:`FleetCycle` rather than raised.
+        """
+        cycle = FleetCycle(started_at=time.time())
+        start = time.monotonic()
+        semaphore = asyncio.Semaphore(self._concurrency)
+        tasks = [
+            asyncio.create_task(self._update_device(device, semaphore, update_children))
+            for device in self._devices.values()
+        ]
+        try:
+            for task in asyncio.as_completed(tasks):
+                cycle.results.append(await task)
+        except BaseException:
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+            raise
+        cycle.duration = time.monotonic() - start
+        _LOGGER.debug(
+            "Fleet cycle updated %s/%s devices in %.3f seconds",
+            cycle.succeeded,
+            len(cycle.results),
+            cycle.duration,
+        )
+        self._last_cycle = cycle
+        return cycle
+
+    async def poll(
+        self,
+        interval: float,
+        *,
+        on_cycle: OnCycleCallable | None = None,
+        update_children: bool = True,
+    ) -> None:
+        """Run update cycles every *interval* seconds until cancelled.
+
+        If a cycle takes longer than the interval the next cycle
+        is started immediately.
+
+        :param interval: Seconds between the start of consecutive cycles
+        :param on_cycle: Optional callback or coroutine called after each cycle
+        """
+        while True:
+            start = time.monotonic()
+            cycle = await self.update(update_children=update_children)
+            if on_cycle and (coro := on_cycle(cycle)) is not None:
+                await coro
+            await asyncio.sleep(max(0.0, interval - (time.monotonic() - start)))
+
+    async def disconnect(self) -> None:
+        """Disconnect all devices in the fleet."""
+        await asyncio.gather(
+            *(device.disconnect() for device in self._devices.values()),
+            return_exceptions=True,
+        )
@@ -6,7 +6,9 @@ import asyncio
 import logging
 import ssl
 import time
+from http.cookies import SimpleCookie
 from typing import Any
+from weakref import WeakKeyDictionary
 
 import aiohttp
 from yarl import URL
@@ -22,9 +24,93 @@ from .json import loads as json_loads
 _LOGGER = logging.getLogger(__name__)
 
 
-def get_cookie_jar() -> aiohttp.CookieJar:
-    """Return a new cookie jar with the correct options for device communication."""
-    return aiohttp.CookieJar(unsafe=True, quote_cookie=False)
+class HttpConnectionPool:
+    """Library managed connection pool shared by all http clients.
+
+    A single connector per event loop is shared by every :class:`HttpClient`
+    that has not been given a custom ``http_client`` in its :class:`DeviceConfig`.
+    This avoids creating a connector, DNS cache and cookie jar for each device.
+    The session does not store cookies, they are kept per device by the clients.
+    The pooled session is closed once the last client using it is closed.
+    """
+
+    #: Maximum number of connections, 0 for no limit
+    DEFAULT_LIMIT = 0
+    #: Maximum number of connections per device
+    DEFAULT_LIMIT_PER_HOST = 4
+    #: Seconds to keep idle connections alive
+    DEFAULT_IDLE_TTL = 15.0
+
+    def __init__(
+        self,
+        *,
+        limit: int = DEFAULT_LIMIT,
+        limit_per_host: int = DEFAULT_LIMIT_PER_HOST,
+        idle_ttl: float = DEFAULT_IDLE_TTL,
+    ) -> None:
+        self._limit = limit
+        self._limit_per_host = limit_per_host
+        self._idle_ttl = idle_ttl
+        self._sessions: WeakKeyDictionary[
+            asyncio.AbstractEventLoop, tuple[aiohttp.ClientSession, int]
+        ] = WeakKeyDictionary()
+
+    def _create_session(self) -> aiohttp.ClientSession:
+        connector = aiohttp.TCPConnector(
+            limit=self._limit,
+            limit_per_host=self._limit_per_host,
+            keepalive_timeout=self._idle_ttl,
+        )
+        return aiohttp.ClientSession(
+            connector=connector, cookie_jar=aiohttp.DummyCookieJar()
+        )
+
+    def acquire(self) -> aiohttp.ClientSession:
+        """Return the pooled session for the running loop and add a reference."""
+        loop = asyncio.get_running_loop()
+        session, users = self._sessions.get(loop, (None, 0))
+        if session is None or session.closed:
+            session, users = self._create_session(), 0
+        self._sessions[loop] = (session, users + 1)
+        return session
+
+    def _discard(self, session: aiohttp.ClientSession) -> bool:
+        """Remove a reference and return whether the session is no longer used."""
+        for loop, (pooled, users) in list(self._sessions.items()):
+            if pooled is not session:
+                continue
+            if users > 1:
+                self._sessions[loop] = (pooled, users - 1)
+                return False
+            del self._sessions[loop]
+            break
+        return True
+
+    async def release(self, session: aiohttp.ClientSession) -> None:
+        """Remove a reference and close the session if no longer used."""
+        if self._discard(session):
+            await session.close()
+
+    async def close(self) -> None:
+        """Close all pooled sessions."""
+        sessions = [session for session, _ in self._sessions.values()]
+        self._sessions.clear()
+        for session in sessions:
+            await session.close()
+
+
+_CONNECTION_POOL = HttpConnectionPool()
+
+
+def get_connection_pool() -> HttpConnectionPool:
+    """Return the connection pool used by http clients."""
+    return _CONNECTION_POOL
+
+
+def set_connection_pool(pool: HttpConnectionPool) -> None:
+    """Set the connection pool used by newly connecting http clients."""
+    global _CONNECTION_POOL
+    _CONNECTION_POOL = pool
 
 
 class HttpClient:
@@ -38,30 +124,42 @@ class HttpClient:
     def __init__(self, config: DeviceConfig) -> None:
         self._config = config
         self._client_session: aiohttp.ClientSession | None = None
-        self._jar = aiohttp.CookieJar(unsafe=True, quote_cookie=False)
-        self._last_url = URL(f"http://{self._config.host}/")
+        self._pool: HttpConnectionPool | None = None
+        self._cookies: dict[str, str] = {}
 
         self._wait_between_requests = 0.0
         self._last_request_time = 0.0
 
+    @property
+    def _uses_custom_client(self) -> bool:
+        return bool(self._config.http_client) and issubclass(
+            self._config.http_client.__class__, aiohttp.ClientSession
+        )
+
     @property
     def client(self) -> aiohttp.ClientSession:
         """Return the underlying http client."""
-        if self._config.http_client and issubclass(
-            self._config.http_client.__class__, aiohttp.ClientSession
-        ):
-            return self._config.http_client
+        if self._uses_custom_client:
+            return self._config.http_client  # type: ignore[return-value]
 
-        if not self._client_session:
-            self._client_session = aiohttp.ClientSession(cookie_jar=get_cookie_jar())
+        if not self._client_session or self._client_session.closed:
+            if self._client_session and self._pool:
+                # Drop the reference to the closed session before acquiring anew
+                self._pool._discard(self._client_session)
+            self._pool = get_connection_pool()
+            self._client_session = self._pool.acquire()
         return self._client_session
 
+    def _store_cookies(self, cookies: SimpleCookie) -> None:
+        """Store the cookies returned by the device for this client only."""
+        self._cookies = {name: morsel.value for name, morsel in cookies.items()}
+
     async def post(
         self,
         url: URL,
         *,
         params: dict[str, Any] | None = None,
-        data: bytes | None = None,
+        data: bytes | bytearray | None = None,
         json: dict | Any | None = None,
         headers: dict[str, str] | None = None,
         cookies_dict: dict[str, str] | None = None,
@@ -87,8 +185,10 @@ class HttpClient:
 
         _LOGGER.debug("Posting to %s", url)
         response_data = None
-        self._last_url = url
-        self.client.cookie_jar.clear()
+        if self._uses_custom_client:
+            # Custom sessions store cookies so avoid sending them back.
+            # The pooled session does not store cookies at all.
+            self.client.cookie_jar.clear()
         return_json = bool(json)
         if self._config.timeout is None:
             _LOGGER.warning("Request timeout is set to None.")
@@ -114,6 +214,7 @@ class HttpClient:
             )
             async with resp:
                 response_data = await resp.read()
+            self._store_cookies(resp.cookies)
 
             if resp.status == 200:
                 if return_json:
@@ -162,16 +263,17 @@ class HttpClient:
         return resp.status, response_data
 
     def get_cookie(self, cookie_name: str) -> str | None:
-        """Return the cookie with cookie_name."""
-        if cookie := self.client.cookie_jar.filter_cookies(self._last_url).get(
-            cookie_name
-        ):
-            return cookie.value
-        return None
+        """Return the cookie with cookie_name from the last response."""
+        return self._cookies.get(cookie_name)
 
     async def close(self) -> None:
-        """Close the ClientSession."""
+        """Release the ClientSession."""
         client = self._client_session
+        pool = self._pool
         self._client_session = None
-        if client:
+        self._pool = None
+        self._cookies = {}
+        if client and pool:
+            await pool.release(client)
+        elif client:
             await client.close()
@@ -17,6 +17,7 @@ from __future__ import annotations
 import functools
 import inspect
 import logging
+import time
 from collections.abc import Callable, Mapping, Sequence
 from datetime import datetime, timedelta, tzinfo
 from typing import TYPE_CHECKING, Any, cast
@@ -304,6 +305,15 @@ class IotDevice(Device):
 
         Needed for properties that are decorated with `requires_update`.
         """
+        await self._update(update_children)
+        await self._notify_feature_changes()
+
+    async def _update(self, update_children: bool = True) -> None:
+        """Query the device to update the data.
+
+        Internal implementation which updates the data without notifying the
+        feature change subscribers.
+        """
         req = {}
         req.update(self._create_request("system", "get_sysinfo"))
 
@@ -315,6 +325,9 @@ class IotDevice(Device):
             response = await self.protocol.query(req)
             self._last_update = response
             self._set_sys_info(_extract_sys_info(response))
+            # Without previous data every module needs to be queried in full
+            for module in self._modules.values():
+                module._last_update_time = None
 
         if not self._modules:
             await self._initialize_modules()
@@ -398,18 +411,26 @@ class IotDevice(Device):
         """Execute an update query."""
         request_list = []
         est_response_size = 1024 if "system" in req else 0
+        update_time = time.monotonic()
+        # Modules queried in full, the others only run their interval query
+        module_queries: list[IotModule] = []
         for module in self._modules.values():
             if not module.is_supported:
                 _LOGGER.debug("Module %s not supported, skipping", module)
                 continue
 
+            if module._should_update(update_time):
+                module_queries.append(module)
+                q = module.query()
+            elif not (q := module._interval_query()):
+                continue
+
             est_response_size += module.estimated_query_response_size
             if est_response_size > self.max_device_response_size:
                 request_list.append(req)
                 req = {}
                 est_response_size = module.estimated_query_response_size
 
-            q = module.query()
             _LOGGER.debug("Adding query for %s: %s", module, q)
             req = merge(req, q)
         request_list.append(req)
@@ -434,6 +455,8 @@ class IotDevice(Device):
                 if isinstance(v, dict):
                     update.setdefault(k, {}).update(**v)
         self._last_update = update
+        for module in module_queries:
+            module._last_update_time = update_time
 
         # IOT modules are added as default but could be unsupported post first update
         if self._supported_modules is None:
@@ -444,6 +467,17 @@ class IotDevice(Device):
 
             self._supported_modules = supported
 
+    @property
+    def _initialization_state(self) -> dict[str, Any]:
+        """Return the initialization responses to store in a registry."""
+        return {"system": {"get_sysinfo": self._sys_info}}
+
+    def _restore_initialization(self, responses: dict[str, Any]) -> None:
+        """Restore the initialization responses stored in a registry."""
+        super()._restore_initialization(responses)
+        self._last_update = dict(responses)
+        self._set_sys_info(_extract_sys_info(responses))
+
     def update_from_discover_info(self, info: dict[str, Any]) -> None:
         """Update state from info from the discover call."""
         self._discovery_info = info
@@ -6,7 +6,7 @@ import logging
 from typing import TYPE_CHECKING, Any
 
 from ..exceptions import KasaException
-from ..module import Module
+from ..module import Module, _memoized_data
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -32,8 +32,39 @@ class IotModule(Module):
 
     _device: IotDevice
 
+    #: Minimum seconds between the update queries of the module
+    MINIMUM_UPDATE_INTERVAL_SECS = 0
+
+    def __init__(self, device: IotDevice, module: str) -> None:
+        super().__init__(device, module)
+        self._last_update_time: float | None = None
+
+    @property
+    def update_interval(self) -> int:
+        """Time to wait between updates."""
+        return self.MINIMUM_UPDATE_INTERVAL_SECS
+
+    def _should_update(self, update_time: float) -> bool:
+        """Return true if module should update based on delay parameters."""
+        return (
+            not self.update_interval
+            or not self._last_update_time
+            or (update_time - self._last_update_time) >= self.update_interval
+        )
+
+    def _interval_query(self) -> dict:
+        """Query to execute on the updates between the full module queries.
+
+        Modules combining frequently changing and static data override this
+        to keep the frequently changing data up to date.
+        """
+        return {}
+
     async def call(self, method: str, params: dict | None = None) -> dict:
         """Call the given method with the given parameters."""
+        # Query the module on the next update after a value has been changed
+        if not method.startswith("get_"):
+            self._last_update_time = None
         return await self._device._query_helper(self._module, method, params)
 
     def query_for_command(self, query: str, params: dict | None = None) -> dict:
@@ -50,6 +81,7 @@ class IotModule(Module):
         return 256  # Estimate for modules that don't specify
 
     @property
+    @_memoized_data
     def data(self) -> dict[str, Any]:
         """Return the module specific raw data from the last update."""
         dev = self._device
@@ -5,7 +5,7 @@ from __future__ import annotations
 import logging
 from collections import defaultdict
 from datetime import datetime, timedelta
-from typing import TYPE_CHECKING, Any
+from typing import TYPE_CHECKING, Any, cast
 
 if TYPE_CHECKING:
     from datetime import tzinfo
@@ -135,13 +135,13 @@ class IotStrip(IotDevice):
         """Return if any of the outlets are on."""
         return any(plug.is_on for plug in self.children)
 
-    async def update(self, update_children: bool = True) -> None:
+    async def _update(self, update_children: bool = True) -> None:
         """Update some of the attributes.
 
         Needed for methods that are decorated with `requires_update`.
         """
         # Super initializes modules and features
-        await super().update(update_children)
+        await super()._update(update_children)
 
         initialize_children = not self.children
         # Initialize the child devices during the first update.
@@ -158,10 +158,9 @@ class IotStrip(IotDevice):
                 await child._initialize_modules()
 
         if update_children:
-            for plug in self.children:
-                if TYPE_CHECKING:
-                    assert isinstance(plug, IotStripPlug)
-                await plug._update()
+            await self._run_child_updates(
+                cast(IotStripPlug, plug)._update for plug in self.children
+            )
 
         if not self.features:
             await self._initialize_features()
@@ -385,13 +384,6 @@ class IotStripPlug(IotPlug):
             for module_feat in module._module_features.values():
                 self._add_feature(module_feat)
 
-    async def update(self, update_children: bool = True) -> None:
-        """Query the device to update the data.
-
-        Needed for properties that are decorated with `requires_update`.
-        """
-        await self._update(update_children)
-
     async def _update(self, update_children: bool = True) -> None:
         """Query the device to update the data.
 
@@ -8,3 +8,5 @@ class Antitheft(RuleModule):
 
     This shares the functionality among other rule-based modules.
     """
+
+    MINIMUM_UPDATE_INTERVAL_SECS = 60 * 60 * 24
@@ -5,3 +5,5 @@ from .rulemodule import RuleModule
 
 class Countdown(RuleModule):
     """Implementation of countdown module."""
+
+    MINIMUM_UPDATE_INTERVAL_SECS = 60
@@ -5,3 +5,5 @@ from .rulemodule import RuleModule
 
 class Schedule(RuleModule):
     """Implements the scheduling interface."""
+
+    MINIMUM_UPDATE_INTERVAL_SECS = 60 * 60 * 24
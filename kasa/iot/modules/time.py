@@ -22,6 +22,13 @@ class Time(IotModule, TimeInterface):
 
     _timezone: tzinfo = UTC
 
+    #: The timezone is queried daily
+    MINIMUM_UPDATE_INTERVAL_SECS = 60 * 60 * 24
+
+    def _interval_query(self) -> dict:
+        """Request the time between the timezone queries."""
+        return self.query_for_command("get_time")
+
     def query(self) -> dict:
         """Request time and timezone."""
         q = self.query_for_command("get_time")
@@ -10,6 +10,13 @@ from ..iotmodule import IotModule, merge
 class Usage(IotModule):
     """Baseclass for emeter/usage interfaces."""
 
+    #: The daily and monthly statistics are queried hourly
+    MINIMUM_UPDATE_INTERVAL_SECS = 60 * 60
+
+    def _interval_query(self) -> dict:
+        """Request the realtime data between the statistics queries."""
+        return self.query_for_command("get_realtime")
+
     def query(self) -> dict:
         """Return the base query."""
         now = datetime.now()
@@ -53,8 +53,10 @@ from __future__ import annotations
 
 import logging
 from abc import ABC, abstractmethod
-from collections.abc import Callable
-from functools import cache
+from collections.abc import Callable, Iterator
+from contextlib import contextmanager
+from contextvars import ContextVar
+from functools import cache, wraps
 from typing import (
     TYPE_CHECKING,
     Final,
@@ -77,6 +79,42 @@ _LOGGER = logging.getLogger(__name__)
 
 ModuleT = TypeVar("ModuleT", bound="Module")
 
+#: Data of the modules memoized while the feature values are read in one pass
+_module_data_cache: ContextVar[dict[Module, dict] | None] = ContextVar(
+    "_module_data_cache", default=None
+)
+
+
+@contextmanager
+def _memoize_module_data() -> Iterator[None]:
+    """Compute the data of each module only once within the context.
+
+    The modules' data is derived from the last update on every access,
+    so reading many features in one go would otherwise repeat the work.
+    """
+    if _module_data_cache.get() is not None:
+        yield
+        return
+    token = _module_data_cache.set({})
+    try:
+        yield
+    finally:
+        _module_data_cache.reset(token)
+
+
+def _memoized_data(data: Callable[[ModuleT], dict]) -> Callable[[ModuleT], dict]:
+    """Memoize the data of the module within :func:`_memoize_module_data`."""
+
+    @wraps(data)
+    def _data(module: ModuleT) -> dict:
+        if (memo := _module_data_cache.get()) is None:
+            return data(module)
+        if module not in memo:
+            memo[module] = data(module)
+        return memo[module]
+
+    return _data
+
 
 class FeatureAttribute:
     """Class for annotating attributes bound to feature."""
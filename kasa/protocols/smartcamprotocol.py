@@ -57,6 +57,16 @@ class SmartCamProtocol(SmartProtocol):
         module_name = next(iter(params))
         return {method: {module_name: {"start_index": start_index}}}
 
+    def _get_batch_size_store_key(self, response: dict) -> str | None:
+        if (
+            isinstance(info := response.get("getDeviceInfo"), dict)
+            and (basic_info := info.get("device_info", {}).get("basic_info"))
+            and (model := basic_info.get("device_model"))
+            and (sw_version := basic_info.get("sw_version"))
+        ):
+            return f"batch_size:{model}:{sw_version}"
+        return None
+
     def _handle_response_error_code(
         self, resp_dict: dict, method: str, raise_on_error: bool = True
     ) -> None:
@@ -163,7 +173,7 @@ class SmartCamProtocol(SmartProtocol):
                 self._host,
                 pf(smart_request),
             )
-        response_data = await self._transport.send(smart_request)
+        response_data = await self._send(smart_request)
 
         if debug_enabled:
             _LOGGER.debug(
@@ -12,9 +12,9 @@ import logging
 import re
 import time
 import uuid
-from collections.abc import Callable
+from collections.abc import Callable, Coroutine, Sequence
 from pprint import pformat as pf
-from typing import TYPE_CHECKING, Any
+from typing import TYPE_CHECKING, Any, TypeVar
 
 from ..exceptions import (
     SMART_AUTHENTICATION_ERRORS,
@@ -36,6 +36,9 @@ if TYPE_CHECKING:
 
 _LOGGER = logging.getLogger(__name__)
 
+_T = TypeVar("_T")
+_R = TypeVar("_R")
+
 
 def _mask_area_list(area_list: list[dict[str, Any]]) -> list[dict[str, Any]]:
     def mask_area(area: dict[str, Any]) -> dict[str, Any]:
@@ -103,6 +106,10 @@ class SmartProtocol(BaseProtocol):
 
     BACKOFF_SECONDS_AFTER_TIMEOUT = 1
     DEFAULT_MULTI_REQUEST_BATCH_SIZE = 5
+    #: Largest batch size probed when no batch size is configured
+    MAX_MULTI_REQUEST_BATCH_SIZE = 20
+    #: Number of successful queries before probing a larger batch size
+    MULTI_REQUEST_PROBE_AFTER = 3
 
     def __init__(
         self,
@@ -113,11 +120,34 @@ class SmartProtocol(BaseProtocol):
         super().__init__(transport=transport)
         self._terminal_uuid: str = base64.b64encode(md5(uuid.uuid4().bytes)).decode()
         self._query_lock = asyncio.Lock()
+        config = self._transport._config
         self._multi_request_batch_size = (
-            self._transport._config.batch_size or self.DEFAULT_MULTI_REQUEST_BATCH_SIZE
+            config.batch_size or self.DEFAULT_MULTI_REQUEST_BATCH_SIZE
+        )
+        self._adaptive_batch_size = bool(
+            config.adaptive_batch_size and not config.batch_size
+        )
+        self._multi_request_batch_limit = (
+            self.MAX_MULTI_REQUEST_BATCH_SIZE
+            if self._adaptive_batch_size
+            else self._multi_request_batch_size
         )
+        self._multi_request_successes = 0
+        self._multi_request_response_size: float | None = None
+        self._multi_request_failed_response_size: float | None = None
+        self._multi_request_batch_size_changed = False
+        self._batch_size_store_key: str | None = None
         self._redact_data = True
         self._method_missing_logged = False
+        self._concurrent_requests = self._transport._config.max_concurrent_requests or 1
+        self._request_semaphore: asyncio.Semaphore | None = (
+            asyncio.Semaphore(self._concurrent_requests)
+            if self._concurrent_requests > 1
+            else None
+        )
+        self._child_requests: list[tuple[dict, asyncio.Future[dict | None]]] = []
+        self._child_requests_tasks: set[asyncio.Task] = set()
+        self._batch_child_requests = True
 
     def get_smart_request(self, method: str, params: dict | None = None) -> str:
         """Get a request message as a string."""
@@ -133,7 +163,9 @@ class SmartProtocol(BaseProtocol):
     async def query(self, request: str | dict, retry_count: int = 3) -> dict:
         """Query the device retrying for retry_count on failure."""
         async with self._query_lock:
-            return await self._query(request, retry_count)
+            response = await self._query(request, retry_count)
+            await self._update_batch_size_store(response)
+            return response
 
     async def _query(self, request: str | dict, retry_count: int = 3) -> dict:
         for retry in range(retry_count + 1):
@@ -199,12 +231,147 @@ class SmartProtocol(BaseProtocol):
         # make mypy happy, this should never be reached..
         raise KasaException("Query reached somehow to unreachable")
 
+    async def _send(self, request: str) -> dict:
+        """Send the request limiting the number of requests in flight."""
+        if self._request_semaphore is None:
+            return await self._transport.send(request)
+        async with self._request_semaphore:
+            return await self._transport.send(request)
+
+    def _disable_concurrent_requests(self, ex: Exception) -> None:
+        if self._concurrent_requests == 1:
+            return
+        _LOGGER.debug(
+            "Device %s returned an error to concurrent requests, "
+            "sending requests sequentially: %s",
+            self._host,
+            ex,
+        )
+        self._concurrent_requests = 1
+        self._request_semaphore = None
+
+    async def _run_requests(
+        self, func: Callable[[_T], Coroutine[Any, Any, _R]], items: Sequence[_T]
+    ) -> list[_R]:
+        """Call func for each item and return the results in order.
+
+        If the device allows concurrent requests the calls run concurrently.
+        On a device error the remaining calls are cancelled and all further
+        requests are sent sequentially.
+        """
+        if self._concurrent_requests == 1 or len(items) < 2:
+            return [await func(item) for item in items]
+
+        tasks = [asyncio.create_task(func(item)) for item in items]
+        try:
+            return await asyncio.gather(*tasks)
+        except BaseException as ex:
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+            if isinstance(ex, KasaException) and not isinstance(
+                ex, AuthenticationError
+            ):
+                self._disable_concurrent_requests(ex)
+            raise
+
+    async def _query_child(
+        self, child_request: dict, retry_count: int = 3
+    ) -> dict | None:
+        """Send a control_child request and return its result.
+
+        Requests of several children made concurrently are sent together
+        as control_child entries of a single multipleRequest.
+        """
+        future: asyncio.Future[dict | None] = asyncio.get_running_loop().create_future()
+        self._child_requests.append((child_request, future))
+        if len(self._child_requests) == 1:
+            task = asyncio.create_task(self._send_child_requests(retry_count))
+            self._child_requests_tasks.add(task)
+            task.add_done_callback(self._child_requests_tasks.discard)
+        return await future
+
+    async def _send_child_request(
+        self,
+        child_request: dict,
+        future: asyncio.Future[dict | None],
+        retry_count: int,
+    ) -> None:
+        try:
+            response = await self.query({"control_child": child_request}, retry_count)
+        except Exception as ex:
+            if not future.done():
+                future.set_exception(ex)
+        else:
+            if not future.done():
+                future.set_result(response.get("control_child"))
+
+    async def _send_child_requests(self, retry_count: int) -> None:
+        """Send the control_child requests queued since the last call."""
+        pending = [
+            (request, future)
+            for request, future in self._child_requests
+            if not future.done()
+        ]
+        self._child_requests = []
+
+        try:
+            await self._send_child_request_batches(pending, retry_count)
+        finally:
+            for _, future in pending:
+                future.cancel()
+
+    async def _send_child_request_batches(
+        self,
+        pending: list[tuple[dict, asyncio.Future[dict | None]]],
+        retry_count: int,
+    ) -> None:
+        step = self._multi_request_batch_size
+        if not self._batch_child_requests or step == 1 or len(pending) < 2:
+            for child_request, future in pending:
+                await self._send_child_request(child_request, future, retry_count)
+            return
+
+        for i in range(0, len(pending), step):
+            batch = pending[i : i + step]
+            requests = [
+                {"method": "control_child", "params": child_request}
+                for child_request, _ in batch
+            ]
+            try:
+                response = await self.query(
+                    {"multipleRequest": {"requests": requests}}, retry_count
+                )
+                responses = response["multipleRequest"]["responses"]
+            except DeviceError as ex:
+                _LOGGER.debug(
+                    "Device %s returned an error to batched child requests, "
+                    "sending child requests separately: %s",
+                    self._host,
+                    ex,
+                )
+                self._batch_child_requests = False
+                responses = []
+            except Exception as ex:
+                for _, future in batch:
+                    if not future.done():
+                        future.set_exception(ex)
+                continue
+
+            # The device stops at the first error so resend the failed and the
+            # missing requests separately to get the error of each child.
+            for index, (child_request, future) in enumerate(batch):
+                if future.done():
+                    continue
+                if index < len(responses) and responses[index].get("error_code") == 0:
+                    future.set_result(responses[index].get("result"))
+                else:
+                    await self._send_child_request(child_request, future, retry_count)
+
     async def _execute_multiple_query(
         self, requests: dict, retry_count: int, iterate_list_pages: bool
     ) -> dict:
-        debug_enabled = _LOGGER.isEnabledFor(logging.DEBUG)
         multi_result: dict[str, Any] = {}
-        smart_method = "multipleRequest"
 
         end = len(requests)
         # The SmartCamProtocol sends requests with a length 1 as a
@@ -218,103 +385,264 @@ class SmartProtocol(BaseProtocol):
             if method not in FORCE_SINGLE_REQUEST
         ]
 
+        async def _query_single(method: str) -> dict:
+            resp = await self._send(self.get_smart_request(method, requests[method]))
+            self._handle_response_error_code(
+                resp, method, raise_on_error=raise_on_error
+            )
+            return resp
+
         # Break the requests down as there can be a size limit
         step = self._multi_request_batch_size
+        # Only a query needing several batches benefits from a larger batch size
+        probe = len(multi_requests) > step and self._can_probe_batch_size()
         if step == 1:
             # If step is 1 do not send request batches
-            for request in multi_requests:
-                method = request["method"]
-                req = self.get_smart_request(method, request.get("params"))
-                resp = await self._transport.send(req)
-                self._handle_response_error_code(
-                    resp, method, raise_on_error=raise_on_error
-                )
+            methods = [request["method"] for request in multi_requests]
+            responses = await self._run_requests(_query_single, methods)
+            for method, resp in zip(methods, responses, strict=True):
                 multi_result[method] = resp["result"]
+            if len(multi_requests) > step:
+                self._on_multi_request_success(
+                    step,
+                    max(len(json_dumps(resp)) for resp in responses) if probe else 0,
+                )
             return multi_result
 
-        for batch_num, i in enumerate(range(0, end, step)):
-            requests_step = multi_requests[i : i + step]
+        async def _execute_batch(i: int) -> tuple[dict[str, Any], int]:
+            batch_num = i // step
+            return await self._execute_multiple_query_batch(
+                requests,
+                multi_requests[i : i + step],
+                f"multi-request-batch-{batch_num + 1}-of-{int(end / step) + 1}",
+                retry_count=retry_count,
+                iterate_list_pages=iterate_list_pages,
+                raise_on_error=raise_on_error,
+                measure_response=probe,
+            )
 
-            smart_params = {"requests": requests_step}
-            smart_request = self.get_smart_request(smart_method, smart_params)
-            batch_name = f"multi-request-batch-{batch_num + 1}-of-{int(end / step) + 1}"
-            if debug_enabled:
-                _LOGGER.debug(
-                    "%s %s >> %s",
-                    self._host,
-                    batch_name,
-                    pf(smart_request),
-                )
-            response_step = await self._transport.send(smart_request)
-            if debug_enabled:
-                if self._redact_data:
-                    data = redact_data(response_step, REDACTORS)
-                else:
-                    data = response_step
-                _LOGGER.debug(
-                    "%s %s << %s",
-                    self._host,
-                    batch_name,
-                    pf(data),
-                )
-            try:
-                self._handle_response_error_code(response_step, batch_name)
-            except DeviceError as ex:
-                # P100 sometimes raises JSON_DECODE_FAIL_ERROR or INTERNAL_UNKNOWN_ERROR
-                # on batched request so disable batching
-                if (
-                    ex.error_code
-                    in {
-                        SmartErrorCode.JSON_DECODE_FAIL_ERROR,
-                        SmartErrorCode.INTERNAL_UNKNOWN_ERROR,
-                    }
-                    and self._multi_request_batch_size != 1
-                ):
+        batch_results = await self._run_requests(_execute_batch, range(0, end, step))
+        for batch_result, _ in batch_results:
+            multi_result.update(batch_result)
+        if len(multi_requests) > step:
+            self._on_multi_request_success(
+                step, max(response_size for _, response_size in batch_results)
+            )
+
+        # Multi requests don't continue after errors so requery any missing.
+        # Will also query individually any DO_NOT_SEND_AS_MULTI_REQUEST.
+        missing = [method for method in requests if method not in multi_result]
+        responses = await self._run_requests(_query_single, missing)
+        for method, resp in zip(missing, responses, strict=True):
+            multi_result[method] = resp.get("result")
+        return multi_result
+
+    async def _execute_multiple_query_batch(
+        self,
+        requests: dict,
+        requests_step: list[dict[str, Any]],
+        batch_name: str,
+        *,
+        retry_count: int,
+        iterate_list_pages: bool,
+        raise_on_error: bool,
+        measure_response: bool = False,
+    ) -> tuple[dict[str, Any], int]:
+        """Send a batch of requests as a multipleRequest.
+
+        Returns the results and, if measure_response is set, the size of the
+        serialized response used to estimate the next batch size.
+        """
+        debug_enabled = _LOGGER.isEnabledFor(logging.DEBUG)
+        batch_result: dict[str, Any] = {}
+        smart_method = "multipleRequest"
+
+        smart_params = {"requests": requests_step}
+        smart_request = self.get_smart_request(smart_method, smart_params)
+        if debug_enabled:
+            _LOGGER.debug(
+                "%s %s >> %s",
+                self._host,
+                batch_name,
+                pf(smart_request),
+            )
+        response_step = await self._send(smart_request)
+        if debug_enabled:
+            if self._redact_data:
+                data = redact_data(response_step, REDACTORS)
+            else:
+                data = response_step
+            _LOGGER.debug(
+                "%s %s << %s",
+                self._host,
+                batch_name,
+                pf(data),
+            )
+        try:
+            self._handle_response_error_code(response_step, batch_name)
+        except DeviceError as ex:
+            # P100 sometimes raises JSON_DECODE_FAIL_ERROR or INTERNAL_UNKNOWN_ERROR
+            # on batched request so reduce the batch size
+            if (
+                ex.error_code
+                in {
+                    SmartErrorCode.JSON_DECODE_FAIL_ERROR,
+                    SmartErrorCode.INTERNAL_UNKNOWN_ERROR,
+                }
+                and self._multi_request_batch_size != 1
+            ):
+                if not self._adaptive_batch_size:
                     self._multi_request_batch_size = 1
                     raise _RetryableError(
                         "JSON Decode failure, multi requests disabled"
                     ) from ex
-                raise ex
-
-            responses = response_step["result"]["responses"]
-            for response in responses:
-                # some smartcam devices calls do not populate the method key
-                # these should be defined in DO_NOT_SEND_AS_MULTI_REQUEST.
-                if not (method := response.get("method")):
-                    if not self._method_missing_logged:
-                        # Avoid spamming the logs
-                        self._method_missing_logged = True
-                        _LOGGER.error(
-                            "No method key in response for %s, skipping: %s",
-                            self._host,
-                            response_step,
-                        )
-                    # These will end up being queried individually
-                    continue
-
-                self._handle_response_error_code(
-                    response, method, raise_on_error=raise_on_error
-                )
-                result = response.get("result", None)
-                request_params = rp if (rp := requests.get(method)) else None
-                if iterate_list_pages and result:
-                    await self._handle_response_lists(
-                        result, method, request_params, retry_count=retry_count
+                self._on_multi_request_failure(len(requests_step))
+                raise _RetryableError(
+                    "JSON Decode failure, multi request batch size reduced to "
+                    + str(self._multi_request_batch_size)
+                ) from ex
+            raise ex
+
+        responses = response_step["result"]["responses"]
+        for response in responses:
+            # some smartcam devices calls do not populate the method key
+            # these should be defined in DO_NOT_SEND_AS_MULTI_REQUEST.
+            if not (method := response.get("method")):
+                if not self._method_missing_logged:
+                    # Avoid spamming the logs
+                    self._method_missing_logged = True
+                    _LOGGER.error(
+                        "No method key in response for %s, skipping: %s",
+                        self._host,
+                        response_step,
                     )
-                multi_result[method] = result
+                # These will end up being queried individually
+                continue
 
-        # Multi requests don't continue after errors so requery any missing.
-        # Will also query individually any DO_NOT_SEND_AS_MULTI_REQUEST.
-        for method, params in requests.items():
-            if method not in multi_result:
-                resp = await self._transport.send(
-                    self.get_smart_request(method, params)
-                )
-                self._handle_response_error_code(
-                    resp, method, raise_on_error=raise_on_error
+            self._handle_response_error_code(
+                response, method, raise_on_error=raise_on_error
+            )
+            result = response.get("result", None)
+            request_params = rp if (rp := requests.get(method)) else None
+            if iterate_list_pages and result:
+                await self._handle_response_lists(
+                    result, method, request_params, retry_count=retry_count
                 )
-                multi_result[method] = resp.get("result")
-        return multi_result
+            batch_result[method] = result
+        response_size = len(json_dumps(response_step)) if measure_response else 0
+        return batch_result, response_size
+
+    def _can_probe_batch_size(self) -> bool:
+        """Return true if the next successful query may increase the batch size."""
+        return (
+            self._adaptive_batch_size
+            and self._multi_request_batch_size < self._multi_request_batch_limit
+            and self._multi_request_successes + 1 >= self.MULTI_REQUEST_PROBE_AFTER
+        )
+
+    def _on_multi_request_success(self, step: int, response_size: int) -> None:
+        """Probe a larger batch size after enough successful queries."""
+        if not self._adaptive_batch_size or step != self._multi_request_batch_size:
+            return
+        self._multi_request_successes += 1
+        if (
+            not response_size
+            or self._multi_request_successes < self.MULTI_REQUEST_PROBE_AFTER
+            or step >= self._multi_request_batch_limit
+        ):
+            return
+
+        self._multi_request_successes = 0
+        self._multi_request_response_size = response_size / step
+        # Do not probe a batch size whose response is expected to be as
+        # large as the response of a batch that failed before.
+        if (
+            failed_size := self._multi_request_failed_response_size
+        ) and self._multi_request_response_size * (step + 1) >= failed_size:
+            self._multi_request_batch_limit = step
+        else:
+            self._multi_request_batch_size = step + 1
+        self._multi_request_batch_size_changed = True
+        _LOGGER.debug(
+            "Device %s multi request batch size %s, limit %s",
+            self._host,
+            self._multi_request_batch_size,
+            self._multi_request_batch_limit,
+        )
+
+    def _on_multi_request_failure(self, failed_batch_size: int) -> None:
+        """Back off after a batch of failed_batch_size requests was rejected."""
+        self._multi_request_successes = 0
+        if self._multi_request_response_size:
+            self._multi_request_failed_response_size = (
+                self._multi_request_response_size * failed_batch_size
+            )
+        self._multi_request_batch_limit = max(
+            1, min(self._multi_request_batch_limit, failed_batch_size - 1)
+        )
+        self._multi_request_batch_size = max(
+            1,
+            min(
+                self._multi_request_batch_size,
+                self._multi_request_batch_limit,
+                failed_batch_size // 2,
+            ),
+        )
+        self._multi_request_batch_size_changed = True
+        _LOGGER.debug(
+            "Device %s rejected a batch of %s requests, "
+            "multi request batch size %s, limit %s",
+            self._host,
+            failed_batch_size,
+            self._multi_request_batch_size,
+            self._multi_request_batch_limit,
+        )
+
+    def _get_batch_size_store_key(self, response: dict) -> str | None:
+        """Return the key to store the learned batch size under.
+
+        The batch size is learned per model and firmware so the key can
+        only be created from a response containing the device info.
+        """
+        if (
+            isinstance(info := response.get("get_device_info"), dict)
+            and (model := info.get("model"))
+            and (fw_ver := info.get("fw_ver"))
+        ):
+            return f"batch_size:{model}:{fw_ver}"
+        return None
+
+    async def _update_batch_size_store(self, response: dict) -> None:
+        """Load or save the learned batch size if a session store is set."""
+        if not self._adaptive_batch_size or not (
+            store := self._transport._config.session_store
+        ):
+            return
+
+        if not (key := self._batch_size_store_key):
+            if not (key := self._get_batch_size_store_key(response)):
+                return
+            self._batch_size_store_key = key
+            try:
+                if state := await store.load(key):
+                    self._multi_request_batch_size = int(state["batch_size"])
+                    self._multi_request_batch_limit = int(state["batch_limit"])
+                    self._multi_request_batch_size_changed = False
+                    return
+            except Exception as ex:
+                _LOGGER.warning("Unable to load batch size for %s: %s", self._host, ex)
+
+        if not self._multi_request_batch_size_changed:
+            return
+        self._multi_request_batch_size_changed = False
+        state = {
+            "batch_size": self._multi_request_batch_size,
+            "batch_limit": self._multi_request_batch_limit,
+        }
+        try:
+            await store.save(key, state)
+        except Exception as ex:
+            _LOGGER.warning("Unable to save batch size for %s: %s", self._host, ex)
 
     async def _execute_query(
         self, request: str | dict, *, retry_count: int, iterate_list_pages: bool = True
@@ -340,7 +668,7 @@ class SmartProtocol(BaseProtocol):
                 self._host,
                 pf(smart_request),
             )
-        response_data = await self._transport.send(smart_request)
+        response_data = await self._send(smart_request)
 
         if debug_enabled:
             _LOGGER.debug(
@@ -388,23 +716,41 @@ class SmartProtocol(BaseProtocol):
                 ]
             )
         )
-        while (list_length := len(response_result[response_list_name])) < list_sum:
-            request = self._get_list_request(method, params, list_length)
+        response_list = response_result[response_list_name]
+        page_size = len(response_list)
+
+        async def _get_page(start_index: int) -> list:
+            request = self._get_list_request(method, params, start_index)
             response = await self._execute_query(
                 request,
                 retry_count=retry_count,
                 iterate_list_pages=False,
             )
-            next_batch = response[method]
-            # In case the device returns empty lists avoid infinite looping
-            if not next_batch[response_list_name]:
-                _LOGGER.error(
-                    "Device %s returned empty results list for method %s",
-                    self._host,
-                    method,
-                )
-                break
-            response_result[response_list_name].extend(next_batch[response_list_name])
+            return response[method][response_list_name]
+
+        while (list_length := len(response_list)) < list_sum:
+            # Fetch the following pages concurrently if the device allows it
+            # assuming the device keeps returning pages of the same size.
+            start_indexes = (
+                range(list_length, list_sum, page_size)[: self._concurrent_requests]
+                if page_size
+                else range(list_length, list_length + 1)
+            )
+            pages = await self._run_requests(_get_page, start_indexes)
+            for start_index, next_batch in zip(start_indexes, pages, strict=True):
+                # The device returned a shorter page than expected so the
+                # remaining pages need to be fetched again from the new length.
+                if start_index != len(response_list):
+                    break
+                # In case the device returns empty lists avoid infinite looping
+                if not next_batch:
+                    _LOGGER.error(
+                        "Device %s returned empty results list for method %s",
+                        self._host,
+                        method,
+                    )
+                    return
+                response_list.extend(next_batch)
 
     def _handle_response_error_code(
         self, resp_dict: dict, method: str, raise_on_error: bool = True
@@ -456,11 +802,12 @@ class _ChildProtocolWrapper(SmartProtocol):
         self._device_id = device_id
         self._protocol = base_protocol
         self._transport = base_protocol._transport
+        self._concurrent_requests = 1
 
     def _get_method_and_params_for_request(self, request: dict[str, Any] | str) -> Any:
         """Return payload for wrapping.
 
-        TODO: this does not support batches and requires refactoring in the future.
+        Several methods are wrapped in a multipleRequest of the child.
         """
         if isinstance(request, dict):
             if len(request) == 1:
@@ -487,20 +834,29 @@ class _ChildProtocolWrapper(SmartProtocol):
 
     async def _query(self, request: str | dict, retry_count: int = 3) -> dict:
         """Wrap request inside control_child envelope."""
+        return await self._execute_query(
+            request, retry_count=retry_count, iterate_list_pages=True
+        )
+
+    async def _execute_query(
+        self, request: str | dict, *, retry_count: int, iterate_list_pages: bool = True
+    ) -> dict:
+        """Send the request in a control_child envelope and unwrap the response.
+
+        The parent protocol batches the envelopes of concurrent requests
+        of different children.
+        """
         method, params = self._get_method_and_params_for_request(request)
         request_data = {
             "method": method,
             "params": params,
         }
-        wrapped_payload = {
-            "control_child": {
-                "device_id": self._device_id,
-                "requestData": request_data,
-            }
+        child_request = {
+            "device_id": self._device_id,
+            "requestData": request_data,
         }
 
-        response = await self._protocol.query(wrapped_payload, retry_count)
-        result = response.get("control_child")
+        result = await self._protocol._query_child(child_request, retry_count)
         # Unwrap responseData for control_child
         if result and (response_data := result.get("responseData")):
             result = response_data.get("result")
@@ -512,10 +868,21 @@ class _ChildProtocolWrapper(SmartProtocol):
                         multi_response, method, raise_on_error=False
                     )
                     ret_val[method] = multi_response.get("result")
+                    if iterate_list_pages and ret_val[method]:
+                        await self._handle_response_lists(
+                            ret_val[method],
+                            method,
+                            request.get(method) if isinstance(request, dict) else None,
+                            retry_count=retry_count,
+                        )
                 return ret_val
 
             self._handle_response_error_code(response_data, "control_child")
 
+        if iterate_list_pages and result:
+            await self._handle_response_lists(
+                result, method, params, retry_count=retry_count
+            )
         return {method: result}
 
     async def close(self) -> None:
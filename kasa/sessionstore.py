@@ -0,0 +1,171 @@
+"""Persistent storage for transport sessions.
+
+Transports that establish an encrypted session with a device can save the
+session state to a :class:`SessionStore` so that a later process can resume
+the session without repeating the handshake. Protocols also use the store to
+keep the multi request batch size learned for a device model and firmware.
+
+Session stores are opt-in and are passed via :attr:`DeviceConfig.session_store`:
+
+>>> from kasa import DeviceConfig
+>>> from kasa.sessionstore import FileSessionStore
+>>> store = FileSessionStore("/tmp/kasa_sessions.json")
+>>> config = DeviceConfig("127.0.0.1", session_store=store)
+
+The stored state contains secrets that allow control of the device so the
+file is created readable only by the current user.
+Changes are written to the file shortly after they are made, call
+:meth:`FileSessionStore.close` before exiting to write any pending changes.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import contextlib
+import logging
+import os
+from abc import ABC, abstractmethod
+from pathlib import Path
+from typing import Any
+
+from .json import dumps as json_dumps
+from .json import loads as json_loads
+
+_LOGGER = logging.getLogger(__name__)
+
+
+class SessionStore(ABC):
+    """Base class for session store backends.
+
+    Session state is stored as a json serializable dict keyed by a
+    transport specific string.
+    """
+
+    @abstractmethod
+    async def load(self, key: str) -> dict[str, Any] | None:
+        """Return the stored session state for key or None."""
+
+    @abstractmethod
+    async def save(self, key: str, state: dict[str, Any]) -> None:
+        """Store the session state for key."""
+
+    @abstractmethod
+    async def delete(self, key: str) -> None:
+        """Remove the session state for key."""
+
+
+class MemorySessionStore(SessionStore):
+    """Session store keeping the state in memory."""
+
+    def __init__(self) -> None:
+        self._sessions: dict[str, dict[str, Any]] = {}
+
+    async def load(self, key: str) -> dict[str, Any] | None:
+        """Return the stored session state for key or None."""
+        return self._sessions.get(key)
+
+    async def save(self, key: str, state: dict[str, Any]) -> None:
+        """Store the session state for key."""
+        self._sessions[key] = state
+
+    async def delete(self, key: str) -> None:
+        """Remove the session state for key."""
+        self._sessions.pop(key, None)
+
+
+class FileSessionStore(SessionStore):
+    """Session store keeping the state of all devices in a single json file.
+
+    The file is read once and then kept in memory. Changes made within
+    *flush_delay* seconds are coalesced into a single atomic write.
+    """
+
+    DEFAULT_FLUSH_DELAY = 1.0
+
+    def __init__(
+        self, path: str | Path, *, flush_delay: float = DEFAULT_FLUSH_DELAY
+    ) -> None:
+        self._path = Path(path)
+        self._sessions: dict[str, dict[str, Any]] | None = None
+        self._lock = asyncio.Lock()
+        self._flush_delay = flush_delay
+        self._flush_task: asyncio.Task | None = None
+        self._dirty = False
+
+    def _read(self) -> dict[str, dict[str, Any]]:
+        try:
+            data = json_loads(self._path.read_bytes())
+        except FileNotFoundError:
+            return {}
+        except ValueError:
+            _LOGGER.warning("Ignoring invalid session store file %s", self._path)
+            return {}
+        return data if isinstance(data, dict) else {}
+
+    def _write(self, sessions: dict[str, dict[str, Any]]) -> None:
+        tmp_path = self._path.with_name(self._path.name + ".tmp")
+        fd = os.open(tmp_path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+        with os.fdopen(fd, "w") as f:
+            f.write(json_dumps(sessions))
+        os.replace(tmp_path, self._path)
+
+    async def _get_sessions(self) -> dict[str, dict[str, Any]]:
+        if self._sessions is None:
+            loop = asyncio.get_running_loop()
+            self._sessions = await loop.run_in_executor(None, self._read)
+        return self._sessions
+
+    async def _flush(self) -> None:
+        if not self._dirty:
+            return
+        self._dirty = False
+        loop = asyncio.get_running_loop()
+        sessions = dict(await self._get_sessions())
+        try:
+            await loop.run_in_executor(None, self._write, sessions)
+        except:
+            self._dirty = True
+            raise
+
+    def _schedule_flush(self) -> None:
+        self._dirty = True
+        if self._flush_task is None or self._flush_task.done():
+            self._flush_task = asyncio.create_task(self._delayed_flush())
+
+    async def _delayed_flush(self) -> None:
+        await asyncio.sleep(self._flush_delay)
+        try:
+            await self.flush()
+        except OSError as ex:
+            _LOGGER.warning("Unable to write session store %s: %s", self._path, ex)
+
+    async def flush(self) -> None:
+        """Write any pending changes to the file."""
+        async with self._lock:
+            await self._flush()
+
+    async def close(self) -> None:
+        """Write any pending changes and stop the scheduled write."""
+        if self._flush_task and not self._flush_task.done():
+            self._flush_task.cancel()
+            with contextlib.suppress(asyncio.CancelledError):
+                await self._flush_task
+            self._flush_task = None
+        await self.flush()
+
+    async def load(self, key: str) -> dict[str, Any] | None:
+        """Return the stored session state for key or None."""
+        async with self._lock:
+            return (await self._get_sessions()).get(key)
+
+    async def save(self, key: str, state: dict[str, Any]) -> None:
+        """Store the session state for key."""
+        async with self._lock:
+            (await self._get_sessions())[key] = state
+            self._schedule_flush()
+
+    async def delete(self, key: str) -> None:
+        """Remove the session state for key."""
+        async with self._lock:
+            if (await self._get_sessions()).pop(key, None) is not None:
+                self._schedule_flush()
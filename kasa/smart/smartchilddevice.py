@@ -9,6 +9,8 @@ from typing import Any
 from ..device import DeviceInfo
 from ..device_type import DeviceType
 from ..deviceconfig import DeviceConfig
+from ..feature import Feature
+from ..modulemapping import ModuleMapping
 from ..protocols.smartprotocol import SmartProtocol, _ChildProtocolWrapper
 from .smartdevice import ComponentsRaw, SmartDevice
 from .smartmodule import SmartModule
@@ -52,6 +54,9 @@ class SmartChildDevice(SmartDevice):
         self._update_internal_state(info)
         self._components_raw = component_info_raw
         self._components = self._parse_components(self._components_raw)
+        # Lazily created children only hold their info until they are used
+        self._is_stub = False
+        self._used = False
 
     @property
     def device_info(self) -> DeviceInfo:
@@ -76,6 +81,38 @@ class SmartChildDevice(SmartDevice):
         their own queries.
         """
         await self._update(update_children)
+        await self._notify_feature_changes()
+
+    @property
+    def modules(self) -> ModuleMapping[SmartModule]:
+        """Return the device modules.
+
+        The modules of a lazily created child are initialized on its next update.
+        """
+        self._used = True
+        return super().modules
+
+    @property
+    def features(self) -> dict[str, Feature]:
+        """Return the list of supported features.
+
+        The features of a lazily created child are initialized on its next update.
+        """
+        self._used = True
+        return super().features
+
+    @property
+    def _skip_update(self) -> bool:
+        """Return true if the child is a stub which has not been used."""
+        return self._is_stub and not self._used
+
+    async def _materialize(self) -> None:
+        """Initialize the modules of a lazily created child."""
+        if not self._is_stub:
+            return
+        _LOGGER.debug("Initializing modules of child %s", self._id)
+        self._is_stub = False
+        await self._initialize_modules()
 
     async def _update(self, update_children: bool = True) -> None:
         """Update child module info.
@@ -83,6 +120,7 @@ class SmartChildDevice(SmartDevice):
         Internal implementation to allow patching of public update in the cli
         or test framework.
         """
+        await self._materialize()
         now = time.monotonic()
         module_queries: list[SmartModule] = []
         req: dict[str, Any] = {}
@@ -124,6 +162,7 @@ class SmartChildDevice(SmartDevice):
         protocol: SmartProtocol | None = None,
         *,
         last_update: dict | None = None,
+        lazy: bool = False,
     ) -> SmartDevice:
         """Create a child device based on device info and component listing.
 
@@ -131,13 +170,19 @@ class SmartChildDevice(SmartDevice):
         protocol: SmartProtocol and last_update should be provided as per the
         FIRST_UPDATE_MODULES expected by the update cycle as these cannot be
         derived from the parent.
+
+        If lazy is set the modules are only initialized once the child is used,
+        and the parent does not update the child until then.
         """
         child: SmartChildDevice = cls(
             parent, child_info, child_components_raw, protocol=protocol
         )
         if last_update:
             child._last_update = last_update
-        await child._initialize_modules()
+        if lazy:
+            child._is_stub = True
+        else:
+            await child._initialize_modules()
         return child
 
     @property
@@ -83,7 +83,7 @@ class SmartDevice(Device):
             "get_child_device_component_list": None,
             "get_child_device_list": None,
         }
-        resp = await self.protocol.query(child_info_query)
+        resp = await self._query_initialization(child_info_query)
         self.internal_state.update(resp)
 
     async def _try_create_child(
@@ -95,6 +95,7 @@ class SmartDevice(Device):
             parent=self,
             child_info=info,
             child_components_raw=child_components,
+            lazy=bool(self.config.lazy_children) and self.device_type is DeviceType.Hub,
         )
 
     async def _create_delete_children(
@@ -215,7 +216,7 @@ class SmartDevice(Device):
             "get_device_info": None,
             "get_connect_cloud_state": None,
         }
-        resp = await self.protocol.query(initial_query)
+        resp = await self._query_initialization(initial_query)
 
         # Save the initial state to allow modules access the device info already
         # during the initialization, which is necessary as some information like the
@@ -283,10 +284,10 @@ class SmartDevice(Device):
         # This needs to go after updating the internal state of the children so that
         # child modules have access to their sysinfo.
         if children_changed or update_children or self.device_type != DeviceType.Hub:
-            for child in self._children.values():
-                if TYPE_CHECKING:
-                    assert isinstance(child, SmartChildDevice)
-                await child._update()
+            children = cast("list[SmartChildDevice]", self.children)
+            await self._run_child_updates(
+                child._update for child in children if not child._skip_update
+            )
 
         # We can first initialize the features after the first update.
         # We make here an assumption that every device has at least a single feature.
@@ -297,6 +298,8 @@ class SmartDevice(Device):
             updated = self._last_update if first_update else resp
             _LOGGER.debug("Update completed %s: %s", self.host, list(updated.keys()))
 
+        await self._notify_feature_changes()
+
     async def _handle_module_post_update(
         self, module: SmartModule, update_time: float, had_query: bool
     ) -> None:
@@ -332,7 +335,12 @@ class SmartDevice(Device):
             if (first_update or module.disabled is False) and (query := module.query())
         }
         for module, query in mq.items():
-            if first_update and module.__class__ in self.FIRST_UPDATE_MODULES:
+            # The negotiation already queried these unless it was restored
+            if (
+                first_update
+                and not self._restored_initialization
+                and module.__class__ in self.FIRST_UPDATE_MODULES
+            ):
                 module._last_update_time = update_time
                 continue
             if module._should_update(update_time):
@@ -8,7 +8,7 @@ from functools import wraps
 from typing import TYPE_CHECKING, Any, Concatenate, ParamSpec, TypeVar
 
 from ..exceptions import DeviceError, KasaException, SmartErrorCode
-from ..module import Module
+from ..module import Module, _memoized_data
 
 if TYPE_CHECKING:
     from .smartdevice import SmartDevice
@@ -176,6 +176,7 @@ class SmartModule(Module):
         return []
 
     @property
+    @_memoized_data
     def data(self) -> dict[str, Any]:
         """Return response data for the module.
 
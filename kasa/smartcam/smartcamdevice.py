@@ -171,7 +171,7 @@ class SmartCamDevice(SmartDevice):
             "getChildDeviceList": {"childControl": {"start_index": 0}},
             "getChildDeviceComponentList": {"childControl": {"start_index": 0}},
         }
-        resp = await self.protocol.query(child_info_query)
+        resp = await self._query_initialization(child_info_query)
         self.internal_state.update(resp)
 
     async def _try_create_child(
@@ -235,7 +235,7 @@ class SmartCamDevice(SmartDevice):
             "getAppComponentList": {"app_component": {"name": "app_component_list"}},
             "getConnectionType": {"network": {"get_connection_type": {}}},
         }
-        resp = await self.protocol.query(initial_query)
+        resp = await self._query_initialization(initial_query)
         self._last_update.update(resp)
         self._update_internal_info(resp)
 
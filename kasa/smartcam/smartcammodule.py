@@ -6,6 +6,7 @@ import logging
 from typing import TYPE_CHECKING, Final
 
 from ..exceptions import DeviceError, KasaException, SmartErrorCode
+from ..module import _memoized_data
 from ..modulemapping import ModuleName
 from ..smart.smartmodule import SmartModule
 
@@ -87,6 +88,7 @@ class SmartCamModule(SmartModule):
         return await self._device._query_helper(method, params)
 
     @property
+    @_memoized_data
     def data(self) -> dict:
         """Return response data for the module."""
         dev = self._device
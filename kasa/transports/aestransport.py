@@ -6,11 +6,14 @@ under compatible GNU GPL3 license.
 
 from __future__ import annotations
 
+import asyncio
 import base64
 import hashlib
 import logging
 import time
+from collections import deque
 from collections.abc import AsyncGenerator
+from concurrent.futures import Future, ThreadPoolExecutor
 from enum import Enum, auto
 from typing import TYPE_CHECKING, Any, cast
 
@@ -21,7 +24,7 @@ from cryptography.hazmat.primitives.ciphers import Cipher, algorithms, modes
 from yarl import URL
 
 from kasa.credentials import DEFAULT_CREDENTIALS, Credentials, get_default_credentials
-from kasa.deviceconfig import DeviceConfig
+from kasa.deviceconfig import DeviceConfig, KeyPairDict
 from kasa.exceptions import (
     SMART_AUTHENTICATION_ERRORS,
     SMART_RETRYABLE_ERRORS,
@@ -52,6 +55,70 @@ def _sha1(payload: bytes) -> str:
     return sha1_algo.hexdigest()
 
 
+_KEY_GENERATION_EXECUTOR: ThreadPoolExecutor | None = None
+
+
+def _get_key_generation_executor() -> ThreadPoolExecutor:
+    """Return the executor shared by all key pair pools."""
+    global _KEY_GENERATION_EXECUTOR
+    if _KEY_GENERATION_EXECUTOR is None:
+        _KEY_GENERATION_EXECUTOR = ThreadPoolExecutor(
+            max_workers=1, thread_name_prefix="kasa-keygen"
+        )
+    return _KEY_GENERATION_EXECUTOR
+
+
+class KeyPairPool:
+    """Pool of RSA key pairs generated in a background thread.
+
+    Generating an RSA key is CPU bound so it never runs on the event loop.
+    The pool is not bound to an event loop and can be shared by any number
+    of transports. After a key pair is handed out the pool schedules the
+    generation of a new one until it holds ``size`` key pairs again.
+    """
+
+    def __init__(self, key_size: int = 1024, size: int = 1) -> None:
+        self.key_size = key_size
+        self.size = size
+        self._key_pairs: deque[KeyPair] = deque()
+        self._pending: deque[Future[KeyPair]] = deque()
+
+    def __len__(self) -> int:
+        """Return the number of available and scheduled key pairs."""
+        return len(self._key_pairs) + len(self._pending)
+
+    def add(self, key_pair: KeyPair) -> None:
+        """Add an existing key pair to the pool."""
+        self._key_pairs.append(key_pair)
+
+    def add_keys(self, aes_keys: KeyPairDict) -> None:
+        """Add a key pair persisted with :attr:`DeviceConfig.aes_keys`."""
+        self.add(KeyPair.create_from_der_keys(aes_keys["private"], aes_keys["public"]))
+
+    def prefill(self, count: int | None = None) -> None:
+        """Schedule key generation until the pool holds count key pairs.
+
+        Defaults to the size of the pool.
+        """
+        count = self.size if count is None else count
+        executor = _get_key_generation_executor()
+        for _ in range(count - len(self)):
+            self._pending.append(
+                executor.submit(KeyPair.create_key_pair, self.key_size)
+            )
+
+    async def get(self) -> KeyPair:
+        """Take a key pair from the pool, waiting for one to be generated."""
+        if self._key_pairs:
+            key_pair = self._key_pairs.popleft()
+        else:
+            if not self._pending:
+                self.prefill(1)
+            key_pair = await asyncio.wrap_future(self._pending.popleft())
+        self.prefill()
+        return key_pair
+
+
 class TransportState(Enum):
     """Enum for AES state."""
 
@@ -77,6 +144,7 @@ class AesTransport(BaseTransport):
     }
     CONTENT_LENGTH = "Content-Length"
     KEY_PAIR_CONTENT_LENGTH = 314
+    key_pair_pool = KeyPairPool()
 
     def __init__(
         self,
@@ -100,6 +168,7 @@ class AesTransport(BaseTransport):
         self._http_client: HttpClient = HttpClient(config)
 
         self._state = TransportState.HANDSHAKE_REQUIRED
+        self._handshake_lock = asyncio.Lock()
 
         self._encryption_session: AesEncyptionSession | None = None
         self._session_expire_at: float | None = None
@@ -280,7 +349,7 @@ class AesTransport(BaseTransport):
         """
         _LOGGER.debug("Generating keypair")
         if not self._key_pair:
-            kp = KeyPair.create_key_pair()
+            kp = await self.key_pair_pool.get()
             self._config.aes_keys = {
                 "private": kp.private_key_der_b64,
                 "public": kp.public_key_der_b64,
@@ -368,18 +437,24 @@ class AesTransport(BaseTransport):
     async def send(self, request: str) -> dict[str, Any]:
         """Send the request."""
         if (
-            self._state is TransportState.HANDSHAKE_REQUIRED
+            self._state is not TransportState.ESTABLISHED
             or self._handshake_session_expired()
         ):
-            await self.perform_handshake()
-        if self._state is not TransportState.ESTABLISHED:
-            try:
-                await self.perform_login()
-            # After a login failure handshake needs to
-            # be redone or a 9999 error is received.
-            except AuthenticationError as ex:
-                self._state = TransportState.HANDSHAKE_REQUIRED
-                raise ex
+            # Concurrent requests wait for a single handshake and login
+            async with self._handshake_lock:
+                if (
+                    self._state is TransportState.HANDSHAKE_REQUIRED
+                    or self._handshake_session_expired()
+                ):
+                    await self.perform_handshake()
+                if self._state is not TransportState.ESTABLISHED:
+                    try:
+                        await self.perform_login()
+                    # After a login failure handshake needs to
+                    # be redone or a 9999 error is received.
+                    except AuthenticationError as ex:
+                        self._state = TransportState.HANDSHAKE_REQUIRED
+                        raise ex
 
         return await self.send_secure_passthrough(request)
 
@@ -35,6 +35,12 @@ are used as a sequence number that increments every time the
 client calls encrypt and this sequence number is sent as a
 url parameter to the device along with the encrypted payload
 
+If a :class:`~kasa.sessionstore.SessionStore` is configured the
+seeds, auth_hash, sequence number and session cookie are saved after
+each handshake and when the transport is closed.  A new transport
+resumes the stored session and only performs a full handshake if
+the session has expired or the device rejects it.
+
 https://gist.github.com/chriswheeldon/3b17d974db3817613c69191c0480fe55
 https://github.com/python-kasa/python-kasa/pull/117
 
@@ -46,6 +52,7 @@ import asyncio
 import base64
 import datetime
 import hashlib
+import hmac
 import logging
 import secrets
 import ssl
@@ -55,7 +62,6 @@ from asyncio import Future
 from collections.abc import Generator
 from typing import TYPE_CHECKING, Any, cast
 
-from cryptography.hazmat.primitives import padding
 from cryptography.hazmat.primitives.ciphers import Cipher, algorithms, modes
 from yarl import URL
 
@@ -76,6 +82,10 @@ SESSION_EXPIRE_BUFFER_SECONDS = 60 * 20
 
 PACK_SIGNED_LONG = struct.Struct(">l").pack
 
+_BLOCK_SIZE = 16
+_SIGNATURE_SIZE = 32
+_PKCS7_PADDING = [bytes([size]) * size for size in range(_BLOCK_SIZE + 1)]
+
 
 def _sha256(payload: bytes) -> bytes:
     return hashlib.sha256(payload).digest()  # noqa: S324
@@ -138,6 +148,9 @@ class KlapTransport(BaseTransport):
 
         self._session_cookie: dict[str, Any] | None = None
 
+        self._session_store = config.session_store
+        self._session_restore_attempted = False
+
         _LOGGER.debug("Created KLAP transport for %s", self._host)
         protocol = "https" if config.connection_type.https else "http"
         self._app_url = URL(f"{protocol}://{self._host}:{self._port}/app")
@@ -340,6 +353,76 @@ class KlapTransport(BaseTransport):
         self._handshake_done = True
 
         _LOGGER.debug("Handshake with %s complete", self._host)
+        await self._save_session()
+
+    @property
+    def _session_store_key(self) -> str:
+        return f"klap:{self._host}:{self._port}"
+
+    async def _save_session(self) -> None:
+        """Save the current session to the session store if configured."""
+        if (
+            not self._session_store
+            or not self._handshake_done
+            or not self._encryption_session
+            or self._session_expire_at is None
+        ):
+            return
+        session = self._encryption_session
+        cookie = (self._session_cookie or {}).get(self.SESSION_COOKIE_NAME)
+        # Monotonic time does not survive a restart so store wall clock expiry
+        expire_at = time.time() + self._session_expire_at - time.monotonic()
+        state = {
+            "local_seed": base64.b64encode(session.local_seed).decode(),
+            "remote_seed": base64.b64encode(session.remote_seed).decode(),
+            "auth_hash": base64.b64encode(session.user_hash).decode(),
+            "seq": session.seq,
+            "cookie": cookie,
+            "expire_at": expire_at,
+        }
+        try:
+            await self._session_store.save(self._session_store_key, state)
+        except Exception as ex:
+            _LOGGER.warning("Unable to save session for %s: %s", self._host, ex)
+
+    async def _restore_session(self) -> bool:
+        """Restore a session from the session store.
+
+        Only attempted once per transport, after a failure a full
+        handshake is required.
+        """
+        if not self._session_store or self._session_restore_attempted:
+            return False
+        self._session_restore_attempted = True
+        try:
+            state = await self._session_store.load(self._session_store_key)
+        except Exception as ex:
+            _LOGGER.warning("Unable to load session for %s: %s", self._host, ex)
+            return False
+        if not state:
+            return False
+        try:
+            remaining = float(state["expire_at"]) - time.time()
+            if remaining <= 0:
+                _LOGGER.debug("Stored session for %s has expired", self._host)
+                return False
+            encryption_session = KlapEncryptionSession(
+                base64.b64decode(state["local_seed"]),
+                base64.b64decode(state["remote_seed"]),
+                base64.b64decode(state["auth_hash"]),
+                seq=int(state["seq"]),
+            )
+            cookie = state.get("cookie")
+        except (KeyError, TypeError, ValueError) as ex:
+            _LOGGER.debug("Ignoring invalid stored session for %s: %s", self._host, ex)
+            return False
+
+        self._encryption_session = encryption_session
+        self._session_cookie = {self.SESSION_COOKIE_NAME: cookie} if cookie else None
+        self._session_expire_at = time.monotonic() + remaining
+        self._handshake_done = True
+        _LOGGER.debug("Restored stored session for %s", self._host)
+        return True
 
     def _handshake_session_expired(self) -> bool:
         """Return true if session has expired."""
@@ -351,7 +434,12 @@ class KlapTransport(BaseTransport):
     async def send(self, request: str) -> Generator[Future, None, dict[str, str]]:  # type: ignore[override]
         """Send the request."""
         if not self._handshake_done or self._handshake_session_expired():
-            await self.perform_handshake()
+            # Concurrent requests wait for a single handshake to complete
+            async with self._handshake_lock:
+                if (
+                    not self._handshake_done or self._handshake_session_expired()
+                ) and not await self._restore_session():
+                    await self.perform_handshake()
 
         # Check for mypy
         if self._encryption_session is not None:
@@ -390,7 +478,9 @@ class KlapTransport(BaseTransport):
                 assert self._encryption_session
                 assert isinstance(response_data, bytes)
             try:
-                decrypted_response = self._encryption_session.decrypt(response_data)
+                decrypted_response = self._encryption_session.decrypt(
+                    response_data, seq
+                )
             except Exception as ex:
                 raise KasaException(
                     f"Error trying to decrypt device {self._host} response: {ex}"
@@ -404,6 +494,8 @@ class KlapTransport(BaseTransport):
 
     async def close(self) -> None:
         """Close the http client and reset internal state."""
+        # Save the sequence number so a later transport can resume the session
+        await self._save_session()
         await self.reset()
         await self._http_client.close()
 
@@ -489,16 +581,25 @@ class KlapEncryptionSession:
     i.e. sequence number which the device expects to increment.
     """
 
-    _cipher: Cipher
-
-    def __init__(self, local_seed: bytes, remote_seed: bytes, user_hash: bytes) -> None:
+    def __init__(
+        self,
+        local_seed: bytes,
+        remote_seed: bytes,
+        user_hash: bytes,
+        *,
+        seq: int | None = None,
+    ) -> None:
         self.local_seed = local_seed
         self.remote_seed = remote_seed
         self.user_hash = user_hash
         self._key = self._key_derive(local_seed, remote_seed, user_hash)
         (self._iv, self._seq) = self._iv_derive(local_seed, remote_seed, user_hash)
+        if seq is not None:
+            self._seq = seq
         self._aes = algorithms.AES(self._key)
         self._sig = self._sig_derive(local_seed, remote_seed, user_hash)
+        # Hash state of the signature prefix which is copied for every message
+        self._sig_hash = hashlib.sha256(self._sig)
 
     def _key_derive(
         self, local_seed: bytes, remote_seed: bytes, user_hash: bytes
@@ -523,33 +624,70 @@ class KlapEncryptionSession:
         payload = b"ldk" + local_seed + remote_seed + user_hash
         return hashlib.sha256(payload).digest()[:28]
 
-    def _generate_cipher(self) -> None:
-        iv_seq = self._iv + PACK_SIGNED_LONG(self._seq)
-        cbc = modes.CBC(iv_seq)
-        self._cipher = Cipher(self._aes, cbc)
+    @property
+    def seq(self) -> int:
+        """Return the sequence number of the last request."""
+        return self._seq
+
+    def _cipher(self, seq: int) -> Cipher:
+        return Cipher(self._aes, modes.CBC(self._iv + PACK_SIGNED_LONG(seq)))
 
-    def encrypt(self, msg: bytes | str) -> tuple[bytes, int]:
+    def _signature(self, seq: int, ciphertext: bytes | memoryview) -> bytes:
+        sig_hash = self._sig_hash.copy()
+        sig_hash.update(PACK_SIGNED_LONG(seq))
+        sig_hash.update(ciphertext)
+        return sig_hash.digest()
+
+    def encrypt(self, msg: bytes | str) -> tuple[bytearray, int]:
         """Encrypt the data and increment the sequence number."""
         self._seq += 1
-        self._generate_cipher()
+        seq = self._seq
 
         if isinstance(msg, str):
             msg = msg.encode("utf-8")
 
-        encryptor = self._cipher.encryptor()
-        padder = padding.PKCS7(128).padder()
-        padded_data = padder.update(msg) + padder.finalize()
-        ciphertext = encryptor.update(padded_data) + encryptor.finalize()
-        signature = hashlib.sha256(
-            self._sig + PACK_SIGNED_LONG(self._seq) + ciphertext
-        ).digest()
-        return (signature + ciphertext, self._seq)
-
-    def decrypt(self, msg: bytes) -> str:
-        """Decrypt the data."""
-        decryptor = self._cipher.decryptor()
-        dp = decryptor.update(msg[32:]) + decryptor.finalize()
-        unpadder = padding.PKCS7(128).unpadder()
-        plaintextbytes = unpadder.update(dp) + unpadder.finalize()
-
-        return plaintextbytes.decode()
+        # The signature and the padded ciphertext are written into a single
+        # buffer which has room for the block the cipher may hold back.
+        pad = _PKCS7_PADDING[_BLOCK_SIZE - len(msg) % _BLOCK_SIZE]
+        size = _SIGNATURE_SIZE + len(msg) + len(pad)
+        buffer = bytearray(size + _BLOCK_SIZE - 1)
+        view = memoryview(buffer)
+        encryptor = self._cipher(seq).encryptor()
+        written = _SIGNATURE_SIZE
+        written += encryptor.update_into(msg, view[written:])
+        written += encryptor.update_into(pad, view[written:])
+        encryptor.finalize()
+        view[:_SIGNATURE_SIZE] = self._signature(seq, view[_SIGNATURE_SIZE:size])
+        view.release()
+        del buffer[size:]
+        return (buffer, seq)
+
+    def _decrypt(self, msg: bytes | bytearray, seq: int) -> bytearray:
+        """Verify the signature and return the unpadded plaintext."""
+        view = memoryview(msg)
+        ciphertext = view[_SIGNATURE_SIZE:]
+        if not ciphertext or len(ciphertext) % _BLOCK_SIZE:
+            raise ValueError(f"Invalid ciphertext length {len(ciphertext)}")
+        if not hmac.compare_digest(
+            view[:_SIGNATURE_SIZE], self._signature(seq, ciphertext)
+        ):
+            raise ValueError(f"Invalid signature for seq {seq}")
+
+        plaintext = bytearray(len(ciphertext) + _BLOCK_SIZE - 1)
+        decryptor = self._cipher(seq).decryptor()
+        size = decryptor.update_into(ciphertext, plaintext)
+        decryptor.finalize()
+        pad_size = plaintext[size - 1]
+        if not 0 < pad_size <= _BLOCK_SIZE or not plaintext.endswith(
+            _PKCS7_PADDING[pad_size], 0, size
+        ):
+            raise ValueError("Invalid padding bytes.")
+        del plaintext[size - pad_size :]
+        return plaintext
+
+    def decrypt(self, msg: bytes | bytearray, seq: int | None = None) -> str:
+        """Decrypt the response to the request with the sequence number.
+
+        Defaults to the sequence number of the last request.
+        """
+        return self._decrypt(msg, self._seq if seq is None else seq).decode()
@@ -105,6 +105,7 @@ class SslAesTransport(BaseTransport):
         self._http_client: HttpClient = HttpClient(config)
 
         self._state = TransportState.HANDSHAKE_REQUIRED
+        self._handshake_lock = asyncio.Lock()
 
         self._encryption_session: AesEncyptionSession | None = None
         self._session_expire_at: float | None = None
@@ -652,7 +653,10 @@ class SslAesTransport(BaseTransport):
     async def send(self, request: str) -> dict[str, Any]:
         """Send the request."""
         if self._state is TransportState.HANDSHAKE_REQUIRED:
-            await self.perform_handshake()
+            # Concurrent requests wait for a single handshake
+            async with self._handshake_lock:
+                if self._state is TransportState.HANDSHAKE_REQUIRED:
+                    await self.perform_handshake()
 
         if self._send_secure:
             return await self.send_secure_passthrough(request)
@@ -19,7 +19,6 @@ import logging
 import socket
 import struct
 from asyncio import timeout as asyncio_timeout
-from collections.abc import Generator
 
 from kasa.deviceconfig import DeviceConfig
 from kasa.exceptions import KasaException, _RetryableError
@@ -201,11 +200,23 @@ class XorEncryption:
     INITIALIZATION_VECTOR = 171
 
     @staticmethod
-    def _xor_payload(unencrypted: bytes) -> Generator[int, None, None]:
-        key = XorEncryption.INITIALIZATION_VECTOR
-        for unencryptedbyte in unencrypted:
-            key = key ^ unencryptedbyte
-            yield key
+    def _xor_payload(unencrypted: bytes) -> bytes:
+        """Encrypt the payload with the autokey cipher.
+
+        Every cipher byte is the xor of the initialization vector and all plain
+        bytes up to it. The prefix xor is computed on the payload as a single
+        integer, doubling the shift on each step, instead of byte by byte.
+        """
+        if not (length := len(unencrypted)):
+            return b""
+        value = int.from_bytes(unencrypted, "big") ^ (
+            XorEncryption.INITIALIZATION_VECTOR << 8 * (length - 1)
+        )
+        shift = 8
+        while shift < 8 * length:
+            value ^= value >> shift
+            shift <<= 1
+        return value.to_bytes(length, "big")
 
     @staticmethod
     def encrypt(request: str) -> bytes:
@@ -215,17 +226,22 @@ class XorEncryption:
         :return: ciphertext to be send over wire, in bytes
         """
         plainbytes = request.encode()
-        return _UNSIGNED_INT_NETWORK_ORDER.pack(len(plainbytes)) + bytes(
-            XorEncryption._xor_payload(plainbytes)
-        )
+        return _UNSIGNED_INT_NETWORK_ORDER.pack(
+            len(plainbytes)
+        ) + XorEncryption._xor_payload(plainbytes)
 
     @staticmethod
-    def _xor_encrypted_payload(ciphertext: bytes) -> Generator[int, None, None]:
-        key = XorEncryption.INITIALIZATION_VECTOR
-        for cipherbyte in ciphertext:
-            plainbyte = key ^ cipherbyte
-            key = cipherbyte
-            yield plainbyte
+    def _xor_encrypted_payload(ciphertext: bytes) -> bytes:
+        """Decrypt the payload with the autokey cipher.
+
+        The key of every byte is the previous cipher byte so the payload is
+        decrypted by a single xor with itself shifted by one byte.
+        """
+        if not (length := len(ciphertext)):
+            return b""
+        value = int.from_bytes(ciphertext, "big")
+        key = (value >> 8) ^ (XorEncryption.INITIALIZATION_VECTOR << 8 * (length - 1))
+        return (value ^ key).to_bytes(length, "big")
 
     @staticmethod
     def decrypt(ciphertext: bytes) -> str:
@@ -234,7 +250,7 @@ class XorEncryption:
         :param ciphertext: encrypted response data
         :return: plaintext response
         """
-        return bytes(XorEncryption._xor_encrypted_payload(ciphertext)).decode()
+        return XorEncryption._xor_encrypted_payload(ciphertext).decode()
 
 
 # Try to load the kasa_crypt module and if it is available
@@ -19,7 +19,7 @@ from voluptuous import (
 
 from kasa import DeviceType, KasaException, Module
 from kasa.iot import IotDevice
-from kasa.iot.iotmodule import _merge_dict
+from kasa.iot.iotmodule import IotModule, _merge_dict
 from tests.conftest import get_device_for_fixture_protocol, handle_turn_on, turn_on
 from tests.device_fixtures import device_iot, has_emeter_iot, no_emeter_iot
 from tests.fakeprotocol_iot import FakeIotProtocol
@@ -310,3 +310,43 @@ def test_merge_dict() -> None:
             "get_daystat": {"month": 8, "year": 2024},
         }
     }
+
+
+@has_emeter_iot
+async def test_update_interval(dev: IotDevice, mocker: MockerFixture) -> None:
+    """Test that the statistics are only queried after the update interval."""
+    # Strips have the statistics on the children
+    emeter = (dev.children[0] if dev.children else dev).modules[Module.Energy]
+    assert isinstance(emeter, IotModule)
+    spy = mocker.spy(dev.protocol, "query")
+
+    await dev.update()
+    requests = str([call.args[0] for call in spy.call_args_list])
+    assert "get_realtime" in requests
+    assert "get_daystat" not in requests
+    assert "get_timezone" not in requests
+    assert "get_time" in requests
+
+    assert emeter._last_update_time
+    emeter._last_update_time -= emeter.update_interval
+    spy.reset_mock()
+    await dev.update()
+    requests = str([call.args[0] for call in spy.call_args_list])
+    assert "get_daystat" in requests
+    assert "get_monthstat" in requests
+
+
+@has_emeter_iot
+async def test_update_interval_reset_on_change(
+    dev: IotDevice, mocker: MockerFixture
+) -> None:
+    """Test that changing a module value resets the update interval."""
+    emeter = dev.modules[Module.Energy]
+    assert isinstance(emeter, IotModule)
+    mocker.patch.object(dev, "_query_helper", return_value={})
+
+    await emeter.call("get_daystat", {"year": 2024, "month": 1})
+    assert emeter._last_update_time is not None
+
+    await emeter.call("erase_emeter_stat")
+    assert emeter._last_update_time is None
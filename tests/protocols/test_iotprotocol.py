@@ -8,6 +8,7 @@ import json
 import logging
 import os
 import pkgutil
+import random
 import struct
 import sys
 from typing import cast
@@ -654,6 +655,20 @@ def test_encrypt(encrypt_class, decrypt_class) -> None:
     assert d == decrypt_class.decrypt(encrypted)
 
 
+@pytest.mark.parametrize("length", [0, 1, 2, 3, 8, 9, 255, 4097])
+def test_xor_payload(length: int) -> None:
+    """Test the xor fallback against a byte by byte implementation."""
+    plainbytes = bytes(random.randrange(256) for _ in range(length))  # noqa: S311
+    key = XorEncryption.INITIALIZATION_VECTOR
+    expected = bytearray()
+    for plainbyte in plainbytes:
+        key ^= plainbyte
+        expected.append(key)
+
+    assert XorEncryption._xor_payload(plainbytes) == expected
+    assert XorEncryption._xor_encrypted_payload(bytes(expected)) == plainbytes
+
+
 @pytest.mark.parametrize(
     "encrypt_class",
     [_deprecated_TPLinkSmartHomeProtocol, XorEncryption],
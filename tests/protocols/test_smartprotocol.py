@@ -1,17 +1,22 @@
+import asyncio
 import logging
 
 import pytest
 import pytest_mock
 from pytest_mock import MockerFixture
 
+from kasa.deviceconfig import DeviceConfig
 from kasa.exceptions import (
     SMART_RETRYABLE_ERRORS,
     DeviceError,
     KasaException,
     SmartErrorCode,
+    _ConnectionError,
 )
+from kasa.json import loads as json_loads
 from kasa.protocols.smartcamprotocol import SmartCamProtocol
 from kasa.protocols.smartprotocol import SmartProtocol, _ChildProtocolWrapper
+from kasa.sessionstore import MemorySessionStore
 from kasa.smart import SmartDevice
 
 from ..conftest import device_smart
@@ -26,6 +31,19 @@ DUMMY_MULTIPLE_QUERY = {
 ERRORS = [e for e in SmartErrorCode if e != 0]
 
 
+def _multiple_request_response(request: str) -> dict:
+    """Return a successful response to a multipleRequest."""
+    return {
+        "result": {
+            "responses": [
+                {"method": req["method"], "result": {}, "error_code": 0}
+                for req in json_loads(request)["params"]["requests"]
+            ]
+        },
+        "error_code": 0,
+    }
+
+
 async def test_smart_queries(
     dummy_protocol: SmartProtocol, mocker: pytest_mock.MockerFixture
 ) -> None:
@@ -178,6 +196,35 @@ async def test_smart_device_multiple_request_json_decode_failure(
     assert send_mock.call_count == len(requests) + 1
 
 
+async def test_smart_device_multiple_request_json_decode_failure_adaptive(
+    dummy_protocol: SmartProtocol, mocker: MockerFixture
+) -> None:
+    """Test the logic to reduce the batch size on JSON_DECODE_FAIL_ERROR."""
+    requests = {f"get_method_{i}": {"foo": "bar", "bar": "foo"} for i in range(10)}
+
+    mock_json_error = {
+        "result": {"responses": []},
+        "error_code": SmartErrorCode.JSON_DECODE_FAIL_ERROR.value,
+    }
+    responses = iter([mock_json_error])
+
+    async def _send(request: str) -> dict:
+        return next(responses, None) or _multiple_request_response(request)
+
+    send_mock = mocker.patch.object(
+        dummy_protocol._transport, "send", side_effect=_send
+    )
+    dummy_protocol._adaptive_batch_size = True
+    dummy_protocol._multi_request_batch_size = 5
+    assert dummy_protocol._multi_request_batch_size == 5
+    resp = await dummy_protocol.query(requests, retry_count=1)
+    assert list(resp) == list(requests)
+    assert dummy_protocol._multi_request_batch_size == 2
+    assert dummy_protocol._multi_request_batch_limit == 4
+    # Call count should be the first error + number of batches of 2
+    assert send_mock.call_count == 1 + 5
+
+
 async def test_smart_device_multiple_request_json_decode_failure_twice(
     dummy_protocol: SmartProtocol, mocker: MockerFixture
 ) -> None:
@@ -235,6 +282,204 @@ async def test_smart_device_multiple_request_non_json_decode_failure(
     assert send_mock.call_count == 1
 
 
+async def test_smart_device_multiple_request_fixed_batch_size(
+    dummy_protocol: SmartProtocol, mocker: MockerFixture
+) -> None:
+    """Test that the batch size is only adapted when enabled in the config."""
+    requests = {f"get_method_{i}": None for i in range(10)}
+    mocker.patch.object(
+        dummy_protocol._transport, "send", side_effect=_multiple_request_response
+    )
+
+    for _ in range(SmartProtocol.MULTI_REQUEST_PROBE_AFTER + 1):
+        await dummy_protocol.query(requests)
+    assert dummy_protocol._multi_request_batch_size == 5
+    assert dummy_protocol._multi_request_batch_limit == 5
+
+    transport_class = type(dummy_protocol._transport)
+    config = DeviceConfig("127.0.0.1", adaptive_batch_size=True)
+    protocol = SmartProtocol(transport=transport_class(config=config))
+    assert protocol._multi_request_batch_limit == protocol.MAX_MULTI_REQUEST_BATCH_SIZE
+    config = DeviceConfig("127.0.0.1", adaptive_batch_size=True, batch_size=3)
+    protocol = SmartProtocol(transport=transport_class(config=config))
+    assert protocol._multi_request_batch_limit == 3
+
+
+async def test_smart_device_multiple_request_disabled_stays_disabled(
+    dummy_protocol: SmartProtocol, mocker: MockerFixture
+) -> None:
+    """Test that disabled multiple requests are not probed again."""
+    requests = {f"get_method_{i}": None for i in range(10)}
+    mock_json_error = {
+        "result": {"responses": []},
+        "error_code": SmartErrorCode.JSON_DECODE_FAIL_ERROR.value,
+    }
+    failed = False
+
+    def _response(request: str) -> dict:
+        nonlocal failed
+        if json_loads(request)["method"] != "multipleRequest":
+            return {"result": {}, "error_code": 0}
+        if not failed:
+            failed = True
+            return mock_json_error
+        return _multiple_request_response(request)
+
+    mocker.patch.object(dummy_protocol._transport, "send", side_effect=_response)
+
+    await dummy_protocol.query(requests, retry_count=1)
+    assert dummy_protocol._multi_request_batch_size == 1
+
+    for _ in range(SmartProtocol.MULTI_REQUEST_PROBE_AFTER * 2):
+        await dummy_protocol.query(requests)
+    assert dummy_protocol._multi_request_batch_size == 1
+
+
+async def test_smart_device_multiple_request_probe_batch_size(
+    dummy_protocol: SmartProtocol, mocker: MockerFixture
+) -> None:
+    """Test that larger batch sizes are probed after successful queries."""
+    requests = {f"get_method_{i}": None for i in range(10)}
+    mocker.patch.object(
+        dummy_protocol._transport, "send", side_effect=_multiple_request_response
+    )
+    dummy_protocol._adaptive_batch_size = True
+    dummy_protocol._multi_request_batch_size = 2
+    dummy_protocol._multi_request_batch_limit = 3
+
+    for _ in range(SmartProtocol.MULTI_REQUEST_PROBE_AFTER - 1):
+        await dummy_protocol.query(requests)
+    assert dummy_protocol._multi_request_batch_size == 2
+
+    await dummy_protocol.query(requests)
+    assert dummy_protocol._multi_request_batch_size == 3
+
+    # Never probe beyond the learned limit
+    for _ in range(SmartProtocol.MULTI_REQUEST_PROBE_AFTER):
+        await dummy_protocol.query(requests)
+    assert dummy_protocol._multi_request_batch_size == 3
+
+
+async def test_smart_device_multiple_request_batch_size_response_size(
+    dummy_protocol: SmartProtocol, mocker: MockerFixture
+) -> None:
+    """Test that batch sizes with too large responses are not probed."""
+    requests = {f"get_method_{i}": None for i in range(10)}
+    mocker.patch.object(
+        dummy_protocol._transport, "send", side_effect=_multiple_request_response
+    )
+    dummy_protocol._adaptive_batch_size = True
+    dummy_protocol._multi_request_batch_size = 2
+    dummy_protocol._multi_request_failed_response_size = 1
+
+    for _ in range(SmartProtocol.MULTI_REQUEST_PROBE_AFTER):
+        await dummy_protocol.query(requests)
+    assert dummy_protocol._multi_request_batch_size == 2
+    assert dummy_protocol._multi_request_batch_limit == 2
+
+
+async def test_smart_device_multiple_request_batch_size_store(
+    dummy_protocol: SmartProtocol, mocker: MockerFixture
+) -> None:
+    """Test that the learned batch size is persisted per model and firmware."""
+    store = MemorySessionStore()
+    dummy_protocol._transport._config.session_store = store
+    dummy_protocol._transport._config.adaptive_batch_size = True
+    dummy_protocol._adaptive_batch_size = True
+    requests = {f"get_method_{i}": None for i in range(10)}
+    device_info = {"model": "P100", "fw_ver": "1.0.0 Build 1"}
+
+    async def _send(request: str) -> dict:
+        method = json_loads(request)["method"]
+        if method == "multipleRequest":
+            return _multiple_request_response(request)
+        if method == "get_device_info":
+            return {"result": device_info, "error_code": 0}
+        return {"result": {}, "error_code": 0}
+
+    mocker.patch.object(dummy_protocol._transport, "send", side_effect=_send)
+
+    # Nothing is stored until the model is known
+    dummy_protocol._on_multi_request_failure(3)
+    await dummy_protocol.query(requests)
+    assert store._sessions == {}
+
+    await dummy_protocol.query("get_device_info")
+    key = "batch_size:P100:1.0.0 Build 1"
+    assert await store.load(key) == {"batch_size": 1, "batch_limit": 2}
+
+    # A new protocol starts with the learned batch size
+    protocol = SmartProtocol(transport=dummy_protocol._transport)
+    assert protocol._multi_request_batch_size == 5
+    await protocol.query("get_device_info")
+    assert protocol._multi_request_batch_size == 1
+    assert protocol._multi_request_batch_limit == 2
+
+
+async def test_smart_device_multiple_request_concurrent(
+    dummy_protocol: SmartProtocol, mocker: MockerFixture
+) -> None:
+    """Test that batches are sent concurrently up to the configured limit."""
+    requests = {f"get_method_{i}": None for i in range(10)}
+    in_flight = 0
+    max_in_flight = 0
+
+    async def _send(request: str) -> dict:
+        nonlocal in_flight, max_in_flight
+        in_flight += 1
+        max_in_flight = max(max_in_flight, in_flight)
+        await asyncio.sleep(0)
+        in_flight -= 1
+        return _multiple_request_response(request)
+
+    send_mock = mocker.patch.object(
+        dummy_protocol._transport, "send", side_effect=_send
+    )
+    dummy_protocol._multi_request_batch_size = 2
+    dummy_protocol._concurrent_requests = 3
+    dummy_protocol._request_semaphore = asyncio.Semaphore(3)
+
+    resp = await dummy_protocol.query(requests, retry_count=0)
+    assert list(resp) == list(requests)
+    assert send_mock.call_count == 5
+    assert max_in_flight == 3
+
+
+async def test_smart_device_multiple_request_concurrent_fallback(
+    dummy_protocol: SmartProtocol, mocker: MockerFixture
+) -> None:
+    """Test that requests are sent sequentially after a concurrent failure."""
+    requests = {f"get_method_{i}": None for i in range(4)}
+    mock_response = {
+        "result": {
+            "responses": [
+                {"method": method, "result": {}, "error_code": 0} for method in requests
+            ]
+        },
+        "error_code": 0,
+    }
+    send_mock = mocker.patch.object(
+        dummy_protocol._transport,
+        "send",
+        side_effect=[
+            _ConnectionError("foo"),
+            mock_response,
+            mock_response,
+            mock_response,
+        ],
+    )
+    dummy_protocol._multi_request_batch_size = 2
+    dummy_protocol._concurrent_requests = 2
+    dummy_protocol._request_semaphore = asyncio.Semaphore(2)
+
+    resp = await dummy_protocol.query(requests, retry_count=1)
+    assert list(resp) == list(requests)
+    assert dummy_protocol._concurrent_requests == 1
+    assert dummy_protocol._request_semaphore is None
+    # The second batch was already in flight when the first one failed
+    assert send_mock.call_count == 4
+
+
 async def test_childdevicewrapper_unwrapping(
     dummy_protocol: SmartProtocol, mocker: MockerFixture
 ) -> None:
@@ -331,6 +576,141 @@ async def test_childdevicewrapper_multiplerequest_error(
     assert res["invalid_command"] == SmartErrorCode(-1001)
 
 
+def _child_response(child_request: dict, error_code: int = 0) -> dict:
+    """Return a response to a control_child request echoing the child id."""
+    return {
+        "error_code": error_code,
+        "result": {
+            "responseData": {
+                "error_code": 0,
+                "result": {"device_id": child_request["device_id"]},
+            }
+        },
+    }
+
+
+async def test_childdevicewrapper_batch(
+    dummy_protocol: SmartProtocol, mocker: MockerFixture
+) -> None:
+    """Test that concurrent child requests are sent in a single request."""
+
+    async def _send(request: str) -> dict:
+        request_dict = json_loads(request)
+        assert request_dict["method"] == "multipleRequest"
+        responses = [
+            {"method": req["method"], **_child_response(req["params"])}
+            for req in request_dict["params"]["requests"]
+        ]
+        return {"error_code": 0, "result": {"responses": responses}}
+
+    send_mock = mocker.patch.object(
+        dummy_protocol._transport, "send", side_effect=_send
+    )
+    wrappers = [_ChildProtocolWrapper(f"child{i}", dummy_protocol) for i in range(3)]
+
+    results = await asyncio.gather(
+        *(wrapper.query(DUMMY_QUERY) for wrapper in wrappers)
+    )
+
+    assert results == [{"foobar": {"device_id": f"child{i}"}} for i in range(3)]
+    assert send_mock.call_count == 1
+
+
+async def test_childdevicewrapper_batch_error(
+    dummy_protocol: SmartProtocol, mocker: MockerFixture
+) -> None:
+    """Test that failed child requests of a batch are resent separately."""
+
+    async def _send(request: str) -> dict:
+        request_dict = json_loads(request)
+        if request_dict["method"] == "control_child":
+            return _child_response(
+                request_dict["params"], error_code=SmartErrorCode.PARAMS_ERROR.value
+            )
+        # The device stops at the first error
+        first, *_ = request_dict["params"]["requests"]
+        responses = [
+            {"method": first["method"], **_child_response(first["params"])},
+            {
+                "method": "control_child",
+                "error_code": SmartErrorCode.PARAMS_ERROR.value,
+            },
+        ]
+        return {"error_code": 0, "result": {"responses": responses}}
+
+    send_mock = mocker.patch.object(
+        dummy_protocol._transport, "send", side_effect=_send
+    )
+    wrappers = [_ChildProtocolWrapper(f"child{i}", dummy_protocol) for i in range(3)]
+
+    results = await asyncio.gather(
+        *(wrapper.query(DUMMY_QUERY) for wrapper in wrappers),
+        return_exceptions=True,
+    )
+
+    assert results[0] == {"foobar": {"device_id": "child0"}}
+    assert all(isinstance(result, DeviceError) for result in results[1:])
+    assert send_mock.call_count == 3
+    assert dummy_protocol._batch_child_requests is True
+
+
+async def test_childdevicewrapper_batch_unsupported(
+    dummy_protocol: SmartProtocol, mocker: MockerFixture
+) -> None:
+    """Test that child requests are sent separately if batches are rejected."""
+
+    async def _send(request: str) -> dict:
+        request_dict = json_loads(request)
+        if request_dict["method"] == "multipleRequest":
+            return {"error_code": SmartErrorCode.PARAMS_ERROR.value}
+        return _child_response(request_dict["params"])
+
+    send_mock = mocker.patch.object(
+        dummy_protocol._transport, "send", side_effect=_send
+    )
+    wrappers = [_ChildProtocolWrapper(f"child{i}", dummy_protocol) for i in range(2)]
+
+    results = await asyncio.gather(
+        *(wrapper.query(DUMMY_QUERY) for wrapper in wrappers)
+    )
+    assert results == [{"foobar": {"device_id": f"child{i}"}} for i in range(2)]
+    assert send_mock.call_count == 3
+    assert dummy_protocol._batch_child_requests is False
+
+    await asyncio.gather(*(wrapper.query(DUMMY_QUERY) for wrapper in wrappers))
+    assert send_mock.call_count == 5
+
+
+async def test_childdevicewrapper_lists(
+    dummy_protocol: SmartProtocol, mocker: MockerFixture
+) -> None:
+    """Test that the list pages of child responses are fetched."""
+    items = [{"id": i} for i in range(5)]
+
+    async def _send(request: str) -> dict:
+        request_data = json_loads(request)["params"]["requestData"]
+        start_index = (request_data["params"] or {}).get("start_index", 0)
+        result = {
+            "rule_list": items[start_index : start_index + 2],
+            "start_index": start_index,
+            "sum": len(items),
+        }
+        return {
+            "error_code": 0,
+            "result": {"responseData": {"error_code": 0, "result": result}},
+        }
+
+    send_mock = mocker.patch.object(
+        dummy_protocol._transport, "send", side_effect=_send
+    )
+    wrapped_protocol = _ChildProtocolWrapper("dummyid", dummy_protocol)
+
+    resp = await wrapped_protocol.query({"get_rules": None})
+
+    assert resp["get_rules"]["rule_list"] == items
+    assert send_mock.call_count == 3
+
+
 @pytest.mark.parametrize("list_sum", [5, 10, 30])
 @pytest.mark.parametrize("batch_size", [1, 2, 3, 50])
 async def test_smart_protocol_lists_single_request(
@@ -361,6 +741,37 @@ async def test_smart_protocol_lists_single_request(
     assert resp == response
 
 
+@pytest.mark.parametrize("list_sum", [5, 10, 30])
+@pytest.mark.parametrize("batch_size", [1, 2, 3, 50])
+async def test_smart_protocol_lists_concurrent_pages(
+    mocker: MockerFixture, list_sum: int, batch_size: int
+) -> None:
+    child_device_list = [{"foo": i} for i in range(list_sum)]
+    response = {
+        "get_child_device_list": {
+            "child_device_list": child_device_list,
+            "start_index": 0,
+            "sum": list_sum,
+        }
+    }
+    request = {"get_child_device_list": None}
+
+    ft = FakeSmartTransport(
+        response,
+        "foobar",
+        list_return_size=batch_size,
+        component_nego_not_included=True,
+        get_child_fixtures=False,
+    )
+    ft._config.max_concurrent_requests = 4
+    protocol = SmartProtocol(transport=ft)
+    query_spy = mocker.spy(protocol, "_execute_query")
+    resp = await protocol.query(request)
+    expected_count = int(list_sum / batch_size) + (1 if list_sum % batch_size else 0)
+    assert query_spy.call_count == expected_count
+    assert resp == response
+
+
 @pytest.mark.parametrize("list_sum", [5, 10, 30])
 @pytest.mark.parametrize("batch_size", [1, 2, 3, 50])
 async def test_smart_protocol_lists_multiple_request(
@@ -17,6 +17,7 @@ from kasa import Device, DeviceType, KasaException, Module
 from kasa.exceptions import DeviceError, SmartErrorCode
 from kasa.smart import SmartDevice
 from kasa.smart.modules.energy import Energy
+from kasa.smart.smartchilddevice import SmartChildDevice
 from kasa.smart.smartmodule import SmartModule
 from kasa.smartcam import SmartCamDevice
 from tests.conftest import (
@@ -250,6 +251,31 @@ async def _get_child_responses(child_requests: list[dict[str, Any]], child_proto
     ]
 
 
+def _split_child_batches(query):
+    """Answer batched control_child requests by querying each child separately."""
+
+    async def _query(request, *args, **kwargs):
+        if (
+            (mr := request.get("multipleRequest"))
+            and (requests := mr.get("requests"))
+            and all(req["method"] == "control_child" for req in requests)
+        ):
+            responses = []
+            for req in requests:
+                resp = await query({"control_child": req["params"]}, *args, **kwargs)
+                responses.append(
+                    {
+                        "method": "control_child",
+                        "result": resp["control_child"],
+                        "error_code": 0,
+                    }
+                )
+            return {"multipleRequest": {"responses": responses}}
+        return await query(request, *args, **kwargs)
+
+    return _query
+
+
 @hub_all
 @pytest.mark.xdist_group(name="caplog")
 async def test_hub_children_update_delays(
@@ -342,7 +368,9 @@ async def test_hub_children_update_delays(
 
         return resp
 
-    mocker.patch.object(new_dev.protocol, "query", side_effect=_query)
+    mocker.patch.object(
+        new_dev.protocol, "query", side_effect=_split_child_batches(_query)
+    )
 
     first_update_time = time.monotonic()
     assert new_dev._last_update_time == first_update_time
@@ -524,7 +552,9 @@ async def test_update_module_query_errors(
             raise TimeoutError("Dummy timeout")
         raise error_type
 
-    mocker.patch.object(new_dev.protocol, "query", side_effect=_query)
+    mocker.patch.object(
+        new_dev.protocol, "query", side_effect=_split_child_batches(_query)
+    )
 
     await new_dev.update()
 
@@ -1015,3 +1045,36 @@ async def test_unpair(dev: SmartDevice, mocker: MockerFixture) -> None:
     await unpair_feat.set_value(None)
 
     unpair_call.assert_called_with(child.device_id)
+
+
+@hubs_smart
+async def test_lazy_children(dev: SmartDevice, mocker: MockerFixture) -> None:
+    """Test that lazily created children are only updated once used."""
+    if not dev.children:
+        pytest.skip("device has no children")
+
+    new_dev = SmartDevice("127.0.0.1", protocol=dev.protocol)
+    mocker.patch.object(new_dev.config, "lazy_children", True)
+    await new_dev.update()
+
+    assert len(new_dev.children) == len(dev.children)
+    used, *unused = cast(list[SmartChildDevice], new_dev.children)
+    for child in new_dev.children:
+        assert child.alias == dev._children[child.device_id].alias
+        assert not child._modules
+        assert not child._features
+
+    updates = [mocker.spy(child, "_update") for child in unused]
+    assert used.modules == {}
+    await new_dev.update()
+
+    expected = dev._children[used.device_id]
+    assert used.modules.keys() == expected.modules.keys()
+    assert used.features.keys() == expected.features.keys()
+    for update in updates:
+        update.assert_not_called()
+
+    if unused:
+        child = unused[0]
+        await child.update()
+        assert child.modules.keys() == dev._children[child.device_id].modules.keys()
@@ -2,18 +2,28 @@
 
 from __future__ import annotations
 
+import asyncio
 import importlib
 import inspect
 import pkgutil
 import sys
 import zoneinfo
 from contextlib import AbstractContextManager, nullcontext
-from unittest.mock import AsyncMock, patch
+from unittest.mock import AsyncMock, Mock, patch
 
 import pytest
 
 import kasa
-from kasa import Credentials, Device, DeviceConfig, DeviceType, KasaException, Module
+from kasa import (
+    Credentials,
+    Device,
+    DeviceConfig,
+    DeviceType,
+    Feature,
+    FeatureChange,
+    KasaException,
+    Module,
+)
 from kasa.iot import (
     IotBulb,
     IotCamera,
@@ -33,6 +43,9 @@ from kasa.iot.modules import IotLightPreset
 from kasa.smart import SmartChildDevice, SmartDevice
 from kasa.smartcam import SmartCamChild, SmartCamDevice
 
+from .conftest import plug, strip
+from .device_fixtures import device_smart
+
 
 def _get_subclasses(of_class):
     package = sys.modules["kasa"]
@@ -180,6 +193,7 @@ async def test_create_thin_wrapper():
     connect.assert_called_once_with(
         host=None,
         config=config,
+        registry=None,
     )
 
 
@@ -427,3 +441,145 @@ async def test_device_timezones():
     # Try a timezone not hardcoded no match
     with pytest.raises(zoneinfo.ZoneInfoNotFoundError):
         await get_timezone_index(zoneinfo.ZoneInfo("Foo/bar"))
+
+
+@plug
+@pytest.mark.xdist_group(name="caplog")
+async def test_subscribe_feature_change(dev: Device, caplog: pytest.LogCaptureFixture):
+    """Test that subscribers are notified of changed features only."""
+    changes: list[FeatureChange] = []
+    all_changes: list[FeatureChange] = []
+    unsubscribe = dev.subscribe(changes.append, "state")
+    dev.subscribe(all_changes.append)
+
+    await dev.update()
+    assert changes == []
+    assert all_changes == []
+
+    state = dev.is_on
+    await dev.set_state(not state)
+    await dev.update()
+    assert len(changes) == 1
+    assert changes[0].feature is dev.features["state"]
+    assert changes[0].old_value is state
+    assert changes[0].new_value is not state
+    assert changes[0] in all_changes
+
+    unsubscribe()
+    dev.subscribe(Mock(side_effect=Exception("callback error")), "state")
+    await dev.set_state(state)
+    await dev.update()
+    assert len(changes) == 1
+    assert "Error notifying change of state" in caplog.text
+
+
+@plug
+async def test_subscribe_again_after_unsubscribe(dev: Device):
+    """Test that a new subscription does not report changes made before it."""
+    unsubscribe = dev.subscribe(Mock(), "state")
+    unsubscribe()
+
+    state = dev.is_on
+    await dev.set_state(not state)
+    await dev.update()
+
+    callback = Mock()
+    dev.subscribe(callback, "state")
+    await dev.update()
+    callback.assert_not_called()
+
+
+@strip
+async def test_subscribe_child_feature_change(dev: Device):
+    """Test that child subscribers are notified by the parent update."""
+    child = dev.children[0]
+    callback = AsyncMock()
+    child.subscribe(callback, "state")
+
+    state = child.is_on
+    await child.set_state(not state)
+    await dev.update()
+    callback.assert_awaited_once()
+    assert callback.await_args is not None
+    change = callback.await_args.args[0]
+    assert change.feature is child.features["state"]
+    assert change.new_value is not state
+
+
+@strip
+@pytest.mark.parametrize("max_concurrent", [1, 2])
+async def test_update_children_concurrently(dev: Device, mocker, max_concurrent):
+    """Test that the child updates run concurrently up to the limit."""
+    running = 0
+    max_running = 0
+
+    async def _update(*args, **kwargs):
+        nonlocal running, max_running
+        running += 1
+        max_running = max(max_running, running)
+        await asyncio.sleep(0)
+        running -= 1
+
+    updates = [
+        mocker.patch.object(child, "_update", side_effect=_update)
+        for child in dev.children
+    ]
+    mocker.patch.object(dev, "MAX_CONCURRENT_CHILD_UPDATES", max_concurrent)
+
+    await dev.update()
+
+    assert max_running == min(max_concurrent, len(dev.children))
+    for update in updates:
+        update.assert_awaited_once()
+
+
+@strip
+async def test_update_children_error(dev: Device, mocker):
+    """Test that a failing child update cancels the other child updates."""
+    started = asyncio.Event()
+
+    async def _update(*args, **kwargs):
+        started.set()
+        await asyncio.Event().wait()
+
+    async def _fail(*args, **kwargs):
+        await started.wait()
+        raise KasaException("child failed")
+
+    first, *others = dev.children
+    mocker.patch.object(first, "_update", side_effect=_fail)
+    updates = [
+        mocker.patch.object(child, "_update", side_effect=_update) for child in others
+    ]
+
+    with pytest.raises(KasaException, match="child failed"):
+        await dev.update()
+    assert all(update.await_count == 1 for update in updates)
+
+
+async def test_snapshot(dev: Device):
+    snapshot = dev.snapshot()
+
+    for feature in dev.features.values():
+        if feature.type is Feature.Type.Action:
+            assert feature.id not in snapshot
+            continue
+        try:
+            value = feature.value
+        except Exception:
+            assert feature.id not in snapshot
+            continue
+        assert feature.id in snapshot
+        assert snapshot[feature.id] == value
+    with pytest.raises(TypeError):
+        snapshot["new"] = 1  # type: ignore[index]
+
+
+@device_smart
+async def test_snapshot_module_data(dev: Device, mocker):
+    queries = [mocker.spy(module, "query") for module in dev.modules.values()]
+
+    dev.snapshot()
+
+    assert all(query.call_count <= 1 for query in queries)
+    assert any(query.call_count == 1 for query in queries)
@@ -36,7 +36,9 @@ from kasa.deviceconfig import (
     DeviceEncryptionType,
     DeviceFamily,
 )
+from kasa.deviceregistry import DeviceRegistry, _restore_config
 from kasa.discover import DiscoveryResult
+from kasa.sessionstore import FileSessionStore, MemorySessionStore
 from kasa.transports import (
     AesTransport,
     BaseTransport,
@@ -295,3 +297,122 @@ async def test_get_protocol(
     protocol = get_protocol(config)
     assert isinstance(protocol, expected_protocol)
     assert isinstance(protocol._transport, expected_transport)
+
+
+async def test_connect_registry(discovery_mock, mocker, tmp_path):
+    """Test that devices are restored from the registry with fewer queries."""
+    host = DISCOVERY_MOCK_IP
+    ctype, device_class = _get_connection_type_device_class(
+        discovery_mock.discovery_data
+    )
+    store = FileSessionStore(tmp_path / "devices.json")
+    registry = DeviceRegistry(store)
+    config = DeviceConfig(
+        host=host, credentials=Credentials("foor", "bar"), connection_type=ctype
+    )
+    query_spy = mocker.spy(get_protocol(config).__class__, "query")
+
+    dev = await connect(config=config, registry=registry)
+    assert (entry := await registry.load(host))
+    assert entry["firmware"] == dev.device_info.firmware_version
+    assert "credentials" not in entry["config"]
+    fresh_queries = query_spy.call_count
+    await dev.disconnect()
+    await store.close()
+
+    query_spy.reset_mock()
+    registry = DeviceRegistry(FileSessionStore(tmp_path / "devices.json"))
+    config = DeviceConfig(host=host, credentials=Credentials("foor", "bar"))
+    restored = await connect(config=config, registry=registry)
+    assert isinstance(restored, device_class)
+    assert restored.config.connection_type == ctype
+    assert restored.features.keys() == dev.features.keys()
+    assert restored.modules.keys() == dev.modules.keys()
+    assert query_spy.call_count < fresh_queries
+    await restored.disconnect()
+
+
+async def test_connect_registry_firmware_changed(discovery_mock, mocker):
+    """Test that a registry entry of an older firmware is replaced."""
+    host = DISCOVERY_MOCK_IP
+    ctype, device_class = _get_connection_type_device_class(
+        discovery_mock.discovery_data
+    )
+    registry = DeviceRegistry(MemorySessionStore())
+    config = DeviceConfig(
+        host=host, credentials=Credentials("foor", "bar"), connection_type=ctype
+    )
+    dev = await connect(config=config, registry=registry)
+    await dev.disconnect()
+    entry = await registry.load(host)
+    assert entry
+    await registry._store.save(
+        DeviceRegistry._key(host), {**entry, "firmware": "0.0.1"}
+    )
+
+    restore_spy = mocker.spy(device_class, "_restore_initialization")
+    dev = await connect(config=config, registry=registry)
+    assert restore_spy.call_count == 1
+    assert isinstance(dev, device_class)
+    assert dev._restored_initialization is False
+    entry = await registry.load(host)
+    assert entry
+    assert entry["firmware"] == dev.device_info.firmware_version
+    await dev.disconnect()
+
+
+async def test_connect_registry_restore_failure(discovery_mock, mocker):
+    """Test that a registry entry failing to connect is replaced."""
+    host = DISCOVERY_MOCK_IP
+    ctype, device_class = _get_connection_type_device_class(
+        discovery_mock.discovery_data
+    )
+    registry = DeviceRegistry(MemorySessionStore())
+    config = DeviceConfig(
+        host=host, credentials=Credentials("foor", "bar"), connection_type=ctype
+    )
+    dev = await connect(config=config, registry=registry)
+    await dev.disconnect()
+
+    mocker.patch(
+        "kasa.device_factory._connect_restored",
+        side_effect=KasaException("Restore failed"),
+    )
+    delete_spy = mocker.spy(registry, "delete")
+    dev = await connect(config=config, registry=registry)
+    assert isinstance(dev, device_class)
+    delete_spy.assert_called_once_with(host)
+    assert await registry.load(host)
+    await dev.disconnect()
+
+
+async def test_connect_registry_save_failure(discovery_mock, mocker):
+    """Test that the device is closed if it cannot be added to the registry."""
+    host = DISCOVERY_MOCK_IP
+    ctype, device_class = _get_connection_type_device_class(
+        discovery_mock.discovery_data
+    )
+    registry = DeviceRegistry(MemorySessionStore())
+    config = DeviceConfig(
+        host=host, credentials=Credentials("foor", "bar"), connection_type=ctype
+    )
+    mocker.patch.object(registry, "save", side_effect=KasaException("Save failed"))
+    disconnect_spy = mocker.spy(device_class, "disconnect")
+    with pytest.raises(KasaException, match="Save failed"):
+        await connect(config=config, registry=registry)
+    disconnect_spy.assert_called_once()
+
+
+def test_restore_config_connection_type():
+    """Test that the stored connection type does not override a given one."""
+    stored = DeviceConnectionParameters(
+        DeviceFamily.SmartTapoPlug, DeviceEncryptionType.Klap
+    )
+    entry = {"config": DeviceConfig("127.0.0.1", connection_type=stored).to_dict()}
+    assert _restore_config(DeviceConfig("127.0.0.1"), entry).connection_type == stored
+
+    given = DeviceConnectionParameters(
+        DeviceFamily.SmartTapoPlug, DeviceEncryptionType.Aes
+    )
+    config = DeviceConfig("127.0.0.1", connection_type=given)
+    assert _restore_config(config, entry).connection_type == given
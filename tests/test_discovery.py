@@ -3,12 +3,13 @@
 
 import asyncio
 import base64
+import copy
 import json
 import logging
 import re
 import socket
 from asyncio import timeout as asyncio_timeout
-from unittest.mock import MagicMock
+from unittest.mock import AsyncMock, MagicMock
 
 import aiohttp
 import pytest  # type: ignore # https://github.com/pytest-dev/pytest/issues/3342
@@ -33,9 +34,14 @@ from kasa.deviceconfig import (
     DeviceConnectionParameters,
 )
 from kasa.discover import (
+    ConnectAttempt,
+    DiscoveryCache,
+    DiscoveryDelta,
     DiscoveryResult,
+    DiscoveryStats,
     _AesDiscoveryQuery,
     _DiscoverProtocol,
+    _SweepDiscoverProtocol,
     json_dumps,
 )
 from kasa.exceptions import AuthenticationError, UnsupportedDeviceError
@@ -46,12 +52,15 @@ from kasa.transports.xortransport import XorEncryption, XorTransport
 from .conftest import (
     bulb_iot,
     dimmer_iot,
+    get_fixture_info,
     lightstrip_iot,
     new_discovery,
+    patch_discovery,
     plug_iot,
     strip_iot,
     wallswitch_iot,
 )
+from .fixtureinfo import FixtureInfo
 
 # A physical device has to respond to discovery for the tests to work.
 pytestmark = [pytest.mark.requires_dummy]
@@ -561,6 +570,192 @@ async def test_discover_propogates_task_exceptions(discovery_mock):
         )
 
 
+@pytest.mark.parametrize("update", [True, False], ids=["update", "no update"])
+async def test_iter_discover(discovery_mock, update, mocker):
+    """Make sure that iter_discover yields the discovered devices."""
+    update_spy = mocker.spy(Discover, "_update_discovered")
+    devices = [
+        dev async for dev in Discover.iter_discover(discovery_timeout=0, update=update)
+    ]
+    assert [dev.host for dev in devices] == [discovery_mock.ip]
+    assert update_spy.call_count == int(update)
+
+
+@pytest.fixture
+def iter_discover_mock(mocker):
+    fixture_infos = {
+        ip: FixtureInfo(fi.name, fi.protocol, copy.deepcopy(fi.data))
+        for ip, fi in {
+            "127.0.0.1": get_fixture_info("KP303(UK)_1.0_1.0.3.json", "IOT"),
+            "127.0.0.2": get_fixture_info("HS110(EU)_1.0_1.2.5.json", "IOT"),
+            "127.0.0.3": get_fixture_info("L530E(EU)_3.0_1.1.6.json", "SMART"),
+        }.items()
+    }
+    patch_discovery(fixture_infos, mocker)
+    return fixture_infos
+
+
+async def test_iter_discover_max_devices(iter_discover_mock):
+    """Make sure that iter_discover stops after max_devices."""
+    devices = [
+        dev
+        async for dev in Discover.iter_discover(
+            discovery_timeout=0, update=True, max_devices=2
+        )
+    ]
+    # The devices are yielded in the order their updates complete
+    assert len({dev.host for dev in devices}) == 2
+
+
+async def test_iter_discover_macs(iter_discover_mock):
+    """Make sure that iter_discover stops once the given macs are found."""
+    sys_info = iter_discover_mock["127.0.0.2"].data["system"]["get_sysinfo"]
+    devices = [
+        dev
+        async for dev in Discover.iter_discover(
+            discovery_timeout=0, macs=[sys_info["mac"].lower()]
+        )
+    ]
+    assert [dev.host for dev in devices] == ["127.0.0.1", "127.0.0.2"]
+
+
+async def test_iter_discover_update_error(iter_discover_mock, mocker):
+    """Make sure that devices failing to update are skipped."""
+    mocker.patch.object(
+        IotDevice, "update", side_effect=KasaException("Dummy exception")
+    )
+    devices = [
+        dev async for dev in Discover.iter_discover(discovery_timeout=0, update=True)
+    ]
+    assert [dev.host for dev in devices] == ["127.0.0.3"]
+
+
+async def test_iter_discover_propagates_task_exceptions(discovery_mock, mocker):
+    """Make sure that iter_discover propagates discovery exceptions."""
+
+    async def on_unsupported(ex):
+        raise KasaException("Dummy exception")
+
+    mocker.patch.object(
+        Discover,
+        "_get_device_instance_legacy",
+        side_effect=UnsupportedDeviceError("Unsupported"),
+    )
+    mocker.patch.object(
+        Discover,
+        "_get_device_instance",
+        side_effect=UnsupportedDeviceError("Unsupported"),
+    )
+    with pytest.raises(KasaException, match="Dummy exception"):
+        async for _ in Discover.iter_discover(
+            discovery_timeout=0, on_unsupported=on_unsupported
+        ):
+            pass
+
+
+@pytest.mark.parametrize("ttl", [0, 300])
+async def test_discover_cache(iter_discover_mock, mocker, ttl):
+    """Make sure that the discovery cache reuses devices and tracks changes."""
+    cache = DiscoveryCache(ttl=ttl)
+    devices = await Discover.discover(discovery_timeout=0, cache=cache)
+    assert cache.delta.new.keys() == devices.keys()
+    assert cache.devices == devices
+
+    legacy_spy = mocker.spy(Discover, "_get_device_instance_legacy")
+    new_spy = mocker.spy(Discover, "_get_device_instance")
+    rescan = await Discover.discover(discovery_timeout=0, cache=cache)
+    assert all(rescan[ip] is dev for ip, dev in devices.items())
+    assert legacy_spy.call_count == 0
+    assert new_spy.call_count == 0
+    assert cache.delta == DiscoveryDelta()
+
+    fixture_infos = {
+        "127.0.0.1": iter_discover_mock["127.0.0.1"],
+        "127.0.0.2": iter_discover_mock["127.0.0.2"],
+    }
+    fixture_infos["127.0.0.2"].data["system"]["get_sysinfo"]["alias"] = "Changed"
+    patch_discovery(fixture_infos, mocker)
+    rescan = await Discover.discover(discovery_timeout=0, cache=cache)
+    assert rescan["127.0.0.1"] is devices["127.0.0.1"]
+    assert rescan["127.0.0.2"] is not devices["127.0.0.2"]
+    assert cache.delta.new == {}
+    assert cache.delta.changed == {"127.0.0.2": rescan["127.0.0.2"]}
+    if ttl:
+        assert cache.delta.gone == {}
+        assert "127.0.0.3" in cache.devices
+    else:
+        assert cache.delta.gone == {"127.0.0.3": devices["127.0.0.3"]}
+        assert cache.devices == rescan
+
+
+async def test_discover_cache_legacy_readings(iter_discover_mock, mocker):
+    """Make sure that changed readings of legacy devices do not invalidate the cache."""
+    cache = DiscoveryCache()
+    devices = await Discover.discover(discovery_timeout=0, cache=cache)
+
+    sys_info = iter_discover_mock["127.0.0.1"].data["system"]["get_sysinfo"]
+    sys_info["rssi"] = sys_info.get("rssi", -50) - 10
+    sys_info["on_time"] = sys_info.get("on_time", 0) + 60
+    patch_discovery(iter_discover_mock, mocker)
+    legacy_spy = mocker.spy(Discover, "_get_device_instance_legacy")
+
+    rescan = await Discover.discover(discovery_timeout=0, cache=cache)
+    assert rescan["127.0.0.1"] is devices["127.0.0.1"]
+    assert legacy_spy.call_count == 0
+    assert cache.delta == DiscoveryDelta()
+
+
+async def test_discover_multiple_targets(iter_discover_mock):
+    """Make sure that discovery on several targets merges the results."""
+    stats: list[DiscoveryStats] = []
+    devices = await Discover.discover(
+        discovery_timeout=0,
+        target=["127.0.0.255", "10.0.0.0/24"],
+        interface=["eth0", "eth1"],
+        on_stats=stats.append,
+    )
+    assert devices.keys() == iter_discover_mock.keys()
+    assert {(stat.target, stat.interface) for stat in stats} == {
+        ("127.0.0.255", "eth0"),
+        ("127.0.0.255", "eth1"),
+        ("10.0.0.255", "eth0"),
+        ("10.0.0.255", "eth1"),
+    }
+    assert sum(stat.responses for stat in stats) == 4 * len(devices)
+    assert sum(stat.devices for stat in stats) == len(devices)
+    assert sum(stat.duplicates for stat in stats) == 3 * len(devices)
+
+
+async def test_sweep_send(mocker):
+    """Test that sweep queries every host which has not responded at the rate."""
+    proto = _SweepDiscoverProtocol(
+        target="127.0.0.0/29",
+        packets_per_second=6,
+        discovery_packets=1,
+        discovery_timeout=0,
+    )
+    proto.seen_hosts.add("127.0.0.2")
+    transport = mocker.patch.object(proto, "transport")
+    sleep = mocker.patch("asyncio.sleep", new=AsyncMock())
+    await proto.do_discover()
+
+    hosts = {host for _, (host, _) in (c.args for c in transport.sendto.call_args_list)}
+    assert hosts == {"127.0.0.1", "127.0.0.3", "127.0.0.4", "127.0.0.5", "127.0.0.6"}
+    assert transport.sendto.call_count == 5 * 3
+    # One second per host at 6 packets per second followed by the timeout
+    assert sleep.await_args_list[-2].args[0] == pytest.approx(2.5, abs=0.1)
+    assert sleep.await_args_list[-1].args[0] == 0
+
+
+async def test_sweep(iter_discover_mock, mocker):
+    """Make sure that sweep yields the devices responding to unicast queries."""
+    mocker.patch.object(
+        _SweepDiscoverProtocol, "do_discover", _DiscoverProtocol.do_discover
+    )
+    devices = [dev async for dev in Discover.sweep("127.0.0.0/29", discovery_timeout=0)]
+    assert [dev.host for dev in devices] == list(iter_discover_mock)
+
+
 async def test_do_discover_no_connection(mocker):
     """Make sure that if the datagram connection doesnt start a TimeoutError is raised."""
     host = "127.0.0.1"
@@ -640,7 +835,7 @@ async def test_discovery_decryption():
     iv = b"9=\xf8\x1bS\xcd0\xb5\x89i\xba\xfd^9\x9f\xfa"
     key_iv = key + iv
 
-    _AesDiscoveryQuery.generate_query()
+    await _AesDiscoveryQuery.generate_query()
     keypair = _AesDiscoveryQuery.keypair
 
     padding = asymmetric_padding.OAEP(
@@ -727,6 +922,51 @@ async def test_discover_try_connect_all(discovery_mock, mocker):
         assert dev.protocol._transport._http_client.client == session
 
 
+async def test_discover_try_connect_all_concurrent(mocker):
+    """Test that open ports are tried first and the losing attempts cancelled."""
+    host = "127.0.0.1"
+    writer = MagicMock()
+    writer.wait_closed = AsyncMock()
+
+    async def _open_connection(_host, port):
+        if port != 9999:
+            raise ConnectionRefusedError
+        return MagicMock(), writer
+
+    started = asyncio.Event()
+    ports = []
+    dev = MagicMock()
+
+    async def _connect(config, protocol):
+        ports.append(protocol._transport._port)
+        if len(ports) == 1:
+            await started.wait()
+            return dev
+        started.set()
+        await asyncio.Event().wait()
+
+    mocker.patch("asyncio.open_connection", side_effect=_open_connection)
+    mocker.patch("kasa.device_factory._connect", side_effect=_connect)
+    attempts = []
+    attempt_times: dict[ConnectAttempt, float] = {}
+
+    res = await Discover.try_connect_all(
+        host,
+        max_concurrent_attempts=2,
+        on_attempt=lambda attempt, success: attempts.append((attempt, success)),
+        attempt_times=attempt_times,
+    )
+
+    assert res is dev
+    assert ports[0] == 9999
+    assert len(attempts) == 1
+    attempt, success = attempts[0]
+    assert success
+    assert attempt.transport is XorTransport
+    assert len(attempt) == 4
+    assert attempt_times[attempt] >= 0
+
+
 async def test_discovery_device_repr(discovery_mock, mocker):
     """Test that repr works when only discovery data is available."""
     host = "foobar"
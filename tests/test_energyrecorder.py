@@ -0,0 +1,166 @@
+"""Tests for the energy recorder."""
+
+from __future__ import annotations
+
+import asyncio
+import math
+from array import array
+
+import pytest
+
+from kasa import Device, EnergyRecorder, EnergySeries, Module, energyrecorder
+from kasa.energyrecorder import load_series
+from kasa.fleet import FleetCycle, FleetUpdateResult
+
+from .device_fixtures import has_emeter
+
+
+def _device(mocker, device_id: str, power: float | None = 1.0):
+    energy = mocker.Mock(current_consumption=power, voltage=230.0, current=None)
+    return mocker.Mock(
+        spec=Device, device_id=device_id, modules={Module.Energy: energy}
+    )
+
+
+def _approx(value: float | None):
+    return pytest.approx(math.nan if value is None else value, rel=1e-5, nan_ok=True)
+
+
+@has_emeter
+async def test_record(dev: Device):
+    if Module.Energy not in dev.modules:
+        dev = next(child for child in dev.children if Module.Energy in child.modules)
+    energy = dev.modules[Module.Energy]
+    recorder = EnergyRecorder([dev])
+
+    assert await recorder.record(timestamp=10) == 1
+    series = recorder.query(dev.device_id)
+
+    assert list(series.timestamps) == [10]
+    assert series.power[0] == _approx(energy.current_consumption)
+    assert series.voltage[0] == _approx(energy.voltage)
+    assert series.current[0] == _approx(energy.current)
+
+
+async def test_record_without_energy(mocker):
+    dev = mocker.Mock(spec=Device, device_id="dev", modules={})
+    recorder = EnergyRecorder([dev])
+
+    assert await recorder.record() == 0
+    assert len(recorder.query(dev)) == 0
+
+
+async def test_record_wraparound(mocker):
+    dev = _device(mocker, "dev")
+    recorder = EnergyRecorder([dev], capacity=3)
+
+    for timestamp in range(5):
+        dev.modules[Module.Energy].current_consumption = timestamp
+        await recorder.record(timestamp=timestamp)
+
+    series = recorder.query(dev)
+    assert list(series.timestamps) == [2, 3, 4]
+    assert list(series.power) == [2, 3, 4]
+    assert all(math.isnan(value) for value in series.current)
+    assert list(recorder.query(dev, start=3).timestamps) == [3, 4]
+    assert list(recorder.query(dev, end=3).timestamps) == [2]
+
+
+async def test_series_downsample():
+    series = EnergySeries(
+        array("d", [0, 5, 10, 15, 20]),
+        array("f", [1, 3, 5, math.nan, 7]),
+        array("f", [math.nan] * 5),
+        array("f", [0] * 5),
+    )
+
+    downsampled = series.downsample(10)
+
+    assert list(downsampled.timestamps) == [0, 10, 20]
+    assert list(downsampled.power) == [2, 5, 7]
+    assert all(math.isnan(value) for value in downsampled.voltage)
+    with pytest.raises(ValueError, match="Step must be positive"):
+        series.downsample(0)
+
+
+async def test_record_to_file(mocker, tmp_path):
+    dev = _device(mocker, "dev")
+    recorder = EnergyRecorder([dev], capacity=4, path=tmp_path, block_size=2)
+    path = recorder.file_path(dev)
+    assert path == tmp_path / "dev.energy"
+    executor_spy = mocker.spy(asyncio.get_running_loop(), "run_in_executor")
+
+    for timestamp in range(3):
+        await recorder.record(timestamp=timestamp)
+    assert list(load_series(path).timestamps) == [0, 1]
+
+    await recorder.flush()
+    assert list(load_series(path).timestamps) == [0, 1, 2]
+
+    for timestamp in range(3, 6):
+        await recorder.record(timestamp=timestamp)
+    await recorder.remove(dev)
+
+    stored = load_series(path)
+    assert list(stored.timestamps) == list(range(6))
+    assert list(stored.power) == [1] * 6
+    assert len(recorder) == 0
+    # The blocks are written without blocking the event loop
+    assert executor_spy.call_count == 4
+
+
+async def test_record_to_file_error(mocker, tmp_path, caplog):
+    dev = _device(mocker, "dev")
+    recorder = EnergyRecorder([dev], capacity=8, path=tmp_path, block_size=2)
+    path = recorder.file_path(dev)
+    write_block = energyrecorder._write_block
+    failed = False
+
+    def _write_block(*args):
+        nonlocal failed
+        if not failed:
+            failed = True
+            raise OSError("disk full")
+        write_block(*args)
+
+    mocker.patch("kasa.energyrecorder._write_block", side_effect=_write_block)
+
+    for timestamp in range(2):
+        await recorder.record(timestamp=timestamp)
+    assert "disk full" in caplog.text
+    assert not path.exists()
+
+    # The failed samples are written with the next block
+    await recorder.record(timestamp=2)
+    assert list(load_series(path).timestamps) == [0, 1, 2]
+
+
+async def test_record_cycle(mocker):
+    good, bad, other = (_device(mocker, name) for name in ("good", "bad", "other"))
+    recorder = EnergyRecorder([good, bad])
+    cycle = FleetCycle(
+        started_at=100,
+        results=[
+            FleetUpdateResult("127.0.0.1", good, 0.1),
+            FleetUpdateResult("127.0.0.2", bad, 0.1, Exception("boom")),
+            FleetUpdateResult("127.0.0.3", other, 0.1),
+        ],
+    )
+
+    await recorder.record_cycle(cycle)
+
+    assert list(recorder.query(good).timestamps) == [100]
+    assert len(recorder.query(bad)) == 0
+    assert len(recorder.query(other)) == 0
+
+
+@pytest.mark.parametrize(
+    ("kwargs", "match"),
+    [
+        pytest.param({"capacity": 0}, "Capacity", id="capacity"),
+        pytest.param({"capacity": 2, "block_size": 3}, "Block size", id="block"),
+    ],
+)
+async def test_recorder_invalid(kwargs, match):
+    with pytest.raises(ValueError, match=match):
+        EnergyRecorder(**kwargs)
@@ -0,0 +1,89 @@
+"""Tests for the bulk energy statistics."""
+
+from __future__ import annotations
+
+from array import array
+
+import pytest
+
+from kasa import Device, EnergyStats, KasaException, Module, get_energy_stats
+from kasa.interfaces.energy import Energy
+
+from .device_fixtures import has_emeter_iot
+
+
+def _device(mocker, device_id: str, daily: dict | None = None, error=None):
+    energy = mocker.Mock(spec=Energy)
+    energy.supports.return_value = True
+    energy.get_daily_stats = mocker.AsyncMock(return_value=daily, side_effect=error)
+    energy.get_monthly_stats = mocker.AsyncMock(return_value={1: 3.0, 2: 4.0})
+    return mocker.Mock(
+        spec=Device, device_id=device_id, modules={Module.Energy: energy}
+    )
+
+
+@has_emeter_iot
+async def test_get_energy_stats(dev: Device):
+    daily = await get_energy_stats([dev], years=[2016], months=[11])
+
+    assert set(daily.device_id) == {dev.device_id}
+    assert list(daily.day) == [24, 25]
+    assert set(daily.year) == {2016}
+    assert set(daily.month) == {11}
+    assert all(value > 0 for value in daily.energy)
+    assert not daily.errors
+
+    monthly = await get_energy_stats([dev], years=[2015, 2016])
+
+    assert list(monthly.month) == [11, 12]
+    assert set(monthly.day) == {0}
+
+
+async def test_get_energy_stats_devices(mocker):
+    first = _device(mocker, "first", {1: 1.0, 2: 2.0})
+    second = _device(mocker, "second", {1: 3.0})
+    failing = _device(mocker, "failing", error=KasaException("boom"))
+    unsupported = _device(mocker, "unsupported")
+    unsupported.modules[Module.Energy].supports.return_value = False
+    no_energy = mocker.Mock(spec=Device, device_id="no_energy", modules={})
+
+    stats = await get_energy_stats(
+        [first, second, failing, unsupported, no_energy],
+        years=[2024],
+        months=[1, 2],
+        concurrency=2,
+    )
+
+    assert stats.device_id == ["first"] * 4 + ["second"] * 2
+    assert list(stats.month) == [1, 1, 2, 2, 1, 2]
+    assert list(stats.day) == [1, 2, 1, 2, 1, 1]
+    assert stats.totals() == {"first": 6.0, "second": 6.0}
+    assert list(stats.errors) == ["failing"]
+    unsupported.modules[Module.Energy].get_daily_stats.assert_not_called()
+
+    with pytest.raises(ValueError, match="Concurrency"):
+        await get_energy_stats([first], concurrency=0)
+
+
+async def test_rollup():
+    stats = EnergyStats(
+        device_id=["a", "b", "c", "a", "b"],
+        year=array("H", [2024] * 5),
+        month=array("B", [1] * 5),
+        day=array("B", [2, 2, 2, 1, 1]),
+        energy=array("d", [1.0, 2.0, 4.0, 0.5, 1.5]),
+    )
+
+    rollup = stats.rollup(percentiles=(0, 50, 75, 100))
+
+    assert len(rollup) == 2
+    assert list(rollup.day) == [1, 2]
+    assert list(rollup.devices) == [2, 3]
+    assert list(rollup.total) == [2.0, 7.0]
+    assert list(rollup.percentiles[0]) == [0.5, 1.0]
+    assert list(rollup.percentiles[50]) == [1.0, 2.0]
+    assert list(rollup.percentiles[75]) == [1.25, 3.0]
+    assert list(rollup.percentiles[100]) == [1.5, 4.0]
+
+    with pytest.raises(ValueError, match="Percentile"):
+        stats.rollup(percentiles=(101,))
@@ -1,5 +1,5 @@
 import logging
-from unittest.mock import AsyncMock, patch
+from unittest.mock import AsyncMock, Mock, patch
 
 import pytest
 from pytest_mock import MockerFixture
@@ -79,13 +79,24 @@ def test_feature_value_container(mocker, dummy_feature: Feature):
     dummy_feature.attribute_getter = "test_prop"
 
     mock_dev_prop = mocker.patch.object(
-        dummy_feature, "test_prop", new_callable=mocker.PropertyMock, create=True
+        DummyDevice, "test_prop", new_callable=mocker.PropertyMock, create=True
     )
 
     assert dummy_feature.value == "dummy"
     mock_dev_prop.assert_not_called()
 
 
+def test_feature_slots(dummy_feature: Feature):
+    """Test that features are slotted and cache the range."""
+    range_getter = Mock(return_value=(1, 10))
+    dummy_feature.range_getter = range_getter
+
+    assert not hasattr(dummy_feature, "__dict__")
+    assert dummy_feature.range == (1, 10)
+    assert dummy_feature.maximum_value == 10
+    range_getter.assert_called_once()
+
+
 def test_feature_value_callable(dev, dummy_feature: Feature):
     """Verify that callables work as *attribute_getter*."""
     dummy_feature.attribute_getter = lambda x: "dummy value"
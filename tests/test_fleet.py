@@ -0,0 +1,220 @@
+"""Tests for the fleet poller."""
+
+from __future__ import annotations
+
+import asyncio
+
+import pytest
+
+from kasa import Device, DeviceConfig, DeviceFamily, Fleet, KasaException
+from kasa.deviceconfig import DeviceConnectionParameters, DeviceEncryptionType
+from kasa.fleet import _RateLimiter
+from kasa.iot import IotPlug
+from kasa.smart import SmartDevice
+
+
+def _iot_plug(host: str) -> IotPlug:
+    return IotPlug(host)
+
+
+def _smart_plug(host: str) -> SmartDevice:
+    config = DeviceConfig(
+        host=host,
+        connection_type=DeviceConnectionParameters(
+            DeviceFamily.SmartTapoPlug, DeviceEncryptionType.Klap
+        ),
+    )
+    return SmartDevice(host, config=config)
+
+
+def _patch_update(mocker, dev: Device, side_effect=None):
+    return mocker.patch.object(dev, "update", side_effect=side_effect)
+
+
+async def test_fleet_update(mocker):
+    devs = [_iot_plug(f"127.0.0.{i}") for i in range(1, 4)]
+    mocks = [_patch_update(mocker, dev) for dev in devs]
+    fleet = Fleet(devs)
+
+    assert len(fleet) == 3
+    cycle = await fleet.update(update_children=False)
+
+    assert cycle.succeeded == 3
+    assert not cycle.failures
+    assert {result.host for result in cycle.results} == {dev.host for dev in devs}
+    assert cycle.max_latency is not None
+    assert cycle.mean_latency is not None
+    assert fleet.last_cycle is cycle
+    for mock in mocks:
+        mock.assert_called_once_with(update_children=False)
+
+
+async def test_fleet_update_failures(mocker):
+    good, bad = _iot_plug("127.0.0.1"), _iot_plug("127.0.0.2")
+    _patch_update(mocker, good)
+    _patch_update(mocker, bad, side_effect=KasaException("boom"))
+
+    cycle = await Fleet([good, bad]).update()
+
+    assert cycle.succeeded == 1
+    assert len(cycle.failures) == 1
+    failure = cycle.failures[0]
+    assert failure.device is bad
+    assert isinstance(failure.error, KasaException)
+    assert cycle.latencies == [
+        result.duration for result in cycle.results if result.device is good
+    ]
+
+
+async def test_fleet_concurrency(mocker):
+    running = 0
+    max_running = 0
+
+    async def _update(*args, **kwargs):
+        nonlocal running, max_running
+        running += 1
+        max_running = max(max_running, running)
+        await asyncio.sleep(0.01)
+        running -= 1
+
+    devs = [_iot_plug(f"127.0.0.{i}") for i in range(1, 11)]
+    for dev in devs:
+        _patch_update(mocker, dev, side_effect=_update)
+
+    cycle = await Fleet(devs, concurrency=3).update()
+
+    assert cycle.succeeded == 10
+    assert max_running == 3
+
+
+async def test_fleet_deadline(mocker):
+    async def _slow_update(*args, **kwargs):
+        await asyncio.Event().wait()
+
+    fast, slow = _iot_plug("127.0.0.1"), _iot_plug("127.0.0.2")
+    _patch_update(mocker, fast)
+    _patch_update(mocker, slow, side_effect=_slow_update)
+
+    cycle = await Fleet([fast, slow], deadline=0.05).update()
+
+    assert cycle.succeeded == 1
+    assert isinstance(cycle.failures[0].error, TimeoutError)
+    assert cycle.failures[0].device is slow
+
+
+async def test_fleet_family_rate_limit(mocker):
+    sleeps: list[float] = []
+
+    async def _sleep(delay, *_, **__):
+        sleeps.append(delay)
+
+    mocker.patch("kasa.fleet.asyncio.sleep", side_effect=_sleep)
+    mocker.patch("kasa.fleet.time").monotonic.return_value = 1000.0
+    iot_devs = [_iot_plug(f"127.0.0.{i}") for i in range(1, 4)]
+    smart_devs = [_smart_plug(f"127.0.1.{i}") for i in range(1, 4)]
+    for dev in [*iot_devs, *smart_devs]:
+        _patch_update(mocker, dev)
+
+    fleet = Fleet(
+        [*iot_devs, *smart_devs],
+        family_rate_limits={DeviceFamily.SmartTapoPlug: 20},
+    )
+    cycle = await fleet.update()
+
+    assert cycle.succeeded == 6
+    # The first smart device starts right away, the others wait for their slot
+    assert len(sleeps) == 2
+    assert sleeps == pytest.approx([0.05, 0.1])
+
+
+async def test_fleet_rate_limit_does_not_hold_slot(mocker):
+    """Test that devices waiting for their rate limit do not block others."""
+    release = asyncio.Event()
+    iot_updated = asyncio.Event()
+
+    async def _acquire():
+        await release.wait()
+
+    mocker.patch.object(_RateLimiter, "acquire", side_effect=_acquire)
+    smart_devs = [_smart_plug(f"127.0.1.{i}") for i in range(1, 4)]
+    for dev in smart_devs:
+        _patch_update(mocker, dev)
+    iot_dev = _iot_plug("127.0.0.1")
+    _patch_update(mocker, iot_dev, side_effect=lambda *_, **__: iot_updated.set())
+
+    fleet = Fleet(
+        [*smart_devs, iot_dev],
+        concurrency=1,
+        family_rate_limits={DeviceFamily.SmartTapoPlug: 1},
+    )
+    task = asyncio.create_task(fleet.update())
+    await asyncio.wait_for(iot_updated.wait(), 1)
+    release.set()
+    cycle = await task
+
+    assert cycle.succeeded == 4
+
+
+async def test_fleet_jitter(mocker):
+    dev = _iot_plug("127.0.0.1")
+    _patch_update(mocker, dev)
+    uniform = mocker.patch("kasa.fleet.random.uniform", return_value=0)
+
+    await Fleet([dev], jitter=5).update()
+
+    uniform.assert_called_once_with(0, 5)
+
+
+async def test_fleet_add_remove():
+    dev1, dev2 = _iot_plug("127.0.0.1"), _iot_plug("127.0.0.2")
+    fleet = Fleet([dev1])
+    fleet.add(dev2)
+
+    assert dev1 in fleet
+    assert "127.0.0.2" in fleet
+    assert fleet.get("127.0.0.2") is dev2
+    assert list(fleet) == [dev1, dev2]
+
+    assert fleet.remove(dev1) is dev1
+    assert fleet.remove("127.0.0.2") is dev2
+    assert fleet.remove("127.0.0.3") is None
+    assert len(fleet) == 0
+
+
+async def test_fleet_poll(mocker):
+    dev = _iot_plug("127.0.0.1")
+    update = _patch_update(mocker, dev)
+    cycles = []
+
+    async def _on_cycle(cycle):
+        cycles.append(cycle)
+        if len(cycles) == 2:
+            raise asyncio.CancelledError
+
+    with pytest.raises(asyncio.CancelledError):
+        await Fleet([dev]).poll(0, on_cycle=_on_cycle)
+
+    assert len(cycles) == 2
+    assert update.call_count == 2
+
+
+async def test_fleet_disconnect(mocker):
+    devs = [_iot_plug(f"127.0.0.{i}") for i in range(1, 3)]
+    disconnects = [mocker.patch.object(dev, "disconnect") for dev in devs]
+
+    await Fleet(devs).disconnect()
+
+    for disconnect in disconnects:
+        disconnect.assert_called_once()
+
+
+@pytest.mark.parametrize(
+    ("kwargs", "message"),
+    [
+        pytest.param({"concurrency": 0}, "Concurrency must be at least 1", id="conc"),
+        pytest.param({"jitter": -1}, "Jitter must not be negative", id="jitter"),
+    ],
+)
+async def test_fleet_invalid_parameters(kwargs, message):
+    with pytest.raises(ValueError, match=message):
+        Fleet(**kwargs)
@@ -1,7 +1,9 @@
 import re
+from http.cookies import SimpleCookie
 
 import aiohttp
 import pytest
+from yarl import URL
 
 from kasa.deviceconfig import DeviceConfig
 from kasa.exceptions import (
@@ -9,7 +11,12 @@ from kasa.exceptions import (
     TimeoutError,
     _ConnectionError,
 )
-from kasa.httpclient import HttpClient
+from kasa.httpclient import (
+    HttpClient,
+    HttpConnectionPool,
+    get_connection_pool,
+    set_connection_pool,
+)
 
 
 @pytest.mark.parametrize(
@@ -56,6 +63,7 @@ async def test_httpclient_errors(mocker, error, error_raises, error_message, moc
     class _mock_response:
         def __init__(self, status, error):
             self.status = status
+            self.cookies: SimpleCookie = SimpleCookie()
             self.error = error
             self.call_count = 0
 
@@ -97,3 +105,100 @@ async def test_httpclient_errors(mocker, error, error_raises, error_message, moc
         assert mock_response.call_count == 1
     else:
         assert conn.call_count == 1
+
+
+async def test_httpclient_shared_pool():
+    client1 = HttpClient(DeviceConfig("127.0.0.1"))
+    client2 = HttpClient(DeviceConfig("127.0.0.2"))
+
+    session = client1.client
+    assert client2.client is session
+    assert isinstance(session.cookie_jar, aiohttp.DummyCookieJar)
+
+    await client1.close()
+    await client1.close()
+    assert not session.closed
+    await client2.close()
+    assert session.closed
+
+    client3 = HttpClient(DeviceConfig("127.0.0.3"))
+    assert client3.client is not session
+    await client3.close()
+
+
+async def test_httpclient_closed_session():
+    default_pool = get_connection_pool()
+    pool = HttpConnectionPool()
+    set_connection_pool(pool)
+    try:
+        client = HttpClient(DeviceConfig("127.0.0.1"))
+        session = client.client
+        await session.close()
+        set_connection_pool(other_pool := HttpConnectionPool())
+
+        new_session = client.client
+        assert new_session is not session
+        assert not pool._sessions
+        await client.close()
+        assert new_session.closed
+        assert not other_pool._sessions
+    finally:
+        set_connection_pool(default_pool)
+
+
+async def test_httpclient_pool_limits():
+    default_pool = get_connection_pool()
+    pool = HttpConnectionPool(limit=10, limit_per_host=1, idle_ttl=5)
+    set_connection_pool(pool)
+    try:
+        client = HttpClient(DeviceConfig("127.0.0.1"))
+        connector = client.client.connector
+        assert connector is not None
+        assert connector.limit == 10
+        assert connector.limit_per_host == 1
+        await client.close()
+    finally:
+        set_connection_pool(default_pool)
+
+
+async def test_httpclient_per_device_cookies(mocker):
+    class _mock_response:
+        def __init__(self, cookie: str):
+            self.status = 200
+            self.cookies: SimpleCookie = SimpleCookie()
+            self.cookies["TP_SESSIONID"] = cookie
+
+        async def __aenter__(self):
+            return self
+
+        async def __aexit__(self, exc_t, exc_v, exc_tb):
+            pass
+
+        async def read(self):
+            return b"{}"
+
+    async def _post(url, *_, **__):
+        return _mock_response(f"session-{url.host}")
+
+    mocker.patch.object(aiohttp.ClientSession, "post", side_effect=_post)
+    client1 = HttpClient(DeviceConfig("127.0.0.1"))
+    client2 = HttpClient(DeviceConfig("127.0.0.2"))
+
+    await client1.post(URL("http://127.0.0.1/app"))
+    await client2.post(URL("http://127.0.0.2/app"))
+
+    assert client1.get_cookie("TP_SESSIONID") == "session-127.0.0.1"
+    assert client2.get_cookie("TP_SESSIONID") == "session-127.0.0.2"
+    assert client1.get_cookie("TIMEOUT") is None
+
+    await client1.close()
+    assert client1.get_cookie("TP_SESSIONID") is None
+    await client2.close()
+
+
+async def test_httpclient_custom_session():
+    async with aiohttp.ClientSession() as session:
+        client = HttpClient(DeviceConfig("127.0.0.1", http_client=session))
+        assert client.client is session
+        await client.close()
+        assert not session.closed
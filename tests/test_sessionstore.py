@@ -0,0 +1,78 @@
+import os
+import stat
+
+import pytest
+
+from kasa.sessionstore import FileSessionStore, MemorySessionStore
+
+
+@pytest.mark.parametrize("store_class", [FileSessionStore, MemorySessionStore])
+async def test_session_store(tmp_path, store_class):
+    store = (
+        FileSessionStore(tmp_path / "sessions.json")
+        if store_class is FileSessionStore
+        else MemorySessionStore()
+    )
+    assert await store.load("foo") is None
+
+    await store.save("foo", {"seq": 1})
+    await store.save("bar", {"seq": 2})
+    assert await store.load("foo") == {"seq": 1}
+
+    await store.delete("foo")
+    await store.delete("foo")
+    assert await store.load("foo") is None
+    assert await store.load("bar") == {"seq": 2}
+
+
+async def test_file_session_store_persists(tmp_path):
+    path = tmp_path / "sessions.json"
+    store = FileSessionStore(path)
+    await store.save("foo", {"seq": 1})
+    await store.close()
+
+    assert stat.S_IMODE(os.stat(path).st_mode) == 0o600
+    assert await FileSessionStore(path).load("foo") == {"seq": 1}
+
+
+async def test_file_session_store_invalid_file(tmp_path):
+    path = tmp_path / "sessions.json"
+    path.write_text("not json")
+
+    store = FileSessionStore(path)
+    assert await store.load("foo") is None
+    await store.save("foo", {"seq": 1})
+    await store.close()
+    assert await FileSessionStore(path).load("foo") == {"seq": 1}
+
+
+async def test_file_session_store_coalesces_writes(tmp_path, mocker):
+    path = tmp_path / "sessions.json"
+    store = FileSessionStore(path, flush_delay=0)
+    write_spy = mocker.spy(store, "_write")
+
+    for seq in range(10):
+        await store.save(f"dev{seq}", {"seq": seq})
+    assert write_spy.call_count == 0
+    assert store._flush_task
+    await store._flush_task
+    assert write_spy.call_count == 1
+    assert await FileSessionStore(path).load("dev9") == {"seq": 9}
+
+    await store.delete("dev9")
+    await store.close()
+    assert write_spy.call_count == 2
+    assert await FileSessionStore(path).load("dev9") is None
+
+
+async def test_file_session_store_write_error(tmp_path, mocker, caplog):
+    store = FileSessionStore(tmp_path / "sessions.json", flush_delay=0)
+    mocker.patch.object(store, "_write", side_effect=OSError("disk full"))
+
+    await store.save("foo", {"seq": 1})
+    assert store._flush_task
+    await store._flush_task
+    assert "disk full" in caplog.text
+
+    with pytest.raises(OSError, match="disk full"):
+        await store.close()
@@ -1,13 +1,16 @@
 from __future__ import annotations
 
+import asyncio
 import base64
 import json
 import logging
 import random
 import string
+import threading
 import time
 from contextlib import AbstractContextManager
 from contextlib import nullcontext as does_not_raise
+from http.cookies import SimpleCookie
 from json import dumps as json_dumps
 from json import loads as json_loads
 from typing import Any
@@ -33,6 +36,8 @@ from kasa.httpclient import HttpClient
 from kasa.transports.aestransport import (
     AesEncyptionSession,
     AesTransport,
+    KeyPair,
+    KeyPairPool,
     TransportState,
 )
 
@@ -117,6 +122,68 @@ async def test_handshake_with_keys(mocker: MockerFixture) -> None:
     assert transport._key_pair.public_key_der_b64 == test_keys["public"]
 
 
+async def test_handshake_uses_key_pair_pool(mocker: MockerFixture) -> None:
+    host = "127.0.0.1"
+    mock_aes_device = MockAesDevice(host)
+    mocker.patch.object(aiohttp.ClientSession, "post", side_effect=mock_aes_device.post)
+
+    pool = KeyPairPool(size=0)
+    key_pair = KeyPair.create_key_pair()
+    pool.add(key_pair)
+    mocker.patch.object(AesTransport, "key_pair_pool", pool)
+
+    transport = AesTransport(
+        config=DeviceConfig(host, credentials=Credentials("foo", "bar"))
+    )
+    await transport.perform_handshake()
+    assert transport._key_pair is key_pair
+    assert transport._config.aes_keys == {
+        "private": key_pair.private_key_der_b64,
+        "public": key_pair.public_key_der_b64,
+    }
+    assert len(pool) == 0
+
+
+async def test_key_pair_pool_generates_off_loop(mocker: MockerFixture) -> None:
+    create_key_pair = KeyPair.create_key_pair
+    threads = []
+
+    def _create_key_pair(key_size: int) -> KeyPair:
+        threads.append(threading.get_ident())
+        return create_key_pair(key_size)
+
+    mocker.patch.object(KeyPair, "create_key_pair", side_effect=_create_key_pair)
+
+    pool = KeyPairPool(key_size=1024, size=2)
+    pool.prefill()
+    assert len(pool) == 2
+
+    key_pair = await pool.get()
+    assert key_pair.private_key.key_size == 1024
+    # The handed out key pair is replaced in the background
+    assert len(pool) == 2
+    assert await pool.get() is not key_pair
+
+    assert threads
+    assert threading.get_ident() not in threads
+
+
+async def test_key_pair_pool_persisted_keys() -> None:
+    key_pair = KeyPair.create_key_pair()
+    test_keys: KeyPairDict = {
+        "private": key_pair.private_key_der_b64,
+        "public": key_pair.public_key_der_b64,
+    }
+    pool = KeyPairPool(size=0)
+    pool.add_keys(test_keys)
+    assert len(pool) == 1
+
+    pooled = await pool.get()
+    assert pooled.private_key_der_b64 == test_keys["private"]
+    assert pooled.public_key_der_b64 == test_keys["public"]
+    assert len(pool) == 0
+
+
 @status_parameters
 async def test_login(
     mocker: MockerFixture,
@@ -241,6 +308,25 @@ async def test_send(
         assert "result" in res
 
 
+async def test_concurrent_send_single_handshake(mocker: MockerFixture) -> None:
+    host = "127.0.0.1"
+    mock_aes_device = MockAesDevice(host)
+    mocker.patch.object(aiohttp.ClientSession, "post", side_effect=mock_aes_device.post)
+
+    transport = AesTransport(
+        config=DeviceConfig(host, credentials=Credentials("foo", "bar"))
+    )
+    handshake = mocker.spy(transport, "perform_handshake")
+    login = mocker.spy(transport, "perform_login")
+
+    request = json_dumps({"method": "get_device_info", "params": None})
+    responses = await asyncio.gather(*[transport.send(request) for _ in range(3)])
+
+    assert all("result" in res for res in responses)
+    assert handshake.call_count == 1
+    assert login.call_count == 1
+
+
 @pytest.mark.xdist_group(name="caplog")
 async def test_unencrypted_response(
     mocker: MockerFixture, caplog: pytest.LogCaptureFixture
@@ -453,6 +539,7 @@ class MockAesDevice:
     class _mock_response:
         def __init__(self, status, json: dict):
             self.status = status
+            self.cookies: SimpleCookie = SimpleCookie()
             self._json = json
 
         async def __aenter__(self):
@@ -1,5 +1,6 @@
 from __future__ import annotations
 
+import asyncio
 import json
 import logging
 import re
@@ -8,6 +9,7 @@ import time
 from collections.abc import Callable
 from contextlib import AbstractContextManager
 from contextlib import nullcontext as does_not_raise
+from http.cookies import SimpleCookie
 
 import aiohttp
 import pytest
@@ -25,6 +27,7 @@ from kasa.exceptions import (
 )
 from kasa.httpclient import HttpClient
 from kasa.protocols import IotProtocol, SmartProtocol
+from kasa.sessionstore import MemorySessionStore
 from kasa.transports.aestransport import AesTransport
 from kasa.transports.klaptransport import (
     KlapEncryptionSession,
@@ -40,8 +43,9 @@ pytestmark = [pytest.mark.requires_dummy]
 
 
 class _mock_response:
-    def __init__(self, status, content: bytes):
+    def __init__(self, status, content: bytes | bytearray):
         self.status = status
+        self.cookies: SimpleCookie = SimpleCookie()
         self.content = content
 
     async def __aenter__(self):
@@ -208,9 +212,11 @@ async def test_protocol_logging(
     caplog.set_level(log_level)
     logging.getLogger("kasa").setLevel(log_level)
 
-    def _return_encrypted(*_, **__):
-        # Do the encrypt just before returning the value so the incrementing sequence number is correct
-        encrypted, seq = encryption_session.encrypt('{"great":"success"}')
+    def _return_encrypted(url: URL, params=None, *_, **__):
+        # The device encrypts the response with the sequence number of the request
+        device_session = KlapEncryptionSession(seed, seed, auth_hash)
+        device_session._seq = params["seq"] - 1
+        encrypted, seq = device_session.encrypt('{"great":"success"}')
         return 200, encrypted
 
     seed = secrets.token_bytes(16)
@@ -260,6 +266,48 @@ def test_encrypt_unicode() -> None:
     assert d == decrypted
 
 
+def test_decrypt_out_of_order() -> None:
+    seed = secrets.token_bytes(16)
+    auth_hash = KlapTransport.generate_auth_hash(Credentials("foo", "bar"))
+    encryption_session = KlapEncryptionSession(seed, seed, auth_hash)
+
+    first, first_seq = encryption_session.encrypt("first")
+    second, second_seq = encryption_session.encrypt("second")
+
+    assert encryption_session.decrypt(bytes(second), second_seq) == "second"
+    assert encryption_session.decrypt(bytes(first), first_seq) == "first"
+
+
+@pytest.mark.parametrize("length", [0, 1, 15, 16, 17, 1000])
+def test_encrypt_padding(length: int) -> None:
+    seed = secrets.token_bytes(16)
+    auth_hash = KlapTransport.generate_auth_hash(Credentials("foo", "bar"))
+    encryption_session = KlapEncryptionSession(seed, seed, auth_hash)
+    d = "x" * length
+
+    encrypted, seq = encryption_session.encrypt(d)
+
+    assert len(encrypted) == 32 + (length // 16 + 1) * 16
+    assert encryption_session.decrypt(encrypted, seq) == d
+
+
+def test_decrypt_invalid_signature() -> None:
+    seed = secrets.token_bytes(16)
+    auth_hash = KlapTransport.generate_auth_hash(Credentials("foo", "bar"))
+    encryption_session = KlapEncryptionSession(seed, seed, auth_hash)
+
+    encrypted, seq = encryption_session.encrypt("foobar")
+
+    with pytest.raises(ValueError, match="Invalid signature"):
+        encryption_session.decrypt(encrypted, seq - 1)
+    with pytest.raises(ValueError, match="Invalid ciphertext length"):
+        encryption_session.decrypt(encrypted[:40], seq)
+
+    encrypted[-1] ^= 1
+    with pytest.raises(ValueError, match="Invalid signature"):
+        encryption_session.decrypt(encrypted, seq)
+
+
 async def test_transport_decrypt(mocker: MockerFixture) -> None:
     """Test transport decryption."""
     d = {"great": "success"}
@@ -500,6 +548,53 @@ async def test_query(mocker: MockerFixture) -> None:
         last_seq = seq
 
 
+async def test_concurrent_send_single_handshake(mocker: MockerFixture) -> None:
+    server_seed = secrets.token_bytes(16)
+    client_credentials = Credentials("foo", "bar")
+    device_auth_hash = KlapTransport.generate_auth_hash(client_credentials)
+    handshake_count = 0
+    requests = 0
+    all_encrypted = asyncio.Event()
+
+    async def _return_response(url: URL, params=None, data=None, *_, **__):
+        nonlocal handshake_count, requests
+
+        if url == URL("http://127.0.0.1:80/app/handshake1"):
+            handshake_count += 1
+            await asyncio.sleep(0)
+            return _mock_response(200, server_seed + _sha256(data + device_auth_hash))
+        elif url == URL("http://127.0.0.1:80/app/handshake2"):
+            return _mock_response(200, b"")
+        elif url == URL("http://127.0.0.1:80/app/request"):
+            # Respond only once every request has been encrypted so the
+            # responses are decrypted after the later encryptions
+            requests += 1
+            if requests == 3:
+                all_encrypted.set()
+            await all_encrypted.wait()
+            assert transport._encryption_session is not None
+            seq = params.get("seq")
+            encryption_session = KlapEncryptionSession(
+                transport._encryption_session.local_seed,
+                transport._encryption_session.remote_seed,
+                transport._encryption_session.user_hash,
+            )
+            encryption_session._seq = seq - 1
+            encrypted = encryption_session.encrypt(json.dumps({"seq": seq}))[0]
+            return _mock_response(200, encrypted)
+
+    mocker.patch.object(aiohttp.ClientSession, "post", side_effect=_return_response)
+
+    config = DeviceConfig("127.0.0.1", credentials=client_credentials)
+    transport = KlapTransport(config=config)
+
+    responses = await asyncio.gather(*[transport.send("{}") for _ in range(3)])
+    assert transport._encryption_session is not None
+    last_seq = transport._encryption_session.seq
+    assert responses == [{"seq": seq} for seq in range(last_seq - 2, last_seq + 1)]
+    assert handshake_count == 1
+
+
 @pytest.mark.parametrize(
     ("response_status", "credentials_match", "expectation"),
     [
@@ -594,3 +689,92 @@ async def test_port_override() -> None:
     transport = KlapTransport(config=config)
 
     assert str(transport._app_url) == "http://127.0.0.1:12345/app"
+
+
+def _mock_klap_device(mocker: MockerFixture, credentials: Credentials) -> dict:
+    """Patch the client session to act as a klap device and return call counts."""
+    server_seed = secrets.token_bytes(16)
+    device_auth_hash = KlapTransport.generate_auth_hash(credentials)
+    device: dict = {"session": None, "handshakes": 0, "requests": 0, "status": 200}
+
+    async def _return_response(url: URL, params=None, data=None, *_, **__):
+        if url == URL("http://127.0.0.1:80/app/handshake1"):
+            device["handshakes"] += 1
+            device["session"] = KlapEncryptionSession(
+                data, server_seed, device_auth_hash
+            )
+            return _mock_response(200, server_seed + _sha256(data + device_auth_hash))
+        elif url == URL("http://127.0.0.1:80/app/handshake2"):
+            return _mock_response(200, b"")
+        elif url == URL("http://127.0.0.1:80/app/request"):
+            device["requests"] += 1
+            if device["status"] != 200:
+                device["status"], status = 200, device["status"]
+                return _mock_response(status, b"")
+            session = device["session"]
+            assert params["seq"] > session.seq
+            session._seq = params["seq"] - 1
+            encrypted, _ = session.encrypt('{"great": "success"}')
+            return _mock_response(200, encrypted)
+
+    mocker.patch.object(aiohttp.ClientSession, "post", side_effect=_return_response)
+    return device
+
+
+async def test_session_store_resume(mocker: MockerFixture) -> None:
+    credentials = Credentials("foo", "bar")
+    device = _mock_klap_device(mocker, credentials)
+    store = MemorySessionStore()
+    config = DeviceConfig("127.0.0.1", credentials=credentials, session_store=store)
+
+    protocol = IotProtocol(transport=KlapTransport(config=config))
+    await protocol.query({})
+    await protocol.query({})
+    await protocol.close()
+    assert device["handshakes"] == 1
+
+    state = await store.load("klap:127.0.0.1:80")
+    assert state
+    assert state["seq"] == device["session"].seq
+
+    protocol = IotProtocol(transport=KlapTransport(config=config))
+    assert await protocol.query({}) == {"great": "success"}
+    assert device["handshakes"] == 1
+    await protocol.close()
+
+
+async def test_session_store_expired(mocker: MockerFixture) -> None:
+    credentials = Credentials("foo", "bar")
+    device = _mock_klap_device(mocker, credentials)
+    store = MemorySessionStore()
+    config = DeviceConfig("127.0.0.1", credentials=credentials, session_store=store)
+
+    protocol = IotProtocol(transport=KlapTransport(config=config))
+    await protocol.query({})
+    await protocol.close()
+    state = await store.load("klap:127.0.0.1:80")
+    assert state
+    await store.save("klap:127.0.0.1:80", {**state, "expire_at": time.time() - 1})
+
+    protocol = IotProtocol(transport=KlapTransport(config=config))
+    await protocol.query({})
+    assert device["handshakes"] == 2
+    await protocol.close()
+
+
+async def test_session_store_rejected(mocker: MockerFixture) -> None:
+    credentials = Credentials("foo", "bar")
+    device = _mock_klap_device(mocker, credentials)
+    store = MemorySessionStore()
+    config = DeviceConfig("127.0.0.1", credentials=credentials, session_store=store)
+
+    protocol = IotProtocol(transport=KlapTransport(config=config))
+    await protocol.query({})
+    await protocol.close()
+
+    device["status"] = 403
+    protocol = IotProtocol(transport=KlapTransport(config=config))
+    assert await protocol.query({}) == {"great": "success"}
+    assert device["handshakes"] == 2
+    assert device["requests"] == 3
+    await protocol.close()
@@ -1,4 +1,5 @@
 import base64
+from http.cookies import SimpleCookie
 from unittest.mock import ANY
 
 import aiohttp
@@ -122,6 +123,7 @@ class MockLinkieDevice:
     class _mock_response:
         def __init__(self, status, request: dict):
             self.status = status
+            self.cookies: SimpleCookie = SimpleCookie()
             self._json = request
 
         async def __aenter__(self):
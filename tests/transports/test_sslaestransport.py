@@ -1,10 +1,12 @@
 from __future__ import annotations
 
+import asyncio
 import base64
 import logging
 import secrets
 from contextlib import AbstractContextManager
 from contextlib import nullcontext as does_not_raise
+from http.cookies import SimpleCookie
 from json import dumps as json_dumps
 from json import loads as json_loads
 from typing import Any
@@ -190,6 +192,25 @@ async def test_send(mocker: MockerFixture) -> None:
     assert "result" in res
 
 
+async def test_concurrent_send_single_handshake(mocker: MockerFixture) -> None:
+    host = "127.0.0.1"
+    mock_ssl_aes_device = MockSslAesDevice(host, want_default_username=False)
+    mocker.patch.object(
+        aiohttp.ClientSession, "post", side_effect=mock_ssl_aes_device.post
+    )
+
+    transport = SslAesTransport(
+        config=DeviceConfig(host, credentials=Credentials(MOCK_USER, MOCK_PWD))
+    )
+    handshake = mocker.spy(transport, "perform_handshake")
+
+    request = json_dumps({"method": "getDeviceInfo", "params": None})
+    responses = await asyncio.gather(*[transport.send(request) for _ in range(3)])
+
+    assert all("result" in res for res in responses)
+    assert handshake.call_count == 1
+
+
 @pytest.mark.xdist_group(name="caplog")
 async def test_unencrypted_response(
     mocker: MockerFixture, caplog: pytest.LogCaptureFixture
@@ -521,6 +542,7 @@ class MockSslAesDevice:
     class _mock_response:
         def __init__(self, status, request: dict):
             self.status = status
+            self.cookies: SimpleCookie = SimpleCookie()
             self._json = request
 
         async def __aenter__(self):
@@ -4,6 +4,7 @@ import logging
 from base64 import b64encode
 from contextlib import AbstractContextManager
 from contextlib import nullcontext as does_not_raise
+from http.cookies import SimpleCookie
 from typing import Any
 
 import aiohttp
@@ -271,6 +272,7 @@ class MockSslDevice:
     class _mock_response:
         def __init__(self, status, request: dict):
             self.status = status
+            self.cookies: SimpleCookie = SimpleCookie()
             self._json = request
 
         async def __aenter__(self):